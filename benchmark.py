@@ -0,0 +1,243 @@
+# benchmark.py
+# Descripción: Mide el solucionador sobre el corpus de tableros y detecta regresiones contra una línea base
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows: sin memoria pico
+    resource = None
+
+from generador_tableros import NumberLinkGenerator
+from leer_tablero import NumberLinkBoardIO
+from numberlink_heuristica import NumberLinkHeuristicSolver
+
+
+class NumberLinkBenchmark:
+    """
+    Ejecuta el corpus de tablerosEntrada y unos tableros más grandes generados con semilla fija
+    varias veces por tablero. Cada corrida se hace en un proceso nuevo para medir la memoria
+    pico de forma aislada y poder cortarla si excede el tiempo máximo. Los resultados (tiempo,
+    intentos, memoria y tamaño de las cachés) se guardan en JSON y pueden compararse con un
+    archivo anterior usado como línea base.
+    """
+
+    METODOS = {
+        "backtracking": "resolver_numberlink_backtracking",
+        "frontera": "resolver_numberlink_frontera",
+    }
+    TAMANOS_GENERADOS = ((8, 8), (10, 10), (12, 12))
+    DENSIDADES_GENERADOS = (1.0, 1.5)
+    SEMILLA_GENERADOS = 2024
+    REPETICIONES = 3
+    TIEMPO_MAX = 60.0
+    MARGEN_TIEMPO = 5.0
+    TOLERANCIA_TIEMPO = 0.25
+    TOLERANCIA_INTENTOS = 0.10
+    TOLERANCIA_MEMORIA = 0.50
+    MINIMO_SEGUNDOS = 0.05
+    MINIMO_KB = 1024
+
+    @staticmethod
+    def leer_corpus(directorio):
+        """Lista de (nombre, tablero) con los .txt de un directorio en orden alfabético."""
+        corpus = []
+        for nombre in sorted(os.listdir(directorio)):
+            if nombre.endswith('.txt'):
+                corpus.append((os.path.splitext(nombre)[0],
+                               NumberLinkBoardIO.leer_tablero(os.path.join(directorio, nombre))))
+        return corpus
+
+    @classmethod
+    def tableros_generados(cls, semilla=None, tamanos=None, densidades=None):
+        """
+        Tableros más grandes que el corpus creados con NumberLinkGenerator: uno por cada tamaño
+        de tamanos (TAMANOS_GENERADOS) y densidad de densidades (DENSIDADES_GENERADOS), con
+        pares = densidad * pares_por_defecto. La misma semilla (SEMILLA_GENERADOS) da siempre
+        los mismos tableros, así los resultados son comparables con una línea base.
+        """
+        semilla = semilla if semilla is not None else cls.SEMILLA_GENERADOS
+        azar = random.Random(semilla)
+        generados = []
+        for filas, cols in tamanos or cls.TAMANOS_GENERADOS:
+            for densidad in densidades or cls.DENSIDADES_GENERADOS:
+                pares = max(2, round(densidad * NumberLinkGenerator.pares_por_defecto(filas, cols)))
+                tablero, _ = NumberLinkGenerator.generar(filas, cols, pares, azar)
+                generados.append((f"generado_{filas}x{cols}_{pares}pares_s{semilla}", tablero))
+        return generados
+
+    @classmethod
+    def _medir(cls, tablero, metodo, opciones, tiempo_max):
+        """Una corrida en un proceso propio: tiempo, estado, contadores y memoria pico (KB)."""
+        memoria_inicio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
+        estadisticas = {}
+        resolver = getattr(NumberLinkHeuristicSolver, cls.METODOS[metodo])
+        inicio = time.perf_counter()
+        _, completa = resolver(tablero, verbose=False, tiempo_max=tiempo_max, estadisticas=estadisticas, **opciones)
+        segundos = time.perf_counter() - inicio
+        memoria = None
+        if resource:
+            memoria = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - memoria_inicio
+            if sys.platform == "darwin":
+                memoria //= 1024
+        return {"completa": completa, "segundos": segundos, "memoria_kb": memoria, "estadisticas": estadisticas}
+
+    @classmethod
+    def ejecutar(cls, tableros, repeticiones=None, tiempo_max=None, metodo="backtracking", opciones=None, verbose=True):
+        """
+        Corre cada tablero repeticiones veces y devuelve el dict de resultados listo para
+        guardar en JSON. Una corrida que no termina dentro de tiempo_max más MARGEN_TIEMPO se
+        corta matando su proceso.
+        """
+        if metodo not in cls.METODOS:
+            raise ValueError(f"Método desconocido: {metodo}. Opciones: {', '.join(cls.METODOS)}")
+        repeticiones = repeticiones or cls.REPETICIONES
+        tiempo_max = tiempo_max if tiempo_max is not None else cls.TIEMPO_MAX
+        opciones = opciones or {}
+        resultados = {
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "metodo": metodo,
+            "opciones": opciones,
+            "repeticiones": repeticiones,
+            "tiempo_max": tiempo_max,
+            "tableros": {},
+        }
+
+        contexto = multiprocessing.get_context()
+        pool = contexto.Pool(processes=1, maxtasksperchild=1)
+        try:
+            for nombre, tablero in tableros:
+                corridas = []
+                for _ in range(repeticiones):
+                    tarea = pool.apply_async(cls._medir, (tablero, metodo, opciones, tiempo_max))
+                    try:
+                        corridas.append(tarea.get(timeout=tiempo_max + cls.MARGEN_TIEMPO))
+                    except multiprocessing.TimeoutError:
+                        pool.terminate()
+                        pool = contexto.Pool(processes=1, maxtasksperchild=1)
+                        corridas.append({"completa": False, "segundos": tiempo_max + cls.MARGEN_TIEMPO,
+                                         "memoria_kb": None, "estadisticas": {"agotado": True}})
+                registro = cls._resumir_corridas(tablero, corridas)
+                resultados["tableros"][nombre] = registro
+                if verbose:
+                    print(f"{nombre}: {registro['estado']}, mediana {registro['tiempo_mediana']:.3f} s, "
+                          f"{registro['intentos']} intentos, {registro['memoria_pico_kb']} KB", flush=True)
+        finally:
+            pool.terminate()
+        return resultados
+
+    @staticmethod
+    def _resumir_corridas(tablero, corridas):
+        tiempos = [c["segundos"] for c in corridas]
+        ultima = corridas[-1]["estadisticas"]
+        memorias = [c["memoria_kb"] for c in corridas if c["memoria_kb"] is not None]
+        completa = all(c["completa"] for c in corridas)
+        if completa:
+            estado = "resuelto"
+        elif any(c["estadisticas"].get("agotado") for c in corridas):
+            estado = "tiempo agotado"
+        else:
+            estado = "sin solución"
+        return {
+            "filas": len(tablero),
+            "cols": len(tablero[0]) if tablero else 0,
+            "completa": completa,
+            "estado": estado,
+            "tiempos": tiempos,
+            "tiempo_mediana": statistics.median(tiempos),
+            "tiempo_min": min(tiempos),
+            "intentos": ultima.get("intentos"),
+            "memoria_pico_kb": max(memorias) if memorias else None,
+            "memo_entradas": ultima.get("memo", {}).get("entradas"),
+            "memo_celdas": ultima.get("memo", {}).get("costo"),
+            "fallos_entradas": ultima.get("fallos", {}).get("entradas"),
+        }
+
+    @classmethod
+    def comparar(cls, resultados, base, tolerancia_tiempo=None, tolerancia_intentos=None, tolerancia_memoria=None):
+        """
+        Compara tablero a tablero con una línea base y devuelve {nombre: [motivos]} con las
+        regresiones: tableros que dejaron de resolverse, mediana de tiempo por encima de la
+        tolerancia (y de MINIMO_SEGUNDOS en valor absoluto), más intentos o más memoria pico.
+        """
+        tolerancia_tiempo = tolerancia_tiempo if tolerancia_tiempo is not None else cls.TOLERANCIA_TIEMPO
+        tolerancia_intentos = tolerancia_intentos if tolerancia_intentos is not None else cls.TOLERANCIA_INTENTOS
+        tolerancia_memoria = tolerancia_memoria if tolerancia_memoria is not None else cls.TOLERANCIA_MEMORIA
+        regresiones = {}
+        for nombre, actual in resultados["tableros"].items():
+            anterior = base.get("tableros", {}).get(nombre)
+            if anterior is None:
+                continue
+            motivos = []
+            if anterior["completa"] and not actual["completa"]:
+                motivos.append(f"dejó de resolverse ({actual['estado']})")
+            t0, t1 = anterior["tiempo_mediana"], actual["tiempo_mediana"]
+            if t1 > t0 * (1 + tolerancia_tiempo) and t1 - t0 > cls.MINIMO_SEGUNDOS:
+                motivos.append(f"tiempo {t0:.3f} s -> {t1:.3f} s")
+            i0, i1 = anterior.get("intentos"), actual.get("intentos")
+            if i0 is not None and i1 is not None and i1 > i0 * (1 + tolerancia_intentos):
+                motivos.append(f"intentos {i0} -> {i1}")
+            m0, m1 = anterior.get("memoria_pico_kb"), actual.get("memoria_pico_kb")
+            if m0 is not None and m1 is not None and m1 > m0 * (1 + tolerancia_memoria) and m1 - m0 > cls.MINIMO_KB:
+                motivos.append(f"memoria {m0} KB -> {m1} KB")
+            if motivos:
+                regresiones[nombre] = motivos
+        return regresiones
+
+    @staticmethod
+    def guardar(resultados, ruta):
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def cargar(ruta):
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            return json.load(archivo)
+
+
+# --- Ejecución principal ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark y detección de regresiones del solucionador NumberLink.")
+    parser.add_argument("--directorio", default="tablerosEntrada", help="corpus de tableros (por defecto tablerosEntrada)")
+    parser.add_argument("--repeticiones", type=int, default=NumberLinkBenchmark.REPETICIONES)
+    parser.add_argument("--tiempo", type=float, default=NumberLinkBenchmark.TIEMPO_MAX,
+                        help="tiempo máximo por corrida en segundos")
+    parser.add_argument("--metodo", choices=sorted(NumberLinkBenchmark.METODOS), default="backtracking")
+    parser.add_argument("--motor", choices=NumberLinkHeuristicSolver.MOTORES, default=None)
+    parser.add_argument("--sin-generados", action="store_true", help="omite los tableros generados más grandes")
+    parser.add_argument("--semilla", type=int, default=NumberLinkBenchmark.SEMILLA_GENERADOS,
+                        help="semilla de los tableros generados")
+    parser.add_argument("--salida", default="benchmark_resultados.json", help="archivo JSON de resultados")
+    parser.add_argument("--base", default=None, help="resultados anteriores contra los que comparar")
+    parser.add_argument("--tolerancia", type=float, default=NumberLinkBenchmark.TOLERANCIA_TIEMPO,
+                        help="aumento relativo de tiempo tolerado antes de marcar regresión")
+    args = parser.parse_args()
+
+    corpus = NumberLinkBenchmark.leer_corpus(args.directorio)
+    tableros = corpus if args.sin_generados else corpus + NumberLinkBenchmark.tableros_generados(args.semilla)
+    opciones = {"motor": args.motor} if args.motor else {}
+    resultados = NumberLinkBenchmark.ejecutar(tableros, args.repeticiones, args.tiempo, args.metodo, opciones)
+    NumberLinkBenchmark.guardar(resultados, args.salida)
+    print(f"\nResultados guardados en: {args.salida}")
+
+    if args.base:
+        regresiones = NumberLinkBenchmark.comparar(resultados, NumberLinkBenchmark.cargar(args.base), args.tolerancia)
+        if regresiones:
+            print(f"\n✗ Regresiones respecto de {args.base}:")
+            for nombre, motivos in regresiones.items():
+                print(f"  {nombre}: {'; '.join(motivos)}")
+            sys.exit(1)
+        print(f"\n✓ Sin regresiones respecto de {args.base}")
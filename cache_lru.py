@@ -0,0 +1,74 @@
+# cache_lru.py
+# Descripción: Caché acotada con expulsión LRU y contadores de aciertos, fallos y expulsiones
+
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Diccionario acotado por número de entradas y/o por costo acumulado (por ejemplo, celdas
+    guardadas). Al superar cualquiera de los dos presupuestos expulsa las entradas usadas hace
+    más tiempo. Lleva la cuenta de aciertos, fallos y expulsiones para poder instrumentar la
+    búsqueda.
+    """
+
+    def __init__(self, max_entradas=None, max_costo=None):
+        self.max_entradas = max_entradas
+        self.max_costo = max_costo
+        self.datos = OrderedDict()
+        self.costo = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+
+    def __len__(self):
+        return len(self.datos)
+
+    def __contains__(self, clave):
+        return clave in self.datos
+
+    def obtener(self, clave, defecto=None):
+        """Devuelve el valor guardado (marcándolo como reciente) o el valor por defecto."""
+        entrada = self.datos.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return defecto
+        self.aciertos += 1
+        self.datos.move_to_end(clave)
+        return entrada[0]
+
+    def guardar(self, clave, valor, costo=1):
+        """Guarda un valor con su costo y expulsa entradas antiguas si se excede el presupuesto."""
+        anterior = self.datos.pop(clave, None)
+        if anterior is not None:
+            self.costo -= anterior[1]
+        if self.max_costo is not None and costo > self.max_costo:
+            return
+        self.datos[clave] = (valor, costo)
+        self.costo += costo
+        while self.datos and self._excedida():
+            _, (_, costo_viejo) = self.datos.popitem(last=False)
+            self.costo -= costo_viejo
+            self.expulsiones += 1
+
+    def _excedida(self):
+        if self.max_entradas is not None and len(self.datos) > self.max_entradas:
+            return True
+        return self.max_costo is not None and self.costo > self.max_costo
+
+    def limpiar(self):
+        """Vacía la caché sin reiniciar los contadores."""
+        self.datos.clear()
+        self.costo = 0
+
+    def estadisticas(self):
+        """Resumen de ocupación y contadores de la caché."""
+        consultas = self.aciertos + self.fallos
+        return {
+            "entradas": len(self.datos),
+            "costo": self.costo,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "expulsiones": self.expulsiones,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+        }
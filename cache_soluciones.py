@@ -0,0 +1,211 @@
+# cache_soluciones.py
+# Descripción: Caché persistente de soluciones en SQLite, indexada por la forma canónica del tablero
+
+import hashlib
+import os
+import sqlite3
+import time
+from array import array
+from functools import lru_cache
+
+
+class CacheSoluciones:
+    """
+    Guarda en un archivo SQLite la solución de cada tablero resuelto (o la constancia de que
+    no tiene solución) indexada por su forma canónica: la menor, entre las 8 simetrías de la
+    grilla (rotaciones y reflejos), de la lista de celdas con los símbolos renombrados 1, 2,
+    ... en orden de aparición. Un tablero rotado, reflejado o con otros símbolos comparte la
+    misma entrada, y al encontrarla la solución se devuelve en la orientación y con los
+    símbolos de quien consulta. Varias instancias (por ejemplo, procesos de un lote) pueden
+    usar el mismo archivo.
+    """
+
+    RUTA_POR_DEFECTO = "soluciones.sqlite"
+    ESPERA_BLOQUEO = 30.0
+    _abiertas = {}
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta or self.RUTA_POR_DEFECTO
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self.conexion = sqlite3.connect(self.ruta, timeout=self.ESPERA_BLOQUEO)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("CREATE TABLE IF NOT EXISTS soluciones ("
+                              "clave BLOB PRIMARY KEY, filas INTEGER, cols INTEGER, completa INTEGER, "
+                              "solucion BLOB, creado REAL)")
+        self.conexion.commit()
+        self.aciertos = 0
+        self.fallos = 0
+
+    @classmethod
+    def abrir(cls, ruta=None):
+        """Instancia compartida por proceso para una ruta."""
+        ruta = ruta or cls.RUTA_POR_DEFECTO
+        cache = cls._abiertas.get(ruta)
+        if cache is None:
+            cache = cls._abiertas[ruta] = cls(ruta)
+        return cache
+
+    def cerrar(self):
+        self.conexion.close()
+        if CacheSoluciones._abiertas.get(self.ruta) is self:
+            del CacheSoluciones._abiertas[self.ruta]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    @staticmethod
+    def transformar_posicion(i, j, filas, cols, simetria):
+        """
+        Posición de (i, j) tras la simetría (0-7): el bit 0 refleja las columnas, el bit 1
+        refleja las filas y el bit 2 traspone. Devuelve (fila, col) en el tablero transformado.
+        """
+        if simetria & 1:
+            j = cols - 1 - j
+        if simetria & 2:
+            i = filas - 1 - i
+        if simetria & 4:
+            i, j = j, i
+        return i, j
+
+    @classmethod
+    def transformar(cls, tablero, simetria):
+        """Copia del tablero con la simetría aplicada (con filas y columnas cambiadas si traspone)."""
+        filas = len(tablero)
+        cols = len(tablero[0]) if filas else 0
+        nuevas, nuevas_cols = (cols, filas) if simetria & 4 else (filas, cols)
+        resultado = [[' '] * nuevas_cols for _ in range(nuevas)]
+        for i in range(filas):
+            for j in range(cols):
+                a, b = cls.transformar_posicion(i, j, filas, cols, simetria)
+                resultado[a][b] = tablero[i][j]
+        return resultado
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _ordenes(filas, cols):
+        """
+        Para cada simetría, (filas, columnas, orden) del tablero transformado, donde orden da
+        el índice plano de origen de cada celda transformada en orden de lectura.
+        """
+        ordenes = []
+        for simetria in range(8):
+            nuevas, nuevas_cols = (cols, filas) if simetria & 4 else (filas, cols)
+            orden = [0] * (filas * cols)
+            for i in range(filas):
+                for j in range(cols):
+                    a, b = CacheSoluciones.transformar_posicion(i, j, filas, cols, simetria)
+                    orden[a * nuevas_cols + b] = i * cols + j
+            ordenes.append((nuevas, nuevas_cols, orden))
+        return tuple(ordenes)
+
+    @staticmethod
+    def _etiquetar(celdas, orden):
+        """(forma, etiquetas): las celdas en orden, con 0 para vacías y 1, 2, ... por símbolo en orden de aparición."""
+        etiquetas = {' ': 0}
+        forma = []
+        for k in orden:
+            celda = celdas[k]
+            etiqueta = etiquetas.get(celda)
+            if etiqueta is None:
+                etiqueta = etiquetas[celda] = len(etiquetas)
+            forma.append(etiqueta)
+        del etiquetas[' ']
+        return forma, etiquetas
+
+    @classmethod
+    def canonizar(cls, tablero):
+        """
+        (clave, simetria, etiquetas) de un tablero: clave es el hash de la forma canónica,
+        simetria la que la produce y etiquetas el número que recibe cada símbolo original.
+        """
+        filas = len(tablero)
+        cols = len(tablero[0]) if filas else 0
+        celdas = [celda for fila in tablero for celda in fila]
+        mejor = None
+        for simetria, (nuevas, nuevas_cols, orden) in enumerate(cls._ordenes(filas, cols)):
+            forma, etiquetas = cls._etiquetar(celdas, orden)
+            candidato = (nuevas, nuevas_cols, forma)
+            if mejor is None or candidato < mejor[0]:
+                mejor = (candidato, simetria, etiquetas)
+        (filas, cols, forma), simetria, etiquetas = mejor
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{filas}x{cols}:".encode('utf-8'))
+        h.update(array('H', forma).tobytes())
+        return h.digest(), simetria, etiquetas
+
+    def buscar(self, tablero):
+        """
+        (solucion, completa) guardada para el tablero, ya llevada a su orientación y sus
+        símbolos, o None si no está. Sin solución conocida devuelve una copia del tablero y
+        False. En la solución los extremos conservan su símbolo y el resto de las celdas usa
+        el símbolo en minúscula, como en el solucionador.
+        """
+        clave, simetria, etiquetas = self.canonizar(tablero)
+        fila = self.conexion.execute("SELECT filas, cols, completa, solucion FROM soluciones WHERE clave = ?",
+                                     (clave,)).fetchone()
+        if fila is None:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        filas_canon, cols_canon, completa, datos = fila
+        if not completa:
+            return [list(f) for f in tablero], False
+
+        simbolos = {etiqueta: simbolo for simbolo, etiqueta in etiquetas.items()}
+        canonica = array('H')
+        canonica.frombytes(datos)
+        filas = len(tablero)
+        cols = len(tablero[0]) if filas else 0
+        solucion = [list(f) for f in tablero]
+        for i in range(filas):
+            for j in range(cols):
+                if solucion[i][j] == ' ':
+                    a, b = self.transformar_posicion(i, j, filas, cols, simetria)
+                    solucion[i][j] = simbolos[canonica[a * cols_canon + b]].lower()
+        return solucion, True
+
+    def guardar(self, tablero, solucion, completa):
+        """
+        Guarda la solución de un tablero (completa=True) o la constancia de que no tiene
+        solución (completa=False, solo si eso está demostrado). Reemplaza lo que hubiera.
+        """
+        clave, simetria, etiquetas = self.canonizar(tablero)
+        filas = len(tablero)
+        cols = len(tablero[0]) if filas else 0
+        if simetria & 4:
+            filas, cols = cols, filas
+        datos = b''
+        if completa:
+            por_celda = dict(etiquetas)
+            for simbolo, etiqueta in etiquetas.items():
+                por_celda.setdefault(simbolo.lower(), etiqueta)
+            canonica = self.transformar(solucion, simetria)
+            datos = array('H', (por_celda[celda] for fila in canonica for celda in fila)).tobytes()
+        self.conexion.execute("INSERT OR REPLACE INTO soluciones VALUES (?, ?, ?, ?, ?, ?)",
+                              (clave, filas, cols, int(completa), datos, time.time()))
+        self.conexion.commit()
+
+    def registrar(self, tablero, solucion, completa, estadisticas=None):
+        """
+        Guarda el resultado de una resolución si sirve para otra: una solución completa, o
+        una búsqueda sin solución que terminó sin agotar presupuestos ni recortar rutas (las
+        estadisticas del solucionador lo indican). Devuelve True si se guardó.
+        """
+        if not completa:
+            estadisticas = estadisticas or {}
+            if estadisticas.get("motivo") != "sin_solucion" or estadisticas.get("caminos_recortados", True):
+                return False
+        self.guardar(tablero, solucion, completa)
+        return True
+
+    def estadisticas(self):
+        """Entradas del archivo y aciertos y fallos de esta instancia."""
+        entradas = self.conexion.execute("SELECT COUNT(*) FROM soluciones").fetchone()[0]
+        consultas = self.aciertos + self.fallos
+        return {"entradas": entradas, "aciertos": self.aciertos, "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0}
@@ -0,0 +1,83 @@
+# caminos_compactos.py
+# Descripción: Rutas candidatas de un par guardadas como un arreglo plano de índices de celda
+
+from array import array
+
+
+class CaminosCompactos:
+    """
+    Lista de rutas de un par en dos arreglos planos: celdas, con los índices de celda
+    (fila * cols + col) de todas las rutas una tras otra, extremos incluidos, en el tipo más
+    angosto que alcance para el tablero (un byte por celda hasta 256 celdas), e inicios, con
+    la posición donde empieza cada ruta. Cada ruta ocupa así unos pocos bytes por celda en
+    lugar de una lista de tuplas, lo que importa cuando la caché de caminos guarda miles.
+
+    Se usa como una lista de rutas: len(), iteración, caminos[k] (un array de índices) y
+    caminos[a:b]. posiciones(k) da la ruta como lista de (fila, col) para quien la necesite.
+    """
+
+    def __init__(self, filas, cols, caminos=()):
+        self.filas = filas
+        self.cols = cols
+        self.celdas = array(self.tipo(filas * cols))
+        self.inicios = array('I', [0])
+        for camino in caminos:
+            self.agregar(camino)
+
+    @staticmethod
+    def tipo(celdas):
+        """Código de array más angosto que guarda índices de un tablero con esa cantidad de celdas."""
+        return 'B' if celdas <= 1 << 8 else 'H' if celdas <= 1 << 16 else 'I'
+
+    @classmethod
+    def camino(cls, indices, filas, cols):
+        """Una sola ruta (índices de celda) como array del tipo que usa la lista."""
+        return array(cls.tipo(filas * cols), indices)
+
+    def agregar(self, camino):
+        """Agrega una ruta dada como índices de celda."""
+        self.celdas.extend(camino)
+        self.inicios.append(len(self.celdas))
+
+    def __len__(self):
+        return len(self.inicios) - 1
+
+    def __iter__(self):
+        celdas = self.celdas
+        inicios = self.inicios
+        for k in range(len(inicios) - 1):
+            yield celdas[inicios[k]:inicios[k + 1]]
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            indices = range(*k.indices(len(self)))
+            if len(indices) == len(self) and k.step in (None, 1):
+                return self
+            return self.seleccionar(indices)
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("índice de camino fuera de rango")
+        return self.celdas[self.inicios[k]:self.inicios[k + 1]]
+
+    def seleccionar(self, indices):
+        """Nueva lista con las rutas de esos índices, en ese orden."""
+        nueva = CaminosCompactos(self.filas, self.cols)
+        celdas = self.celdas
+        inicios = self.inicios
+        for k in indices:
+            nueva.celdas.extend(celdas[inicios[k]:inicios[k + 1]])
+            nueva.inicios.append(len(nueva.celdas))
+        return nueva
+
+    def largo(self, k):
+        """Cantidad de celdas de la ruta k, extremos incluidos."""
+        return self.inicios[k + 1] - self.inicios[k]
+
+    def ordenar_por_largo(self):
+        """Nueva lista con las rutas de la más corta a la más larga (estable ante empates)."""
+        return self.seleccionar(sorted(range(len(self)), key=self.largo))
+
+    def posiciones(self, k):
+        """La ruta k como lista de posiciones (fila, col)."""
+        return [divmod(indice, self.cols) for indice in self[k]]
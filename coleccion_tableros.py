@@ -0,0 +1,263 @@
+# coleccion_tableros.py
+# Descripción: Archivos con muchos tableros NumberLink: lectura perezosa con mmap e índice de acceso directo
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+from leer_tablero import NumberLinkBoardIO
+
+
+class ColeccionTableros:
+    """
+    Una colección es la concatenación de tableros en el formato de leer_tablero: cada uno es
+    una cabecera 'filas columnas' seguida de exactamente filas líneas, y entre tableros se
+    admiten líneas vacías. Un archivo de un solo tablero es, por lo tanto, una colección de
+    uno. El archivo se recorre con mmap sin cargarlo en memoria: iterar entrega los tableros
+    uno a uno, y con el índice (posición en bytes de cada cabecera, guardado en <ruta>.idx)
+    se accede directamente al tablero n.
+    """
+
+    EXTENSION_INDICE = ".idx"
+    MAGIA_INDICE = b"NLIDX1\0\0"
+    CABECERA_INDICE = struct.Struct("<8sQQQ")
+    _abiertas = {}
+
+    def __init__(self, ruta, usar_indice=True):
+        if not os.path.exists(ruta):
+            raise FileNotFoundError(f"No se encontró el archivo: {ruta}")
+        self.ruta = ruta
+        self.usar_indice = usar_indice
+        self._archivo = open(ruta, 'rb')
+        self._mapa = None
+        if os.fstat(self._archivo.fileno()).st_size > 0:
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._indice = None
+
+    @classmethod
+    def abrir(cls, ruta):
+        """Instancia compartida por proceso, para no reabrir ni reindexar en cada consulta."""
+        coleccion = cls._abiertas.get(ruta)
+        if coleccion is None:
+            coleccion = cls._abiertas[ruta] = cls(ruta)
+        return coleccion
+
+    def cerrar(self):
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+        self._archivo.close()
+        if type(self)._abiertas.get(self.ruta) is self:
+            del type(self)._abiertas[self.ruta]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def _cabecera(self, posicion):
+        """
+        Salta las líneas vacías desde posicion y lee la cabecera del siguiente tablero.
+        Devuelve (posición de la cabecera, filas, columnas), o None si ya no quedan tableros.
+        """
+        mapa = self._mapa
+        if mapa is None:
+            return None
+        mapa.seek(posicion)
+        while True:
+            inicio = mapa.tell()
+            linea = mapa.readline()
+            if not linea:
+                return None
+            if linea.strip():
+                break
+        partes = linea.split()
+        if len(partes) != 2:
+            raise ValueError(f"{self.ruta}: se esperaba 'filas columnas' en el byte {inicio}.")
+        filas, columnas = map(int, partes)
+        return inicio, filas, columnas
+
+    def _leer_en(self, posicion):
+        """(tablero, posición del siguiente) para el tablero cuya cabecera está en posicion o después."""
+        cabecera = self._cabecera(posicion)
+        if cabecera is None:
+            return None, posicion
+        _, filas, columnas = cabecera
+        mapa = self._mapa
+        tablero = []
+        for _ in range(filas):
+            linea = mapa.readline().decode('utf-8').rstrip('\r\n')
+            if len(linea) < columnas:
+                linea += ' ' * (columnas - len(linea))
+            tablero.append(list(linea[:columnas]))
+        return tablero, mapa.tell()
+
+    def __iter__(self):
+        """Genera los tableros en orden, leyendo cada uno solo cuando se pide."""
+        posicion = 0
+        while True:
+            tablero, posicion = self._leer_en(posicion)
+            if tablero is None:
+                return
+            yield tablero
+
+    def construir_indice(self):
+        """Posiciones en bytes de la cabecera de cada tablero, recorriendo las filas sin decodificarlas."""
+        posiciones = []
+        posicion = 0
+        while True:
+            cabecera = self._cabecera(posicion)
+            if cabecera is None:
+                return posiciones
+            inicio, filas, _ = cabecera
+            posiciones.append(inicio)
+            for _ in range(filas):
+                self._mapa.readline()
+            posicion = self._mapa.tell()
+
+    def _firma(self):
+        estado = os.stat(self.ruta)
+        return estado.st_size, estado.st_mtime_ns
+
+    def guardar_indice(self, posiciones=None):
+        """Escribe <ruta>.idx: cabecera (magia, cantidad, tamaño y fecha del archivo) y posiciones uint64."""
+        posiciones = posiciones if posiciones is not None else self.indice()
+        tamano, fecha = self._firma()
+        with open(self.ruta + self.EXTENSION_INDICE, 'wb') as archivo:
+            archivo.write(self.CABECERA_INDICE.pack(self.MAGIA_INDICE, len(posiciones), tamano, fecha))
+            archivo.write(struct.pack(f"<{len(posiciones)}Q", *posiciones))
+
+    def _cargar_indice(self):
+        """Posiciones del archivo .idx, o None si no existe o no corresponde al archivo actual."""
+        ruta_indice = self.ruta + self.EXTENSION_INDICE
+        if not os.path.exists(ruta_indice):
+            return None
+        with open(ruta_indice, 'rb') as archivo:
+            datos = archivo.read()
+        if len(datos) < self.CABECERA_INDICE.size:
+            return None
+        magia, cantidad, tamano, fecha = self.CABECERA_INDICE.unpack_from(datos)
+        if magia != self.MAGIA_INDICE or (tamano, fecha) != self._firma() or \
+                len(datos) != self.CABECERA_INDICE.size + 8 * cantidad:
+            return None
+        return list(struct.unpack_from(f"<{cantidad}Q", datos, self.CABECERA_INDICE.size))
+
+    def indice(self):
+        """
+        Posiciones de todos los tableros: se toman de <ruta>.idx si está al día con el archivo
+        y, si no, se recorre la colección una vez (y se guarda el .idx si usar_indice).
+        """
+        if self._indice is None:
+            posiciones = self._cargar_indice() if self.usar_indice else None
+            if posiciones is None:
+                posiciones = self.construir_indice()
+                if self.usar_indice:
+                    try:
+                        self.guardar_indice(posiciones)
+                    except OSError:
+                        pass
+            self._indice = posiciones
+        return self._indice
+
+    def __len__(self):
+        return len(self.indice())
+
+    def __getitem__(self, n):
+        """Tablero n (desde 0; se admiten índices negativos) leído directamente desde su posición."""
+        posiciones = self.indice()
+        if not -len(posiciones) <= n < len(posiciones):
+            raise IndexError(f"{self.ruta} tiene {len(posiciones)} tableros; no existe el tablero {n}.")
+        tablero, _ = self._leer_en(posiciones[n])
+        return tablero
+
+    @staticmethod
+    def es_coleccion(ruta):
+        """True si la primera línea no vacía del archivo es una cabecera 'filas columnas'."""
+        with open(ruta, 'rb') as archivo:
+            for linea in archivo:
+                if linea.strip():
+                    partes = linea.split()
+                    return len(partes) == 2 and all(parte.isdigit() for parte in partes)
+        return False
+
+    @classmethod
+    def leer_tableros(cls, ruta):
+        """Generador de los tableros de un archivo (de uno o de muchos), cerrándolo al terminar."""
+        with cls(ruta, usar_indice=False) as coleccion:
+            yield from coleccion
+
+    @classmethod
+    def guardar_coleccion(cls, tableros, ruta, indice=True):
+        """
+        Escribe los tableros (cualquier iterable) uno tras otro con el formato de
+        leer_tablero y, con indice, también su .idx. Devuelve la cantidad escrita.
+        """
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        posiciones = []
+        with open(ruta, 'wb') as archivo:
+            for tablero in tableros:
+                posiciones.append(archivo.tell())
+                filas = len(tablero)
+                columnas = len(tablero[0]) if filas else 0
+                texto = f"{filas} {columnas}\n" + ''.join(''.join(fila) + "\n" for fila in tablero)
+                archivo.write(texto.encode('utf-8'))
+        if indice:
+            with cls(ruta) as coleccion:
+                coleccion.guardar_indice(posiciones)
+        return len(posiciones)
+
+    @staticmethod
+    def rutas_de_entradas(entradas):
+        """Expande directorios a sus archivos .txt en orden alfabético; los archivos quedan igual."""
+        rutas = []
+        for entrada in entradas:
+            if os.path.isdir(entrada):
+                rutas.extend(os.path.join(entrada, nombre) for nombre in sorted(os.listdir(entrada))
+                             if nombre.endswith('.txt'))
+            else:
+                rutas.append(entrada)
+        return rutas
+
+    @classmethod
+    def empaquetar(cls, entradas, ruta):
+        """Une en una colección los tableros de varios archivos o directorios (cada archivo puede ser una colección)."""
+        def tableros():
+            for entrada in cls.rutas_de_entradas(entradas):
+                yield from cls.leer_tableros(entrada)
+        return cls.guardar_coleccion(tableros(), ruta)
+
+
+# --- Ejecución principal ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Colecciones de tableros NumberLink en un solo archivo.")
+    ordenes = parser.add_subparsers(dest="orden", required=True)
+    empaquetar = ordenes.add_parser("empaquetar", help="une tableros de archivos o directorios en una colección")
+    empaquetar.add_argument("salida")
+    empaquetar.add_argument("entradas", nargs="+")
+    indexar = ordenes.add_parser("indexar", help="(re)construye el índice <colección>.idx")
+    indexar.add_argument("coleccion")
+    mostrar = ordenes.add_parser("mostrar", help="imprime el tablero n de una colección")
+    mostrar.add_argument("coleccion")
+    mostrar.add_argument("n", type=int)
+    args = parser.parse_args()
+
+    try:
+        if args.orden == "empaquetar":
+            cantidad = ColeccionTableros.empaquetar(args.entradas, args.salida)
+            print(f"{cantidad} tableros guardados en {args.salida}")
+        elif args.orden == "indexar":
+            with ColeccionTableros(args.coleccion) as coleccion:
+                posiciones = coleccion.construir_indice()
+                coleccion.guardar_indice(posiciones)
+            print(f"{len(posiciones)} tableros indexados en {args.coleccion}{ColeccionTableros.EXTENSION_INDICE}")
+        else:
+            with ColeccionTableros(args.coleccion) as coleccion:
+                NumberLinkBoardIO.imprimir_tablero(coleccion[args.n])
+    except (OSError, ValueError, IndexError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,259 @@
+# estado_busqueda.py
+# Descripción: Estado incremental de la búsqueda (grados, componentes y alcanzabilidad) con registro de deshacer
+
+from tablero_bits import TableroBits
+
+
+class EstadoBusqueda:
+    """
+    Mantiene al día, mientras se marcan y desmarcan caminos, la información que las podas
+    del backtracking recalculaban desde cero en cada nodo:
+
+    - grado de cada celda (vecinos libres o extremos pendientes) y la máscara de cuellos,
+    - componentes de celdas transitables con su paridad de extremos,
+    - regiones de celdas libres y la alcanzabilidad de cada par pendiente.
+
+    Al marcar un camino solo se revisan sus celdas, sus vecinos y las componentes que lo
+    contenían; los cambios se apilan en un registro para que desmarcar los revierta sin
+    volver a recorrer el tablero. Expone la misma interfaz que TableroBits
+    (marcar_camino, desmarcar_camino, es_viable) para usarse como motor "incremental", y
+    extender_par/deshacer para la propagación de movimientos forzados.
+    """
+
+    def __init__(self, tablero, pares):
+        self.bits = TableroBits.desde_tablero(tablero)
+        self.pendientes = {numero: (p1, p2) for numero, p1, p2 in pares}
+        self.extremos = self.bits.mascara_extremos(pares)
+        self.transitables = self.bits.libres | self.extremos
+        self.registro = []
+
+        total = self.bits.filas * self.bits.cols
+        self.grados = [0] * total
+        for idx in range(total):
+            self.grados[idx] = (self.bits.vecinos(1 << idx) & self.transitables).bit_count()
+        self.cuellos = 0
+        for idx in self._indices(self.bits.libres):
+            if self.grados[idx] <= 1:
+                self.cuellos |= 1 << idx
+
+        self.siguiente_id = 0
+        self.componentes = {}
+        self.malas = set()
+        for comp in self._dividir(self.transitables, self.transitables):
+            self._agregar_componente(comp)
+        self.separados = {numero for numero in self.pendientes if self._par_separado(numero)}
+
+        self.regiones = {}
+        for region in self._dividir(self.bits.libres, self.bits.libres):
+            self.regiones[self._nuevo_id()] = region
+        self.sin_camino = {numero for numero in self.pendientes if not self._par_alcanzable(numero)}
+
+    @staticmethod
+    def _indices(mascara):
+        """Itera los índices de los bits encendidos."""
+        while mascara:
+            b = mascara & -mascara
+            yield b.bit_length() - 1
+            mascara ^= b
+
+    @property
+    def libres(self):
+        """Máscara de celdas libres del tablero actual."""
+        return self.bits.libres
+
+    def _nuevo_id(self):
+        self.siguiente_id += 1
+        return self.siguiente_id
+
+    def _dividir(self, celdas, permitidas):
+        """Separa una máscara en sus componentes conexas dentro de las celdas permitidas."""
+        piezas = []
+        while celdas:
+            pieza = self.bits.inundar(celdas & -celdas, permitidas)
+            piezas.append(pieza)
+            celdas &= ~pieza
+        return piezas
+
+    def _componente_mala(self, comp):
+        """Una componente sin extremos con celdas libres, o con extremos impares, no tiene solución."""
+        extremos_comp = (comp & self.extremos).bit_count()
+        if extremos_comp == 0:
+            return bool(comp & self.bits.libres)
+        return extremos_comp % 2 == 1
+
+    def _agregar_componente(self, comp):
+        comp_id = self._nuevo_id()
+        self.componentes[comp_id] = comp
+        if self._componente_mala(comp):
+            self.malas.add(comp_id)
+        return comp_id
+
+    def _par_separado(self, numero):
+        p1, p2 = self.pendientes[numero]
+        b1, b2 = self.bits.bit(p1), self.bits.bit(p2)
+        for comp in self.componentes.values():
+            if comp & b1:
+                return not comp & b2
+        return True
+
+    def _par_alcanzable(self, numero):
+        """Hay camino si los extremos son vecinos o alguna región libre toca a ambos."""
+        p1, p2 = self.pendientes[numero]
+        alrededor1 = self.bits.vecinos(self.bits.bit(p1))
+        alrededor2 = self.bits.vecinos(self.bits.bit(p2))
+        if alrededor1 & self.bits.bit(p2):
+            return True
+        for region in self.regiones.values():
+            if region & alrededor1 and region & alrededor2:
+                return True
+        return False
+
+    def marcar_camino(self, camino, numero):
+        """Pinta el camino, da el par por conectado y actualiza solo lo que el camino toca."""
+        interior = self.bits.mascara_camino(camino)
+        self._actualizar(numero, interior, None)
+        return interior
+
+    def extender_par(self, numero, pintadas, par_nuevo):
+        """
+        Pinta celdas libres del par y mueve sus extremos pendientes a par_nuevo (p1, p2);
+        con par_nuevo=None el par queda conectado. Se revierte con deshacer().
+        """
+        self._actualizar(numero, pintadas, par_nuevo)
+
+    def _actualizar(self, numero, pintadas, par_nuevo):
+        """Aplica un cambio sobre un par revisando solo las celdas tocadas y sus vecinos."""
+        bits = self.bits
+        par = self.pendientes.pop(numero)
+        salientes = bits.bit(par[0]) | bits.bit(par[1])
+        entrantes = bits.bit(par_nuevo[0]) | bits.bit(par_nuevo[1]) if par_nuevo is not None else 0
+        entrada = {
+            "numero": numero,
+            "par": par,
+            "libres": bits.libres,
+            "pintados": bits.pintados.get(numero, 0),
+            "extremos": self.extremos,
+            "transitables": self.transitables,
+            "cuellos": self.cuellos,
+            "malas": set(self.malas),
+            "separados": set(self.separados),
+            "sin_camino": set(self.sin_camino),
+            "componentes_quitadas": [],
+            "componentes_nuevas": [],
+            "regiones_quitadas": [],
+            "regiones_nuevas": [],
+            "grados": [],
+        }
+        self.registro.append(entrada)
+
+        if par_nuevo is not None:
+            self.pendientes[numero] = par_nuevo
+        bits.libres &= ~pintadas
+        bits.pintados[numero] = entrada["pintados"] | pintadas
+        self.extremos = (self.extremos & ~salientes) | entrantes
+        self.transitables = bits.libres | self.extremos
+        retiradas = entrada["transitables"] & ~self.transitables
+        tocadas = retiradas | pintadas
+
+        # Grados y cuellos: solo vecinos de las celdas que dejaron de ser transitables.
+        for idx in self._indices(retiradas):
+            for vecino in self._indices(bits.vecinos(1 << idx)):
+                self.grados[vecino] -= 1
+                entrada["grados"].append(vecino)
+        self.cuellos &= bits.libres
+        for vecino in self._indices(bits.vecinos(retiradas) & bits.libres):
+            if self.grados[vecino] <= 1:
+                self.cuellos |= 1 << vecino
+
+        # Componentes transitables: solo se re-etiquetan las que contenían celdas tocadas.
+        afectados = {numero} if par_nuevo is not None else set()
+        for comp_id, comp in list(self.componentes.items()):
+            if not comp & tocadas:
+                continue
+            entrada["componentes_quitadas"].append((comp_id, comp))
+            del self.componentes[comp_id]
+            self.malas.discard(comp_id)
+            for pieza in self._dividir(comp & self.transitables, self.transitables):
+                entrada["componentes_nuevas"].append(self._agregar_componente(pieza))
+            for otro, (p1, p2) in self.pendientes.items():
+                if comp & (bits.bit(p1) | bits.bit(p2)):
+                    afectados.add(otro)
+        self.separados.discard(numero)
+        for otro in afectados:
+            if self._par_separado(otro):
+                self.separados.add(otro)
+            else:
+                self.separados.discard(otro)
+
+        # Regiones libres: solo se dividen las regiones de las que salieron celdas pintadas.
+        afectados = {numero} if par_nuevo is not None else set()
+        for reg_id, region in list(self.regiones.items()):
+            if not region & pintadas:
+                continue
+            entrada["regiones_quitadas"].append((reg_id, region))
+            del self.regiones[reg_id]
+            for pieza in self._dividir(region & ~pintadas, bits.libres):
+                reg_nueva = self._nuevo_id()
+                self.regiones[reg_nueva] = pieza
+                entrada["regiones_nuevas"].append(reg_nueva)
+            borde = bits.vecinos(region)
+            for otro, (p1, p2) in self.pendientes.items():
+                if borde & (bits.bit(p1) | bits.bit(p2)):
+                    afectados.add(otro)
+        self.sin_camino.discard(numero)
+        for otro in afectados:
+            if self._par_alcanzable(otro):
+                self.sin_camino.discard(otro)
+            else:
+                self.sin_camino.add(otro)
+
+    def desmarcar_camino(self, camino, numero):
+        """Revierte el último camino marcado usando el registro de deshacer."""
+        if not self.registro or self.registro[-1]["numero"] != numero:
+            raise ValueError(f"Solo se puede desmarcar el último camino marcado (se pidió '{numero}').")
+        self.deshacer()
+        return self.bits.mascara_camino(camino)
+
+    def retraer_par(self, numero, pintadas):
+        """Revierte la última extensión hecha con extender_par."""
+        if not self.registro or self.registro[-1]["numero"] != numero:
+            raise ValueError(f"Solo se puede retraer la última extensión registrada (se pidió '{numero}').")
+        self.deshacer()
+
+    def deshacer(self):
+        """Revierte el último cambio registrado (camino marcado o extensión de un par)."""
+        entrada = self.registro.pop()
+        numero = entrada["numero"]
+        bits = self.bits
+
+        for comp_id in entrada["componentes_nuevas"]:
+            del self.componentes[comp_id]
+        for comp_id, comp in entrada["componentes_quitadas"]:
+            self.componentes[comp_id] = comp
+        for reg_id in entrada["regiones_nuevas"]:
+            del self.regiones[reg_id]
+        for reg_id, region in entrada["regiones_quitadas"]:
+            self.regiones[reg_id] = region
+        for vecino in entrada["grados"]:
+            self.grados[vecino] += 1
+
+        bits.libres = entrada["libres"]
+        bits.pintados[numero] = entrada["pintados"]
+        self.extremos = entrada["extremos"]
+        self.transitables = entrada["transitables"]
+        self.cuellos = entrada["cuellos"]
+        self.malas = entrada["malas"]
+        self.separados = entrada["separados"]
+        self.sin_camino = entrada["sin_camino"]
+        self.pendientes[numero] = entrada["par"]
+
+    def es_viable(self, pares_restantes, limite=None):
+        """Consulta en O(1) el resultado de las tres podas para los pares pendientes."""
+        if not pares_restantes:
+            return True
+        return (not self.cuellos and not self.malas and
+                not self.separados and not self.sin_camino)
+
+    def a_tablero(self):
+        """Reconstruye la lista de listas de caracteres equivalente."""
+        return self.bits.a_tablero()
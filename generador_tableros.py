@@ -0,0 +1,285 @@
+# generador_tableros.py
+# Descripción: Genera tableros NumberLink de cualquier tamaño a partir de coberturas aleatorias con caminos
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+from leer_tablero import NumberLinkBoardIO
+from numberlink_heuristica import NumberLinkHeuristicSolver
+
+
+class NumberLinkGenerator:
+    """
+    Construye tableros resolubles por construcción: cubre la grilla con caminos que no se
+    cruzan ni se tocan a sí mismos y deja como tablero solo los extremos de cada camino. La
+    cobertura parte de un embaldosado aleatorio con dominós y fusiona al azar caminos cuyos
+    extremos son vecinos (siempre que el resultado no se toque a sí mismo) hasta llegar a la
+    cantidad de pares pedida. Opcionalmente se descartan los tableros con más de una solución.
+    """
+
+    SIMBOLOS = ("123456789abcdefghijklmnopqrstuvwxyz#$%&@*+=?!<>~^"
+                "αβγδεζηθικλμνξοπρστυφχψωабвгдежзийклмнопрстуфхцчшщъыьэюя"
+                "àáâãäåæçèéêëìíîïðñòóôõöøùúûüýþ")
+    MAX_INTENTOS = 50
+    FALLOS_POR_CAMINO = 100
+    TIEMPO_UNICIDAD = 10.0
+    CELDAS_POR_PAR_MINIMO = 40
+
+    @classmethod
+    def pares_por_defecto(cls, filas, cols):
+        """Cantidad de pares proporcional al lado del tablero (unos 12 para 10x10), sin bajar de pares_minimos."""
+        return max(round(1.25 * (filas * cols) ** 0.5), cls.pares_minimos(filas, cols))
+
+    @classmethod
+    def pares_minimos(cls, filas, cols):
+        """
+        Menor cantidad de pares que las fusiones alcanzan de forma confiable: con menos, los
+        caminos largos se estancan porque no pueden crecer sin tocarse a sí mismos. Es el
+        mayor entre 2, 0.4 * raíz de las celdas (tableros chicos) y una celda cada
+        CELDAS_POR_PAR_MINIMO (tableros grandes): 4 para 10x10, 10 para 20x20, 23 para 30x30.
+        """
+        celdas = filas * cols
+        return max(2, math.ceil(0.4 * celdas ** 0.5), math.ceil(celdas / cls.CELDAS_POR_PAR_MINIMO))
+
+    @staticmethod
+    def _vecinos(celda, filas, cols):
+        i, j = celda
+        if i > 0:
+            yield (i - 1, j)
+        if i < filas - 1:
+            yield (i + 1, j)
+        if j > 0:
+            yield (i, j - 1)
+        if j < cols - 1:
+            yield (i, j + 1)
+
+    @classmethod
+    def _fusionar(cls, caminos, dueno, a, b, x, y, filas, cols):
+        """
+        Une el camino a (por su extremo x) con el camino b (por su extremo y, vecino de x) si
+        ninguna otra celda de uno toca al otro; así el camino unido no se toca a sí mismo.
+        Las celdas del camino más corto pasan a pertenecer al más largo. Devuelve el id del
+        camino resultante, o None si la unión no es válida.
+        """
+        corto, largo = (a, b) if len(caminos[a]) <= len(caminos[b]) else (b, a)
+        for celda in caminos[corto]:
+            for vecino in cls._vecinos(celda, filas, cols):
+                if dueno[vecino[0]][vecino[1]] == largo and {celda, vecino} != {x, y}:
+                    return None
+
+        primero = caminos[a] if caminos[a][-1] == x else caminos[a][::-1]
+        segundo = caminos[b] if caminos[b][0] == y else caminos[b][::-1]
+        for celda in caminos[corto]:
+            dueno[celda[0]][celda[1]] = largo
+        caminos[largo] = primero + segundo
+        del caminos[corto]
+        return largo
+
+    @classmethod
+    def _embaldosar(cls, filas, cols, azar):
+        """
+        Cobertura inicial con dominós en orden aleatorio. Las celdas que quedan sueltas se
+        unen a un camino vecino; devuelve (caminos, dueno) o None si alguna no pudo unirse.
+        """
+        dueno = [[None] * cols for _ in range(filas)]
+        caminos = {}
+        celdas = [(i, j) for i in range(filas) for j in range(cols)]
+        azar.shuffle(celdas)
+        sueltas = []
+        for celda in celdas:
+            if dueno[celda[0]][celda[1]] is not None:
+                continue
+            libres = [v for v in cls._vecinos(celda, filas, cols) if dueno[v[0]][v[1]] is None]
+            ident = len(caminos)
+            dueno[celda[0]][celda[1]] = ident
+            if libres:
+                vecino = azar.choice(libres)
+                dueno[vecino[0]][vecino[1]] = ident
+                caminos[ident] = [celda, vecino]
+            else:
+                caminos[ident] = [celda]
+                sueltas.append(ident)
+
+        for ident in sueltas:
+            celda = caminos[ident][0]
+            vecinos = list(cls._vecinos(celda, filas, cols))
+            azar.shuffle(vecinos)
+            for vecino in vecinos:
+                otro = dueno[vecino[0]][vecino[1]]
+                if otro != ident and vecino in (caminos[otro][0], caminos[otro][-1]) and \
+                        cls._fusionar(caminos, dueno, otro, ident, vecino, celda, filas, cols) is not None:
+                    break
+            else:
+                return None
+        return caminos, dueno
+
+    @classmethod
+    def generar_cobertura(cls, filas, cols, pares, azar):
+        """
+        Lista de caminos (listas de celdas) que cubren la grilla sin cruzarse ni tocarse a sí
+        mismos, con exactamente pares caminos de al menos dos celdas. Devuelve None si las
+        fusiones se estancan antes de llegar a esa cantidad.
+        """
+        inicial = cls._embaldosar(filas, cols, azar)
+        if inicial is None:
+            return None
+        caminos, dueno = inicial
+        ids = list(caminos)
+        fallos = 0
+        while len(caminos) > pares:
+            if fallos > cls.FALLOS_POR_CAMINO * len(caminos):
+                return None
+            posicion = azar.randrange(len(ids))
+            a = ids[posicion]
+            if a not in caminos:
+                ids[posicion] = ids[-1]
+                ids.pop()
+                continue
+            x = caminos[a][0] if azar.random() < 0.5 else caminos[a][-1]
+            y = azar.choice(list(cls._vecinos(x, filas, cols)))
+            b = dueno[y[0]][y[1]]
+            if b == a:
+                fallos += 1
+                continue
+            if y in (caminos[b][0], caminos[b][-1]) and \
+                    cls._fusionar(caminos, dueno, a, b, x, y, filas, cols) is not None:
+                fallos = 0
+                continue
+            fallos += 1
+            cls._absorber(caminos, dueno, a, b, x, y, azar, filas, cols)
+        return list(caminos.values())
+
+    @classmethod
+    def _absorber(cls, caminos, dueno, a, b, x, y, azar, filas, cols):
+        """
+        Corta el camino b en su celda y (vecina del extremo x de a) y agrega a a uno de los dos
+        tramos que empiezan en y, si lo que queda de b conserva al menos dos celdas y el tramo
+        no toca ninguna otra celda de a. No cambia la cantidad de caminos, pero mueve los
+        extremos y abre fusiones nuevas cuando la cobertura se estanca.
+        """
+        camino = caminos[b]
+        k = camino.index(y)
+        if azar.random() < 0.5:
+            tramo, resto = camino[k:], camino[:k]
+        else:
+            tramo, resto = camino[k::-1], camino[k + 1:]
+        if len(resto) < 2:
+            return False
+        for celda in tramo:
+            for vecino in cls._vecinos(celda, filas, cols):
+                if dueno[vecino[0]][vecino[1]] == a and {celda, vecino} != {x, y}:
+                    return False
+
+        primero = caminos[a] if caminos[a][-1] == x else caminos[a][::-1]
+        caminos[a] = primero + tramo
+        caminos[b] = resto
+        for celda in tramo:
+            dueno[celda[0]][celda[1]] = a
+        return True
+
+    @classmethod
+    def tableros_desde_caminos(cls, filas, cols, caminos):
+        """
+        (tablero, solucion): el tablero solo con los extremos de cada camino y la solución
+        con todas sus celdas. Los símbolos se asignan en orden de lectura del primer extremo.
+        """
+        if len(caminos) > len(cls.SIMBOLOS):
+            raise ValueError(f"Se pidieron {len(caminos)} pares y solo hay {len(cls.SIMBOLOS)} símbolos.")
+        tablero = [[' '] * cols for _ in range(filas)]
+        solucion = [[' '] * cols for _ in range(filas)]
+        for simbolo, camino in zip(cls.SIMBOLOS, sorted(caminos, key=lambda c: min(c[0], c[-1]))):
+            for i, j in camino:
+                solucion[i][j] = simbolo
+            for i, j in (camino[0], camino[-1]):
+                tablero[i][j] = simbolo
+        return tablero, solucion
+
+    @classmethod
+    def es_unica(cls, tablero, tiempo_max=None):
+        """True si contar_soluciones demuestra que el tablero tiene exactamente una solución."""
+        tiempo_max = tiempo_max if tiempo_max is not None else cls.TIEMPO_UNICIDAD
+        conteo = NumberLinkHeuristicSolver.contar_soluciones(tablero, tope=2, testigos=0, verbose=False,
+                                                             tiempo_max=tiempo_max)
+        return conteo["resultado"] == "unica"
+
+    @classmethod
+    def generar(cls, filas, cols, pares=None, azar=None, unica=False, intentos=None, tiempo_unicidad=None):
+        """
+        Genera un tablero de filas x cols con pares pares (por defecto pares_por_defecto, y
+        nunca menos que pares_minimos) y devuelve (tablero, solucion). azar es un random.Random (o una semilla). Con unica se
+        repite hasta obtener un tablero de solución única. Lanza ValueError si no lo logra
+        en intentos (MAX_INTENTOS) coberturas.
+        """
+        if filas * cols < 2:
+            raise ValueError("El tablero debe tener al menos dos celdas.")
+        pares = pares if pares is not None else cls.pares_por_defecto(filas, cols)
+        minimo = min(cls.pares_minimos(filas, cols), filas * cols // 2)
+        if not minimo <= pares <= filas * cols // 2:
+            raise ValueError(f"La cantidad de pares para {filas}x{cols} debe estar entre {minimo} y "
+                             f"{filas * cols // 2}; con menos pares las coberturas aleatorias se estancan.")
+        if pares > len(cls.SIMBOLOS):
+            raise ValueError(f"Se pidieron {pares} pares y solo hay {len(cls.SIMBOLOS)} símbolos.")
+        if not isinstance(azar, random.Random):
+            azar = random.Random(azar)
+        intentos = intentos if intentos is not None else cls.MAX_INTENTOS
+
+        for _ in range(intentos):
+            caminos = cls.generar_cobertura(filas, cols, pares, azar)
+            if caminos is None:
+                continue
+            tablero, solucion = cls.tableros_desde_caminos(filas, cols, caminos)
+            if unica and not cls.es_unica(tablero, tiempo_unicidad):
+                continue
+            return tablero, solucion
+        raise ValueError(f"No se pudo generar un tablero {filas}x{cols} con {pares} pares "
+                         f"en {intentos} intentos.")
+
+    @classmethod
+    def generar_lote(cls, directorio, cantidad, filas, cols, pares=None, semilla=None, unica=False,
+                     guardar_soluciones=False, verbose=True):
+        """
+        Escribe cantidad tableros como generado<n>_<filas>x<cols>.txt en directorio (con el
+        formato de NumberLinkBoardIO.leer_tablero) y, con guardar_soluciones, su solución de
+        referencia como solucion<n>_<filas>x<cols>.txt. Devuelve las rutas de los tableros.
+        """
+        azar = random.Random(semilla)
+        os.makedirs(directorio, exist_ok=True)
+        rutas = []
+        inicio = time.perf_counter()
+        for n in range(1, cantidad + 1):
+            tablero, solucion = cls.generar(filas, cols, pares, azar, unica)
+            ruta = os.path.join(directorio, f"generado{n}_{filas}x{cols}.txt")
+            NumberLinkBoardIO.guardar_tablero(tablero, ruta)
+            if guardar_soluciones:
+                NumberLinkBoardIO.guardar_tablero(solucion, os.path.join(directorio, f"solucion{n}_{filas}x{cols}.txt"))
+            rutas.append(ruta)
+        if verbose:
+            duracion = time.perf_counter() - inicio
+            print(f"{cantidad} tableros {filas}x{cols} generados en {directorio} en {duracion:.3f} s "
+                  f"({cantidad / duracion if duracion > 0 else 0.0:.1f} tableros/s)")
+        return rutas
+
+
+# --- Ejecución principal ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera tableros NumberLink aleatorios resolubles.")
+    parser.add_argument("filas", type=int)
+    parser.add_argument("columnas", type=int)
+    parser.add_argument("--pares", type=int, default=None, help="pares por tablero (por defecto según el tamaño)")
+    parser.add_argument("--cantidad", type=int, default=1, help="tableros a generar")
+    parser.add_argument("--directorio", default="tablerosGenerados", help="directorio de salida")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--unica", action="store_true", help="solo tableros con solución única")
+    parser.add_argument("--soluciones", action="store_true", help="guarda también la solución de cada tablero")
+    args = parser.parse_args()
+
+    try:
+        NumberLinkGenerator.generar_lote(args.directorio, args.cantidad, args.filas, args.columnas, args.pares,
+                                         args.semilla, args.unica, args.soluciones)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
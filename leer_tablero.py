@@ -55,13 +55,20 @@ class NumberLinkBoardIO:
         return '\n'.join(''.join(fila) for fila in tablero)
 
     @staticmethod
-    def guardar_resultado(tablero, ruta_salida, nombre_solver, tiempo_segundos, completa):
-        """Persistir tablero y metadatos (tiempo, solver, estado) en un archivo de texto."""
-        if not ruta_salida:
-            return
-        directorio = os.path.dirname(ruta_salida)
+    def guardar_tablero(tablero, ruta_archivo):
+        """Escribe un tablero con el formato que lee leer_tablero ('filas columnas' y sus filas)."""
+        directorio = os.path.dirname(ruta_archivo)
         if directorio:
             os.makedirs(directorio, exist_ok=True)
+        filas = len(tablero)
+        columnas = len(tablero[0]) if filas else 0
+        with open(ruta_archivo, 'w', encoding='utf-8') as archivo:
+            archivo.write(f"{filas} {columnas}\n")
+            archivo.write(NumberLinkBoardIO.tablero_a_texto(tablero) + "\n")
+
+    @staticmethod
+    def texto_resultado(tablero, nombre_solver, tiempo_segundos, completa):
+        """Contenido del archivo de resultado: solver, tiempo, estado y el tablero."""
         contenido = [
             f"Solver: {nombre_solver}",
             f"Tiempo: {tiempo_segundos:.4f} s",
@@ -69,8 +76,18 @@ class NumberLinkBoardIO:
             "",
             NumberLinkBoardIO.tablero_a_texto(tablero)
         ]
+        return '\n'.join(contenido)
+
+    @staticmethod
+    def guardar_resultado(tablero, ruta_salida, nombre_solver, tiempo_segundos, completa):
+        """Persistir tablero y metadatos (tiempo, solver, estado) en un archivo de texto."""
+        if not ruta_salida:
+            return
+        directorio = os.path.dirname(ruta_salida)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
         with open(ruta_salida, 'w', encoding='utf-8') as archivo:
-            archivo.write('\n'.join(contenido))
+            archivo.write(NumberLinkBoardIO.texto_resultado(tablero, nombre_solver, tiempo_segundos, completa))
 
 
 # --- Ejecución principal ---
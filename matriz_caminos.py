@@ -0,0 +1,62 @@
+# matriz_caminos.py
+# Descripción: Matriz camino x celda de las rutas candidatas de un par, empaquetada en un entero para podarlas en lote
+
+from tablero_bits import TableroBits
+
+
+class MatrizCaminos:
+    """
+    Las rutas candidatas de un par (CaminosCompactos o listas de índices de celda) como una
+    matriz de bits camino x celda: la fila k es la máscara de las celdas interiores de la
+    ruta k (las que pinta marcar_camino). Las filas se guardan una tras otra en un solo
+    entero, cada una en ancho bytes: las filas*cols celdas del tablero y al menos una fila
+    de tablero de relleno en cero, para que los desplazamientos verticales no pasen de una
+    ruta a la siguiente.
+
+    Replicando en cada fila las celdas libres y los extremos del nodo, una poda local se
+    evalúa para todas las rutas con unas pocas operaciones sobre enteros grandes, en lugar
+    de pintar, revisar y borrar cada ruta por separado.
+    """
+
+    def __init__(self, caminos, filas, cols):
+        self.cantidad = len(caminos)
+        self.cols = cols
+        self.ancho = (filas * cols + cols + 7) // 8
+        filas_matriz = []
+        for camino in caminos:
+            mascara = 0
+            for indice in camino[1:-1]:
+                mascara |= 1 << indice
+            filas_matriz.append(mascara.to_bytes(self.ancho, 'little'))
+        self.bits = int.from_bytes(b''.join(filas_matriz), 'little')
+        geometria = TableroBits(filas, cols)
+        self.sin_col_izq = self.replicar(geometria.sin_col_izq)
+        self.sin_col_der = self.replicar(geometria.sin_col_der)
+
+    def replicar(self, mascara):
+        """La misma máscara de tablero repetida en cada fila de la matriz."""
+        return int.from_bytes(mascara.to_bytes(self.ancho, 'little') * self.cantidad, 'little')
+
+    def filas_en_cero(self, matriz):
+        """Índices, en orden, de las filas de una matriz con esta disposición que no tienen bits encendidos."""
+        ancho = self.ancho
+        datos = matriz.to_bytes(ancho * self.cantidad, 'little')
+        cero = bytes(ancho)
+        return [k for k in range(self.cantidad) if datos[k * ancho:(k + 1) * ancho] == cero]
+
+    def sin_cuellos(self, libres, extremos):
+        """
+        Índices, en orden, de las rutas que pintadas sobre un tablero con esas celdas libres
+        y esos extremos pendientes (máscaras de TableroBits) no dejan ninguna celda libre con
+        menos de dos vecinos libres o extremos: la condición de detectar_cuellos, que también
+        cubre las celdas aisladas, evaluada para todas las rutas a la vez.
+        """
+        libres_tras = self.replicar(libres) & ~self.bits
+        transitables = libres_tras | self.replicar(extremos)
+        # Los bits que los desplazamientos llevan al relleno no importan: solo se miran celdas libres.
+        arriba = transitables << self.cols
+        abajo = transitables >> self.cols
+        izquierda = (transitables << 1) & self.sin_col_izq
+        derecha = (transitables >> 1) & self.sin_col_der
+        dos_vecinos = ((arriba | abajo) & (izquierda | derecha)) | (arriba & abajo) | (izquierda & derecha)
+        return self.filas_en_cero(libres_tras & ~dos_vecinos)
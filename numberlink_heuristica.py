@@ -3,11 +3,66 @@
 # Descripción: Resuelve tableros NumberLink usando backtracking con heurística de bordes
 
 import copy
+import hashlib
+import multiprocessing
 import os
+import random
+import sys
 import time
+from array import array
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 from itertools import islice
 
+from cache_lru import CacheLRU
+from caminos_compactos import CaminosCompactos
+from estado_busqueda import EstadoBusqueda
+from matriz_caminos import MatrizCaminos
+from tablero_bits import TableroBits
+
+try:
+    import resource
+except ImportError:  # Windows: sin medición de memoria de respaldo
+    resource = None
+
+
+class ContextoBusqueda:
+    """Estado compartido por toda una resolución: límites, motor de podas, caché y contadores."""
+
+    def __init__(self, pares_ordenados, limite, verbose, estado=None, memo=None, propagar=True, evitar_autocontacto=True,
+                 fallos=None, descomponer=False, regiones_fallidas=None, max_candidatos=None, azar=None,
+                 max_intentos=None):
+        self.pares_ordenados = pares_ordenados
+        self.limite = limite
+        self.verbose = verbose
+        self.estado = estado
+        self.memo = memo
+        self.propagar = propagar
+        self.evitar_autocontacto = evitar_autocontacto
+        self.fallos = fallos
+        self.descomponer = descomponer
+        self.regiones_fallidas = regiones_fallidas
+        self.regiones_pendientes = []
+        self.corte = None
+        self.despachos = 0
+        self.max_candidatos = max_candidatos
+        self.azar = azar
+        self.max_intentos = max_intentos
+        self.max_nodos = None
+        self.max_memoria_mb = None
+        self.detener = None
+        self.limite_tiempo = None
+        self.telemetria = None
+        self.parar = None
+        self.revisiones = 0
+        self.agotado = False
+        self.motivo = None
+        self.mejor_parcial = None
+        self.recortado = False
+        self.intentos = 0
+        self.nodos_ahorrados = 0
+
 
 class NumberLinkHeuristicSolver:
     """
@@ -15,20 +70,90 @@ class NumberLinkHeuristicSolver:
     caminos disponibles en el tablero actual), genera hasta MAX_CAMINOS_PAR caminos para ese par
     y antes de seguir recursando verifica conectividad, paridad de componentes libres y la inexistencia
     de cuellos de botella (celdas libres no-extremo con grado <= 1). También valida que los pares
-    restantes sigan teniendo algún camino accesible y usa una tabla de memoización (MEMO_TABLERO)
-    para recordar los caminos ya calculados por tablero.
+    restantes sigan teniendo algún camino accesible y usa una caché LRU propia de cada resolución
+    para recordar los caminos ya calculados por tablero (acotada por MEMO_MAX_ENTRADAS y
+    MEMO_MAX_CELDAS), más una tabla de transposición de estados ya probados sin solución
+    (acotada por MAX_FALLOS) que se consulta al entrar a cada nodo.
+
+    Las podas pueden ejecutarse sobre la lista de listas (motor "lista"), sobre un
+    TableroBits que se mantiene sincronizado con ella (motor "bits") o sobre un
+    EstadoBusqueda que las actualiza de forma incremental con registro de deshacer
+    (motor "incremental").
+
+    Antes de ramificar, cada nodo propaga los movimientos forzados hasta un punto fijo: un
+    extremo con un único vecino utilizable se extiende hacia él y una celda libre con solo dos
+    vecinos utilizables, uno de ellos un extremo, se une a ese extremo.
+
+    Cuando los caminos ya trazados parten el tablero en regiones que no comparten pares, cada
+    región se resuelve como un subproblema aparte: se busca una solución para la primera y
+    solo entonces se pasa a la siguiente, sin volver a probar alternativas de las anteriores.
+    Si una región no tiene solución la rama completa se corta, y la región se recuerda como
+    fallida (acotado por MAX_REGIONES_FALLIDAS) para descartarla en otras ramas.
     """
 
     MAX_CAMINOS_PAR = 10000
     MAX_CANDIDATOS_PARES = 3
     MAX_CAMINOS_CHECK = 10000
-    MEMO_TABLERO = {}
+    MEMO_MAX_ENTRADAS = 50000
+    MEMO_MAX_CELDAS = 2000000
+    MAX_FALLOS = 200000
+    PROPAGAR_FORZADOS = True
+    EVITAR_AUTOCONTACTO = True
+    FILTRAR_EN_LOTE = True
+    DESCOMPONER_REGIONES = True
+    MAX_REGIONES_FALLIDAS = 50000
+    MAX_CONTEOS = 200000
+    MOTORES = ("lista", "bits", "incremental")
+    PROFUNDIDAD_DIVISION = 1
+    PORTAFOLIO = (
+        {"nombre": "bordes"},
+        {"nombre": "frontera", "metodo": "frontera"},
+        {"nombre": "cercanos", "orden": "cercanos"},
+        {"nombre": "amplio", "max_candidatos": 5, "max_caminos_por_par": 2000},
+        {"nombre": "azar-luby-1", "semilla": 1, "reinicios": 100},
+        {"nombre": "lejanos-azar-luby-2", "orden": "lejanos", "semilla": 2, "reinicios": 100},
+        {"nombre": "estrecho-azar-3", "max_candidatos": 1, "semilla": 3, "reinicios": 50},
+        {"nombre": "cercanos-azar-luby-4", "orden": "cercanos", "semilla": 4, "reinicios": 200},
+    )
+    CRITERIOS_ORDEN = ("bordes", "cercanos", "lejanos")
+    INTERVALO_MEMORIA = 256
+    INTERVALO_PARADA = 64
+    ANCHO_INICIAL = 8
+    FACTOR_AMPLIACION = 4
+    _detener = None
 
     @staticmethod
     def tablero_a_clave(tablero): # esta no
         """Convierte el tablero en una cadena lineal para usar como clave del tablero de memoización."""
         return ''.join(''.join(fila) for fila in tablero)
 
+    @staticmethod
+    def clave_nodo(tablero, pares):
+        """
+        Hash compacto (16 bytes) de un nodo de búsqueda: el tablero completo con sus colores y
+        la lista ordenada de pares pendientes con sus extremos actuales.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        for fila in tablero:
+            h.update(''.join(fila).encode('utf-8'))
+        h.update(repr(pares).encode('utf-8'))
+        return h.digest()
+
+    @staticmethod
+    def clave_compacta(tablero):
+        """
+        Máscara de bits de las celdas libres. Las rutas de un par solo dependen de qué celdas
+        están libres, así que esta clave identifica el nodo de forma exacta con filas*cols bits.
+        """
+        clave = 0
+        bit = 1
+        for fila in tablero:
+            for celda in fila:
+                if celda == ' ':
+                    clave |= bit
+                bit <<= 1
+        return clave
+
     @staticmethod
     def encontrar_pares(tablero): # esta si 
         """Devuelve un dict de pares válidos (dos ocurrencias) por símbolo."""
@@ -82,8 +207,14 @@ class NumberLinkHeuristicSolver:
         return ((fila == 0 or fila == filas - 1) and (col == 0 or col == cols - 1))
 
     @classmethod #FUNCION GRANDE QUE SI VA (1) Melissa 
-    def ordenar_pares_por_heuristica(cls, tablero): # esta si 
-        """Ordena pares priorizando esquinas, bordes y distancias cortas."""
+    def ordenar_pares_por_heuristica(cls, tablero, criterio="bordes", azar=None): # esta si 
+        """
+        Ordena pares priorizando esquinas, bordes y distancias cortas (criterio "bordes").
+        Con criterio "cercanos" manda la distancia más corta y con "lejanos" la más larga;
+        si se entrega un random.Random (azar) los empates se rompen al azar.
+        """
+        if criterio not in cls.CRITERIOS_ORDEN:
+            raise ValueError(f"Criterio desconocido: {criterio}. Opciones: {', '.join(cls.CRITERIOS_ORDEN)}")
         pares = cls.encontrar_pares(tablero)
         filas = len(tablero)
         cols = len(tablero[0]) if filas > 0 else 0
@@ -97,15 +228,21 @@ class NumberLinkHeuristicSolver:
             esquinas = cls.contar_esquinas(pos1, pos2, filas, cols)
             distancia = cls.calcular_distancia_manhattan(pos1, pos2)
 
-            prioridad = esquinas * 1000 + bordes * 100 + (100 - distancia)
-            pares_con_prioridad.append((numero, pos1, pos2, prioridad))
+            if criterio == "cercanos":
+                prioridad = (100 - distancia) * 1000 + esquinas * 100 + bordes
+            elif criterio == "lejanos":
+                prioridad = distancia * 1000 + esquinas * 100 + bordes
+            else:
+                prioridad = esquinas * 1000 + bordes * 100 + (100 - distancia)
+            desempate = azar.random() if azar is not None else 0
+            pares_con_prioridad.append((numero, pos1, pos2, (prioridad, desempate)))
 
         pares_con_prioridad.sort(key=lambda x: x[3], reverse=True)
 
         return [(num, p1, p2) for num, p1, p2, _ in pares_con_prioridad]
 
     @staticmethod
-    def obtener_vecinos(pos, filas, cols): # esta si pero en _dfs_rutas y en generar_caminos_incremental y en detectar_cuellos y en _bfs_component y en existe_camino_basico, kt 
+    def obtener_vecinos(pos, filas, cols): # esta si pero en generar_caminos_profundidad y en generar_caminos_incremental y en detectar_cuellos y en _bfs_component y en existe_camino_basico, kt 
         """Retorna vecinos ortogonales dentro del tablero."""
         fila, col = pos
         vecinos = []
@@ -118,81 +255,227 @@ class NumberLinkHeuristicSolver:
 
         return vecinos
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def tabla_vecinos(filas, cols):
+        """
+        Precalcula, para un tamaño de tablero, los índices vecinos de cada celda (mismo orden
+        que obtener_vecinos), la posición (fila, col) de cada índice y la máscara de bits de
+        los vecinos de cada celda.
+        """
+        posiciones = [(i, j) for i in range(filas) for j in range(cols)]
+        vecinos = [tuple(nf * cols + nc for nf, nc in NumberLinkHeuristicSolver.obtener_vecinos(pos, filas, cols))
+                   for pos in posiciones]
+        mascaras = [sum(1 << v for v in vs) for vs in vecinos]
+        return vecinos, posiciones, mascaras
+
     @classmethod
-    def encontrar_todos_caminos(cls, tablero_trabajo, inicio, fin, numero, max_caminos=None): # esta si pero en generar_caminos_incremental
-        """Enumera caminos posibles entre dos extremos, ordenados por longitud."""
-        limite = max_caminos if max_caminos is not None else cls.MAX_CAMINOS_PAR
+    def _preparar_generacion(cls, tablero_trabajo, inicio, fin, libres, evitar_autocontacto):
+        """
+        Datos comunes de los generadores de rutas: tabla de vecinos, índices de origen y
+        destino, celdas permitidas y celdas prohibidas de partida. Con evitar_autocontacto,
+        se prohíben las celdas vecinas a otras celdas ya pintadas del mismo símbolo, porque
+        una ruta que pase por ellas se tocaría a sí misma.
+        """
         filas = len(tablero_trabajo)
         cols = len(tablero_trabajo[0])
-        todos_caminos = []
-        cls._dfs_rutas(tablero_trabajo, fin, filas, cols, limite, inicio, [inicio], {inicio}, todos_caminos)
-        todos_caminos.sort(key=lambda c: len(c))
-        return todos_caminos
+        vecinos, posiciones, mascaras = cls.tabla_vecinos(filas, cols)
+        if libres is None:
+            libres = cls.clave_compacta(tablero_trabajo)
+        if evitar_autocontacto is None:
+            evitar_autocontacto = cls.EVITAR_AUTOCONTACTO
+        origen = inicio[0] * cols + inicio[1]
+        destino = fin[0] * cols + fin[1]
+        prohibidas = 0
+        if evitar_autocontacto:
+            propias = cls.mascara_propia(tablero_trabajo, inicio, fin)
+            while propias:
+                b = propias & -propias
+                prohibidas |= mascaras[b.bit_length() - 1]
+                propias ^= b
+            prohibidas &= ~(1 << destino)
+        return vecinos, posiciones, mascaras if evitar_autocontacto else None, origen, destino, libres | (1 << destino), prohibidas
+
+    @staticmethod
+    def mascara_propia(tablero, inicio, fin):
+        """Máscara de las celdas del mismo símbolo que inicio, sin contar inicio ni fin."""
+        simbolo = tablero[inicio[0]][inicio[1]].lower()
+        cols = len(tablero[0])
+        mascara = 0
+        for i, fila in enumerate(tablero):
+            for j, celda in enumerate(fila):
+                if celda.lower() == simbolo and (i, j) != inicio and (i, j) != fin:
+                    mascara |= 1 << (i * cols + j)
+        return mascara
 
     @classmethod
-    #SEGUNDA FUNCION GRANDE QUE SI VA (2) Melissa
-    def _dfs_rutas(cls, tablero, fin, filas, cols, limite, pos_actual, camino, visitados, todos_caminos): # esta si 
-        """DFS auxiliar para construir rutas completas."""
-        if len(todos_caminos) >= limite:
-            return
+    def encontrar_todos_caminos(cls, tablero_trabajo, inicio, fin, numero, max_caminos=None, evitar_autocontacto=None): # esta si pero en generar_caminos_incremental
+        """
+        Enumera caminos posibles entre dos extremos, ordenados por longitud, como
+        CaminosCompactos (posiciones(k) da el camino k como lista de (fila, col)).
+        """
+        limite = max_caminos if max_caminos is not None else cls.MAX_CAMINOS_PAR
+        generador = cls.generar_caminos_profundidad(tablero_trabajo, inicio, fin, max_caminos=limite,
+                                                    evitar_autocontacto=evitar_autocontacto)
+        todos_caminos = CaminosCompactos(len(tablero_trabajo), len(tablero_trabajo[0]), islice(generador, limite))
+        return todos_caminos.ordenar_por_largo()
 
-        if pos_actual == fin:
-            todos_caminos.append(list(camino))
+    @classmethod
+    def _recorrer_profundidad(cls, tablero_trabajo, inicio, fin, libres, evitar_autocontacto, parar=None):
+        """
+        DFS iterativo compartido por generar_caminos_profundidad y contar_caminos. Entrega la
+        lista de índices de la ruta actual (sin el destino) cada vez que llega al destino; la
+        lista se reutiliza, así que quien la consuma debe copiarla si la necesita. Si parar
+        (sin argumentos) devuelve True, revisado cada INTERVALO_PARADA pasos del recorrido
+        aunque no aparezcan rutas, el recorrido termina antes.
+        """
+        vecinos, _, mascaras, origen, destino, permitidas, prohibidas = cls._preparar_generacion(
+            tablero_trabajo, inicio, fin, libres, evitar_autocontacto)
+        if origen == destino:
+            yield []
             return
 
-        for vecino in cls.obtener_vecinos(pos_actual, filas, cols): # aca se pone la funcion que se llama para el pseucodigo
-            if vecino in visitados:
-                continue
-
-            celda = tablero[vecino[0]][vecino[1]]
-            if celda == ' ' or vecino == fin:
-                visitados.add(vecino)
+        camino = [origen]
+        visitados = 1 << origen
+        pila = [iter(vecinos[origen])]
+        prohibidas_pila = [prohibidas]
+        pasos = 0
+
+        while pila:
+            pasos += 1
+            if parar is not None and pasos % cls.INTERVALO_PARADA == 0 and parar():
+                return
+            bloqueadas = visitados | prohibidas_pila[-1]
+            for vecino in pila[-1]:
+                b = 1 << vecino
+                if bloqueadas & b or not permitidas & b:
+                    continue
+                if vecino == destino:
+                    yield camino
+                    continue
+                if mascaras is not None:
+                    prohibidas_pila.append(prohibidas_pila[-1] | mascaras[camino[-1]])
+                else:
+                    prohibidas_pila.append(prohibidas)
+                visitados |= b
                 camino.append(vecino)
-                cls._dfs_rutas(tablero, fin, filas, cols, limite, vecino, camino, visitados, todos_caminos) # aca se pone la funcion que se llama para el pseucodigo
-                camino.pop()
-                visitados.remove(vecino)
+                pila.append(iter(vecinos[vecino]))
+                break
+            else:
+                pila.pop()
+                prohibidas_pila.pop()
+                visitados &= ~(1 << camino.pop())
+
+    @classmethod
+    #SEGUNDA FUNCION GRANDE QUE SI VA (2) Melissa
+    def generar_caminos_profundidad(cls, tablero_trabajo, inicio, fin, max_caminos=None, libres=None, evitar_autocontacto=None,
+                                    parar=None): # esta si
+        """
+        Generador DFS iterativo (sin recursión) que produce las rutas en el mismo orden que el
+        recorrido en profundidad clásico. Lleva una pila de iteradores de vecinos y los visitados
+        como máscara de bits, así que la profundidad no depende del límite de recursión. Cada
+        ruta se entrega como array de índices de celda (ver CaminosCompactos). parar corta el
+        recorrido como en _recorrer_profundidad.
+        """
+        limite = max_caminos if max_caminos is not None else cls.MAX_CAMINOS_PAR
+        if limite <= 0:
+            return
+        filas, cols = len(tablero_trabajo), len(tablero_trabajo[0])
+        destino = fin[0] * cols + fin[1]
+        generados = 0
+        for camino in cls._recorrer_profundidad(tablero_trabajo, inicio, fin, libres, evitar_autocontacto, parar):
+            generados += 1
+            ruta = CaminosCompactos.camino(camino, filas, cols)
+            ruta.append(destino)
+            yield ruta
+            if generados >= limite:
+                return
 
     @classmethod
     # TERCERA FUNCION GRANDE QUE SI VA (3) Melissa
-    def generar_caminos_incremental(cls, tablero_trabajo, inicio, fin, max_caminos=None): # esta si 
-        """Generador BFS que produce primero las rutas más cortas."""
+    def generar_caminos_incremental(cls, tablero_trabajo, inicio, fin, max_caminos=None, libres=None, evitar_autocontacto=None,
+                                    parar=None): # esta si
+        """
+        Generador BFS que produce primero las rutas más cortas. Cada elemento de la cola es un
+        nodo (celda, padre) que comparte el prefijo con sus hermanos, más máscaras de bits de
+        visitados y de celdas prohibidas; la ruta solo se convierte en array de índices de
+        celda (ver CaminosCompactos) cuando se entrega. Con evitar_autocontacto (por defecto
+        EVITAR_AUTOCONTACTO) descarta al construirlas las extensiones que dejarían dos celdas
+        no consecutivas de la ruta como vecinas (vueltas en U y bloques 2x2), que nunca forman
+        parte de una solución válida. Si parar (sin argumentos) devuelve True, revisado cada
+        INTERVALO_PARADA nodos sacados de la cola, la generación termina antes.
+        """
         limite = max_caminos if max_caminos is not None else cls.MAX_CAMINOS_PAR
-        filas = len(tablero_trabajo)
-        cols = len(tablero_trabajo[0])
-        cola = deque([[inicio]])
+        vecinos, _, mascaras, origen, destino, permitidas, prohibidas = cls._preparar_generacion(
+            tablero_trabajo, inicio, fin, libres, evitar_autocontacto)
+        tipo = CaminosCompactos.tipo(len(tablero_trabajo) * len(tablero_trabajo[0]))
+        cola = deque([((origen, None), 1 << origen, prohibidas)])
         generados = 0
+        pasos = 0
 
         while cola and generados < limite:
-            camino = cola.popleft()
-            pos_actual = camino[-1]
+            pasos += 1
+            if parar is not None and pasos % cls.INTERVALO_PARADA == 0 and parar():
+                return
+            nodo, visitados, prohibidas = cola.popleft()
+            celda = nodo[0]
 
-            if pos_actual == fin:
+            if celda == destino:
                 generados += 1
-                yield camino
+                yield cls._materializar_camino(nodo, tipo)
                 continue
 
-            for vecino in cls.obtener_vecinos(pos_actual, filas, cols): # aca se pone la funcion que se llama para el pseucodigo
-                if vecino in camino:
-                    continue
-                celda = tablero_trabajo[vecino[0]][vecino[1]]
-                if celda == ' ' or vecino == fin:
-                    cola.append(camino + [vecino])
+            bloqueadas = visitados | prohibidas
+            if mascaras is not None:
+                prohibidas |= mascaras[celda]
+            for vecino in vecinos[celda]:
+                b = 1 << vecino
+                if permitidas & b and not bloqueadas & b:
+                    cola.append(((vecino, nodo), visitados | b, prohibidas))
+
+    @staticmethod
+    def _materializar_camino(nodo, tipo):
+        """Recorre los punteros al padre y devuelve la ruta como array (de ese tipo) de índices de celda."""
+        camino = []
+        while nodo is not None:
+            camino.append(nodo[0])
+            nodo = nodo[1]
+        camino.reverse()
+        return array(tipo, camino)
+
+    @classmethod
+    def contar_caminos(cls, tablero_trabajo, inicio, fin, tope=None, libres=None, evitar_autocontacto=None, parar=None):
+        """
+        Cuenta rutas entre dos extremos hasta un tope, sin construirlas: DFS iterativo con
+        visitados en máscara de bits que solo suma al llegar al destino. Con el mismo tope
+        devuelve exactamente len() de la lista que produciría generar_caminos_incremental.
+        Si parar (sin argumentos) devuelve True, revisado cada INTERVALO_PARADA pasos del
+        recorrido, se corta antes y el conteo queda incompleto.
+        """
+        tope = tope if tope is not None else cls.MAX_CAMINOS_PAR
+        if tope <= 0:
+            return 0
+        conteo = 0
+        for _ in cls._recorrer_profundidad(tablero_trabajo, inicio, fin, libres, evitar_autocontacto, parar):
+            conteo += 1
+            if conteo >= tope:
+                break
+        return conteo
 
     @staticmethod
     def marcar_camino(tablero, camino, numero): # esta si pero en _backtrack Simón
-        """Pinta el camino en el tablero salvo en los extremos."""
-        for i, pos in enumerate(camino):
-            if i == 0 or i == len(camino) - 1:
-                continue
-            tablero[pos[0]][pos[1]] = numero.lower()
+        """Pinta el camino (índices de celda) en el tablero salvo en los extremos."""
+        cols = len(tablero[0])
+        simbolo = numero.lower()
+        for indice in camino[1:-1]:
+            tablero[indice // cols][indice % cols] = simbolo
 
     @staticmethod
     def desmarcar_camino(tablero, camino, numero): # esta si pero en _backtrack Simón
         """Borra un camino previamente pintado."""
-        for i, pos in enumerate(camino):
-            if i == 0 or i == len(camino) - 1:
-                continue
-            tablero[pos[0]][pos[1]] = ' '
+        cols = len(tablero[0])
+        for indice in camino[1:-1]:
+            tablero[indice // cols][indice % cols] = ' '
 
     @staticmethod
     def _recolectar_extremos(pares_restantes): # esta si pero en analizar_componentes  y detectar_cuellos Simón, Kt funcion 6
@@ -318,81 +601,1368 @@ class NumberLinkHeuristicSolver:
         return True
 
     @classmethod
-    def obtener_candidatos_pares(cls, tablero, pares, max_candidatos=None, max_caminos=None): # esta si pero en _backtrack
-        """Selecciona pares más restringidos y sus rutas candidatas, usando tablero de memoización."""
+    def es_viable(cls, tablero, pares_restantes):
+        """Aplica las tres podas (cuellos, componentes y conectividad) sobre la lista de listas."""
+        return (not cls.detectar_cuellos(tablero, pares_restantes) and
+                cls.analizar_componentes(tablero, pares_restantes) and
+                cls.hay_camino_para_pares(tablero, pares_restantes))
+
+    @classmethod
+    def _clave_par(cls, tablero, libres, p1, p2, evitar_autocontacto, max_caminos):
+        """
+        Clave de caché de las rutas de un par: celdas libres, extremos y tope de rutas (una
+        lista recortada con un tope no sirve para uno mayor, como en las rondas de
+        resolver_numberlink_iterativo que comparten memo) y, si se evita el autocontacto,
+        también las celdas ya pintadas del símbolo, que limitan las rutas.
+        """
+        if evitar_autocontacto:
+            return (libres, p1, p2, max_caminos, cls.mascara_propia(tablero, p1, p2))
+        return (libres, p1, p2, max_caminos)
+
+    @classmethod
+    def ordenar_candidatos_por_conteo(cls, tablero, pares, max_candidatos=None, max_caminos=None, memo=None, libres=None,
+                                      evitar_autocontacto=None, azar=None, parar=None):
+        """
+        Ordena los pares por número de rutas (acotado por max_caminos) sin materializarlas y
+        devuelve [(idx, conteo)] de los max_candidatos más restringidos. Los pares sin rutas se
+        omiten, igual que en obtener_candidatos_pares. Con azar (random.Random) los empates de
+        conteo se rompen al azar en lugar de por orden de la lista. Si parar se cumple durante
+        un conteo se devuelve una lista vacía.
+        """
         max_candidatos = max_candidatos if max_candidatos is not None else cls.MAX_CANDIDATOS_PARES
         max_caminos = max_caminos if max_caminos is not None else cls.MAX_CAMINOS_PAR
-        clave_tablero = cls.tablero_a_clave(tablero) 
-        mem_tablero = cls.MEMO_TABLERO.setdefault(clave_tablero, {})
+        evitar_autocontacto = evitar_autocontacto if evitar_autocontacto is not None else cls.EVITAR_AUTOCONTACTO
+        if libres is None:
+            libres = cls.clave_compacta(tablero)
         opciones = []
 
         for idx, (numero, p1, p2) in enumerate(pares):
-            if numero in mem_tablero:
-                caminos = mem_tablero[numero]
-            else:
-                generador = cls.generar_caminos_incremental(tablero, p1, p2, max_caminos=max_caminos) # aca se pone la funcion que se llama para el pseucodigo
-                caminos = list(islice(generador, max_caminos))
-                mem_tablero[numero] = caminos
-
-            if not caminos:
+            clave_par = cls._clave_par(tablero, libres, p1, p2, evitar_autocontacto, max_caminos) if memo is not None else None
+            conteo = memo.obtener(("conteo",) + clave_par) if memo is not None else None
+            if conteo is None:
+                caminos = memo.obtener(clave_par) if memo is not None else None
+                if caminos is not None:
+                    conteo = len(caminos)
+                else:
+                    conteo = cls.contar_caminos(tablero, p1, p2, tope=max_caminos, libres=libres,
+                                                evitar_autocontacto=evitar_autocontacto, parar=parar)
+                    if parar is not None and parar():
+                        return []
+                if memo is not None:
+                    memo.guardar(("conteo",) + clave_par, conteo)
+
+            if conteo == 0:
                 continue
-            opciones.append((len(caminos), idx, caminos))
+            opciones.append((conteo, azar.random() if azar is not None else 0, idx))
+
+        opciones.sort(key=lambda x: x[:2])
+        return [(idx, conteo) for conteo, _, idx in opciones[:max_candidatos]]
+
+    @classmethod
+    def caminos_del_par(cls, tablero, p1, p2, max_caminos=None, memo=None, libres=None, evitar_autocontacto=None,
+                        parar=None):
+        """
+        Genera (o recupera de la caché) las rutas de un par, de la más corta a la más larga,
+        como CaminosCompactos. Si parar se cumple a mitad de la generación se devuelve lo
+        generado hasta ese momento sin guardarlo en la caché.
+        """
+        max_caminos = max_caminos if max_caminos is not None else cls.MAX_CAMINOS_PAR
+        evitar_autocontacto = evitar_autocontacto if evitar_autocontacto is not None else cls.EVITAR_AUTOCONTACTO
+        if libres is None:
+            libres = cls.clave_compacta(tablero)
+        clave_par = cls._clave_par(tablero, libres, p1, p2, evitar_autocontacto, max_caminos) if memo is not None else None
+        caminos = memo.obtener(clave_par) if memo is not None else None
+        if caminos is None:
+            generador = cls.generar_caminos_incremental(tablero, p1, p2, max_caminos=max_caminos, libres=libres,
+                                                        evitar_autocontacto=evitar_autocontacto, parar=parar) # aca se pone la funcion que se llama para el pseucodigo
+            caminos = CaminosCompactos(len(tablero), len(tablero[0]), islice(generador, max_caminos))
+            if parar is not None and parar():
+                return caminos
+            if memo is not None:
+                memo.guardar(clave_par, caminos, costo=len(caminos.celdas) + 1)
+        return caminos
+
+    @classmethod
+    def filtrar_caminos(cls, tablero, p1, p2, caminos, pendientes, memo=None, libres=None, evitar_autocontacto=None):
+        """
+        Devuelve, en su orden, las rutas del par que no dejarían cuellos (celdas libres de
+        grado 0 o 1, como en detectar_cuellos con pendientes como pares restantes) si se
+        pintaran. Las evalúa todas a la vez sobre una MatrizCaminos, que se guarda en memo
+        junto a las rutas; así solo las que sobreviven se marcan y pasan por las demás podas.
+        """
+        if not cls.FILTRAR_EN_LOTE or not pendientes or not caminos:
+            return caminos
+        evitar_autocontacto = evitar_autocontacto if evitar_autocontacto is not None else cls.EVITAR_AUTOCONTACTO
+        if libres is None:
+            libres = cls.clave_compacta(tablero)
+        clave = ("matriz",) + cls._clave_par(tablero, libres, p1, p2, evitar_autocontacto, len(caminos)) if memo is not None else None
+        matriz = memo.obtener(clave) if memo is not None else None
+        if matriz is None or matriz.cantidad != len(caminos):
+            matriz = MatrizCaminos(caminos, len(tablero), len(tablero[0]))
+            if memo is not None:
+                memo.guardar(clave, matriz, costo=len(caminos) + 1)
+
+        cols = len(tablero[0])
+        extremos = 0
+        for _, q1, q2 in pendientes:
+            extremos |= (1 << (q1[0] * cols + q1[1])) | (1 << (q2[0] * cols + q2[1]))
+        return caminos.seleccionar(matriz.sin_cuellos(libres, extremos))
+
+    @classmethod
+    def obtener_candidatos_pares(cls, tablero, pares, max_candidatos=None, max_caminos=None, memo=None, libres=None,
+                                 evitar_autocontacto=None): # esta si
+        """Selecciona pares más restringidos y sus rutas candidatas, usando la caché de caminos si se entrega."""
+        if libres is None:
+            libres = cls.clave_compacta(tablero)
+        candidatos = cls.ordenar_candidatos_por_conteo(tablero, pares, max_candidatos, max_caminos, memo, libres,
+                                                       evitar_autocontacto)
+        return [(idx, cls.caminos_del_par(tablero, pares[idx][1], pares[idx][2], max_caminos, memo, libres,
+                                          evitar_autocontacto))
+                for idx, _ in candidatos]
+
+    @classmethod
+    def es_solucion_valida(cls, tablero, pendientes=()):
+        """
+        Tablero lleno en el que cada ruta es un camino que no se toca a sí mismo: con el mismo
+        criterio de grado que NumberLinkVerifier, cada símbolo tiene exactamente dos celdas con
+        un vecino igual y el resto con dos. Extremos y celdas pintadas se comparan sin
+        distinguir mayúsculas. Con pendientes se validan solo los demás símbolos y se admiten
+        celdas libres (las de las regiones que aún faltan por resolver).
+        """
+        filas, cols = len(tablero), len(tablero[0])
+        pendientes = {simbolo.lower() for simbolo in pendientes}
+        extremos = {}
+        for i in range(filas):
+            for j in range(cols):
+                celda = tablero[i][j].lower()
+                if celda == ' ':
+                    if pendientes:
+                        continue
+                    return False
+                if celda in pendientes:
+                    continue
+                iguales = sum(1 for ni, nj in cls.obtener_vecinos((i, j), filas, cols)
+                              if tablero[ni][nj].lower() == celda)
+                if iguales == 0 or iguales > 2:
+                    return False
+                extremos[celda] = extremos.get(celda, 0) + (1 if iguales == 1 else 0)
+        return all(cantidad == 2 for cantidad in extremos.values())
 
-        opciones.sort(key=lambda x: x[0])
-        return [(idx, caminos) for _, idx, caminos in opciones[:max_candidatos]]
+    @classmethod
+    def propagar_forzados(cls, tablero, pares, estado=None, pasos=None):
+        """
+        Aplica movimientos forzados hasta un punto fijo y devuelve la nueva lista de pares
+        (con los extremos desplazados y sin los pares ya conectados), o None si encuentra una
+        contradicción. Cada cambio se agrega a pasos para poder revertirlo con
+        deshacer_propagacion.
+        """
+        pasos = pasos if pasos is not None else []
+        filas, cols = len(tablero), len(tablero[0])
+        pares = list(pares)
+        cambio = True
+
+        while cambio:
+            cambio = False
+            cabezas = {}
+            for idx, (_, p1, p2) in enumerate(pares):
+                cabezas[p1] = idx
+                cabezas[p2] = idx
+
+            for idx, (numero, p1, p2) in enumerate(pares):
+                for cabeza, otra in ((p1, p2), (p2, p1)):
+                    usables = [v for v in cls.obtener_vecinos(cabeza, filas, cols)
+                               if v == otra or tablero[v[0]][v[1]] == ' ']
+                    if not usables:
+                        return None
+
+                    forzada = usables[0] if len(usables) == 1 else None
+                    if forzada is None:
+                        for vecino in usables:
+                            if vecino == otra:
+                                continue
+                            alrededor = [w for w in cls.obtener_vecinos(vecino, filas, cols)
+                                         if tablero[w[0]][w[1]] == ' ' or w in cabezas]
+                            if len(alrededor) <= 1:
+                                return None
+                            if len(alrededor) == 2 and cabeza in alrededor:
+                                resto = alrededor[0] if alrededor[1] == cabeza else alrededor[1]
+                                if resto in cabezas and cabezas[resto] != idx:
+                                    return None
+                                forzada = vecino
+                                break
+                    if forzada is None:
+                        continue
+
+                    pares = cls.extender_cabeza(tablero, pares, idx, cabeza, forzada, estado, pasos)
+                    cambio = True
+                    break
+                if cambio:
+                    break
+
+        return pares
+
+    @classmethod
+    def extender_cabeza(cls, tablero, pares, idx, cabeza, destino, estado=None, pasos=None):
+        """
+        Avanza una cabeza del par pares[idx] hacia la celda destino (o lo conecta si destino es
+        la otra cabeza). Registra el paso en pasos y devuelve la nueva lista de pares.
+        """
+        numero, p1, p2 = pares[idx]
+        otra = p2 if cabeza == p1 else p1
+        cols = len(tablero[0])
+        if destino == otra:
+            par_nuevo = None
+            pintadas = 0
+            celda = None
+        else:
+            tablero[destino[0]][destino[1]] = numero.lower()
+            par_nuevo = (numero, destino, otra) if cabeza == p1 else (numero, otra, destino)
+            pintadas = 1 << (destino[0] * cols + destino[1])
+            celda = destino
+        if pasos is not None:
+            pasos.append((numero, celda, pares[idx], par_nuevo))
+        if estado is not None:
+            estado.extender_par(numero, pintadas, par_nuevo[1:] if par_nuevo else None)
+        if par_nuevo is None:
+            return pares[:idx] + pares[idx + 1:]
+        return pares[:idx] + [par_nuevo] + pares[idx + 1:]
+
+    @classmethod
+    def deshacer_propagacion(cls, tablero, pasos, estado=None):
+        """Revierte, en orden inverso, los cambios registrados por propagar_forzados."""
+        cols = len(tablero[0]) if tablero else 0
+        for numero, celda, _, _ in reversed(pasos):
+            pintadas = 0
+            if celda is not None:
+                tablero[celda[0]][celda[1]] = ' '
+                pintadas = 1 << (celda[0] * cols + celda[1])
+            if estado is not None:
+                estado.retraer_par(numero, pintadas)
+        pasos.clear()
+
+    @classmethod
+    def _crear_estado(cls, motor, tablero, pares):
+        """Construye el objeto de podas del motor pedido (None para el motor "lista")."""
+        if motor not in cls.MOTORES:
+            raise ValueError(f"Motor desconocido: {motor}. Opciones: {', '.join(cls.MOTORES)}")
+        if motor == "bits":
+            return TableroBits.desde_tablero(tablero)
+        if motor == "incremental":
+            return EstadoBusqueda(tablero, pares)
+        return None
 
     @classmethod
     # OCTAVA FUNCION GRANDE QUE SI VA (8) Simón
-    def resolver_numberlink_backtracking(cls, tablero_original, verbose=True, max_caminos_por_par=None): # esta si
-        """Backtracking guiado que prueba caminos por pares hasta completar el tablero."""
+    def resolver_numberlink_backtracking(cls, tablero_original, verbose=True, max_caminos_por_par=None, motor="lista", memo=None,
+                                         propagar=None, evitar_autocontacto=None, fallos=None, descomponer=None, orden="bordes",
+                                         max_candidatos=None, semilla=None, reinicios=None, tiempo_max=None,
+                                         estadisticas=None, telemetria=None, max_nodos=None, max_memoria_mb=None): # esta si
+        """
+        Backtracking guiado que prueba caminos por pares hasta completar el tablero.
+        La caché de caminos es propia de cada resolución: si no se entrega una CacheLRU se crea
+        una nueva con los presupuestos MEMO_MAX_ENTRADAS y MEMO_MAX_CELDAS. Lo mismo ocurre con
+        la tabla de fallos (fallos), acotada por MAX_FALLOS entradas. Con descomponer=False se
+        desactiva la resolución por regiones independientes.
+
+        orden elige el criterio de ordenar_pares_por_heuristica y max_candidatos reemplaza a
+        MAX_CANDIDATOS_PARES. Con semilla los empates entre pares se rompen al azar, y con
+        reinicios la búsqueda se reinicia tras reinicios * luby(k) nodos en la ronda k,
+        conservando las cachés y los fallos ya demostrados, hasta que una ronda termina sin
+        agotar su presupuesto.
+
+        tiempo_max (segundos), max_nodos y max_memoria_mb (memoria residente del proceso) son
+        presupuestos que se revisan entre nodos. Si alguno se agota la búsqueda se detiene; con
+        cualquiera de ellos activo, una resolución sin solución devuelve la mejor solución
+        parcial vista (más pares conectados y, a igualdad, menos celdas vacías) con completa=False. Si se entrega un dict en estadisticas se llena con
+        los contadores de la resolución (ver _volcar_estadisticas), incluido el motivo de
+        término: "resuelto", "sin_solucion", "tiempo", "nodos", "memoria" o "detenido". Con una
+        instancia de Telemetria se registran tiempos, podas y progreso de la búsqueda.
+        """
         tablero = copy.deepcopy(tablero_original)
-        pares_ordenados = cls.ordenar_pares_por_heuristica(tablero_original)# aca se pone la funcion que se llama para el pseucodigo
+        azar = random.Random(semilla) if semilla is not None else None
+        pares_ordenados = cls.ordenar_pares_por_heuristica(tablero_original, orden, azar)# aca se pone la funcion que se llama para el pseucodigo
+        estado = cls._crear_estado(motor, tablero, pares_ordenados)
         limite = max_caminos_por_par if max_caminos_por_par is not None else cls.MAX_CAMINOS_PAR
+        if memo is None:
+            memo = CacheLRU(cls.MEMO_MAX_ENTRADAS, cls.MEMO_MAX_CELDAS)
+        propagar = propagar if propagar is not None else cls.PROPAGAR_FORZADOS
+        evitar_autocontacto = evitar_autocontacto if evitar_autocontacto is not None else cls.EVITAR_AUTOCONTACTO
 
         if verbose:
             print("\n=== ESTRATEGIA: BACKTRACKING CON HEURÍSTICA DE BORDES ===")
             print(f"Total de pares a conectar: {len(pares_ordenados)}\n")
 
-        intentos = [0]
+        if fallos is None:
+            fallos = CacheLRU(cls.MAX_FALLOS)
+        descomponer = descomponer if descomponer is not None else cls.DESCOMPONER_REGIONES
+        regiones_fallidas = CacheLRU(cls.MAX_REGIONES_FALLIDAS) if descomponer else None
+        contexto = ContextoBusqueda(pares_ordenados, limite, verbose, estado, memo, propagar, evitar_autocontacto, fallos,
+                                    descomponer, regiones_fallidas, max_candidatos, azar)
+        contexto.detener = cls._detener
+        if tiempo_max is not None:
+            contexto.limite_tiempo = time.perf_counter() + tiempo_max
+        contexto.max_nodos = max_nodos
+        contexto.max_memoria_mb = max_memoria_mb
+        if (contexto.detener is not None or tiempo_max is not None or max_memoria_mb is not None
+                or telemetria is not None):
+            contexto.parar = lambda: cls._parar_enumeracion(contexto)
+        if tiempo_max is not None or max_nodos is not None or max_memoria_mb is not None:
+            contexto.mejor_parcial = ((-1, 0), None)
+        cls._iniciar_telemetria(contexto, telemetria, tablero, "backtracking")
+        ronda = 0
+        while True:
+            ronda += 1
+            if reinicios:
+                contexto.max_intentos = contexto.intentos + reinicios * cls.luby(ronda)
+                contexto.agotado = False
+                contexto.motivo = None
+            completa = cls._backtrack(tablero, pares_ordenados, contexto) # aca se pone la funcion que se llama para el pseucodigo
+            if completa or not reinicios or contexto.motivo != "reinicio":
+                break
+        cls._cerrar_motivo(contexto, completa)
+        if not completa and contexto.mejor_parcial is not None and contexto.mejor_parcial[1] is not None:
+            tablero = contexto.mejor_parcial[1]
 
-        if cls._backtrack(tablero, pares_ordenados, pares_ordenados, intentos, limite, verbose): # aca se pone la funcion que se llama para el pseucodigo
-            if verbose:
-                print(f"\n✓ Solución encontrada en {intentos[0]} intentos")
-            return tablero, True
+        if verbose:
+            if completa:
+                print(f"\n✓ Solución encontrada en {contexto.intentos} intentos")
+            else:
+                print(f"\n✗ No se encontró solución después de {contexto.intentos} intentos")
+            if contexto.motivo != "sin_solucion" and not completa:
+                print(f"Búsqueda detenida por presupuesto ({contexto.motivo})")
+            if not completa and contexto.mejor_parcial is not None and contexto.mejor_parcial[1] is not None:
+                conectados, vacias = contexto.mejor_parcial[0]
+                print(f"Mejor solución parcial: {conectados}/{len(pares_ordenados)} pares conectados, "
+                      f"{-vacias} celdas vacías")
+            if reinicios:
+                print(f"Rondas de búsqueda: {ronda}")
+            stats = memo.estadisticas()
+            print(f"Caché de caminos: {stats['entradas']} entradas, {stats['aciertos']} aciertos, "
+                  f"{stats['fallos']} fallos, {stats['expulsiones']} expulsiones")
+            cls._imprimir_tabla_fallos(contexto)
+            if contexto.regiones_fallidas is not None:
+                stats = contexto.regiones_fallidas.estadisticas()
+                print(f"Regiones independientes: {contexto.despachos} divisiones, {stats['entradas']} regiones "
+                      f"fallidas, {stats['aciertos']} aciertos")
+        if estadisticas is not None:
+            cls._volcar_estadisticas(contexto, estadisticas)
+            estadisticas["rondas"] = ronda
+        if telemetria is not None:
+            telemetria.finalizar(contexto, completa)
+        return tablero, completa
 
+    @classmethod
+    def resolver_numberlink_iterativo(cls, tablero_original, verbose=True, ancho_inicial=None, factor=None,
+                                      tiempo_max=None, max_nodos=None, max_memoria_mb=None, estadisticas=None,
+                                      **opciones):
+        """
+        Ampliación iterativa de max_caminos_por_par: resuelve primero con ancho_inicial
+        (ANCHO_INICIAL) rutas por par y, si la búsqueda termina sin solución después de haber
+        recortado la lista de rutas de algún par, vuelve a empezar con el límite multiplicado
+        por factor (FACTOR_AMPLIACION). Termina al resolver, cuando una ronda sin recortes
+        demuestra que no hay solución o cuando se agotan los presupuestos (tiempo_max,
+        max_nodos, max_memoria_mb), que son comunes a todas las rondas. Sin solución devuelve
+        la mejor solución parcial de todas las rondas. opciones se pasan tal cual a
+        resolver_numberlink_backtracking.
+        """
+        ancho = ancho_inicial or cls.ANCHO_INICIAL
+        factor = factor or cls.FACTOR_AMPLIACION
+        inicio = time.perf_counter()
+        intentos = 0
+        rondas = 0
+        mejor = None
+        while True:
+            rondas += 1
+            ronda = {}
+            tiempo_restante = None if tiempo_max is None else max(0.0, tiempo_max - (time.perf_counter() - inicio))
+            nodos_restantes = None if max_nodos is None else max(0, max_nodos - intentos)
+            tablero, completa = cls.resolver_numberlink_backtracking(
+                tablero_original, verbose=False, max_caminos_por_par=ancho, tiempo_max=tiempo_restante,
+                max_nodos=nodos_restantes, max_memoria_mb=max_memoria_mb, estadisticas=ronda, **opciones)
+            intentos += ronda["intentos"]
+            if verbose:
+                print(f"Ancho {ancho}: {ronda['motivo']} en {ronda['intentos']} intentos")
+            if completa:
+                break
+            parcial = ronda.get("mejor_parcial")
+            if parcial is not None:
+                puntaje = (parcial["pares_conectados"], -parcial["celdas_vacias"])
+                if mejor is None or puntaje > mejor[0]:
+                    mejor = (puntaje, tablero)
+            if ronda["motivo"] != "sin_solucion" or not ronda["caminos_recortados"]:
+                break
+            ancho *= factor
+
+        if not completa and mejor is not None:
+            tablero = mejor[1]
         if verbose:
-            print(f"\n✗ No se encontró solución después de {intentos[0]} intentos")
-        return tablero, False
+            if completa:
+                print(f"\n✓ Solución encontrada con {ancho} rutas por par ({intentos} intentos, {rondas} rondas)")
+            else:
+                print(f"\n✗ Sin solución ({ronda['motivo']}) tras {rondas} rondas y {intentos} intentos")
+        if estadisticas is not None:
+            estadisticas.update(ronda)
+            estadisticas["intentos"] = intentos
+            estadisticas["rondas_ampliacion"] = rondas
+            estadisticas["ancho_final"] = ancho
+            if mejor is not None and not completa:
+                estadisticas["mejor_parcial"] = {"pares_conectados": mejor[0][0], "celdas_vacias": -mejor[0][1]}
+        return tablero, completa
+
+    @staticmethod
+    def _iniciar_telemetria(contexto, telemetria, tablero, metodo):
+        if telemetria is None:
+            return
+        contexto.telemetria = telemetria
+        telemetria.emitir("inicio", metodo=metodo, filas=len(tablero), cols=len(tablero[0]) if tablero else 0,
+                          pares=len(contexto.pares_ordenados))
+
+    @staticmethod
+    def _cerrar_motivo(contexto, completa):
+        """Fija el motivo de término de una resolución que no se detuvo por un presupuesto."""
+        if completa:
+            contexto.motivo = "resuelto"
+        elif not contexto.agotado:
+            contexto.motivo = "sin_solucion"
+
+    @classmethod
+    def _registrar_parcial(cls, tablero, pares_restantes, contexto):
+        """
+        Guarda una copia del tablero si supera al mejor parcial: más pares conectados y, a
+        igualdad, menos celdas vacías. Solo se usa cuando hay un presupuesto activo.
+        """
+        conectados = len(contexto.pares_ordenados) - len(pares_restantes) - len(cls._pares_aparcados(contexto))
+        mejor = contexto.mejor_parcial[0]
+        if conectados < mejor[0]:
+            return
+        estado = contexto.estado
+        if estado is not None:
+            vacias = estado.libres.bit_count()
+        else:
+            vacias = sum(fila.count(' ') for fila in tablero)
+        puntaje = (conectados, -vacias)
+        if puntaje > mejor:
+            contexto.mejor_parcial = (puntaje, [fila[:] for fila in tablero])
+
+    @staticmethod
+    def memoria_mb():
+        """
+        Memoria residente actual del proceso en MB, leída de /proc/self/statm. Donde no existe
+        se usa el pico de resource (que nunca baja), y None si tampoco está disponible.
+        """
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+        except (OSError, ValueError, IndexError, AttributeError):
+            pass
+        if resource is None:
+            return None
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+    @staticmethod
+    def _volcar_estadisticas(contexto, estadisticas):
+        """Copia en un dict los contadores de una resolución y el tamaño de sus cachés."""
+        estadisticas["intentos"] = contexto.intentos
+        estadisticas["nodos_ahorrados"] = contexto.nodos_ahorrados
+        estadisticas["agotado"] = contexto.agotado
+        estadisticas["motivo"] = contexto.motivo
+        estadisticas["caminos_recortados"] = contexto.recortado
+        if contexto.mejor_parcial is not None and contexto.mejor_parcial[1] is not None:
+            conectados, vacias = contexto.mejor_parcial[0]
+            estadisticas["mejor_parcial"] = {"pares_conectados": conectados, "celdas_vacias": -vacias}
+        estadisticas["divisiones_regiones"] = contexto.despachos
+        for nombre, cache in (("memo", contexto.memo), ("fallos", contexto.fallos),
+                              ("regiones_fallidas", contexto.regiones_fallidas)):
+            if cache is not None:
+                estadisticas[nombre] = cache.estadisticas()
+
+    @staticmethod
+    def luby(i):
+        """Término i (desde 1) de la sucesión de reinicios de Luby: 1, 1, 2, 1, 1, 2, 4, 1, ..."""
+        while True:
+            k = 1
+            while (1 << k) - 1 < i:
+                k += 1
+            if i == (1 << k) - 1:
+                return 1 << (k - 1)
+            i -= (1 << (k - 1)) - 1
+
+    @staticmethod
+    def _imprimir_tabla_fallos(contexto):
+        if contexto.fallos is None:
+            return
+        stats = contexto.fallos.estadisticas()
+        print(f"Tabla de fallos: {stats['entradas']} estados, {stats['aciertos']} aciertos, "
+              f"{contexto.nodos_ahorrados} nodos ahorrados, {stats['expulsiones']} expulsiones")
 
     @classmethod
-    def _backtrack(cls, tablero, pares_restantes, pares_ordenados, intentos, limite, verbose): # esta si pero en resolver_numberlink_backtracking Simón
-        """Recursión principal que intenta conectar pares con podas agresivas."""
-        intentos[0] += 1
+    def _consultar_fallo(cls, tablero, pares_restantes, contexto):
+        """
+        Devuelve la clave del nodo, o None si ya se probó que no tiene solución. La clave
+        incluye el límite de rutas por par: un fallo demostrado con listas de rutas recortadas
+        no vale para un límite mayor (resolver_numberlink_iterativo comparte la tabla entre
+        rondas de distinto ancho).
+        """
+        if contexto.fallos is None:
+            return b''
+        aparcados = cls._pares_aparcados(contexto)
+        pendientes = (pares_restantes, aparcados) if aparcados else pares_restantes
+        clave = cls.clave_nodo(tablero, (pendientes, contexto.limite) if contexto.limite is not None else pendientes)
+        subarbol = contexto.fallos.obtener(clave)
+        if subarbol is not None:
+            contexto.nodos_ahorrados += subarbol
+            return None
+        return clave
 
-        if not pares_restantes:
-            return all(' ' not in fila for fila in tablero)
+    @classmethod
+    def _registrar_fallo(cls, clave, contexto, intentos_inicio):
+        """
+        Guarda el nodo fallido junto con el tamaño del subárbol que costó refutarlo. Los nodos
+        que se abandonan por el corte de una región posterior no se guardan: su fallo no
+        depende solo de la región que se estaba resolviendo.
+        """
+        if contexto.fallos is not None and contexto.corte is None and not contexto.agotado:
+            contexto.fallos.guardar(clave, contexto.intentos - intentos_inicio)
+
+    @classmethod
+    def _backtrack(cls, tablero, pares_restantes, contexto, profundidad=0): # esta si pero en resolver_numberlink_backtracking Simón
+        """
+        Recursión principal: consulta la tabla de fallos, propaga movimientos forzados y luego
+        ramifica con podas agresivas.
+        """
+        if cls._debe_parar(contexto):
+            return False
+        telemetria = contexto.telemetria
+        clave = cls._consultar_fallo(tablero, pares_restantes, contexto)
+        if clave is None:
+            if telemetria is not None:
+                telemetria.poda("tabla_fallos")
+            return False
+        intentos_inicio = contexto.intentos
+        contexto.intentos += 1
+        if telemetria is not None:
+            telemetria.nodo(profundidad, len(pares_restantes))
+        estado = contexto.estado
+        pasos = []
+
+        if contexto.propagar and pares_restantes:
+            pares_restantes = cls._propagar_medido(tablero, pares_restantes, estado, pasos, telemetria)
+            if pares_restantes is None or (pasos and not cls._es_viable_nodo(
+                    tablero, pares_restantes + cls._pares_aparcados(contexto), estado, telemetria)):
+                cls.deshacer_propagacion(tablero, pasos, estado)
+                cls._registrar_fallo(clave, contexto, intentos_inicio)
+                return False
+
+        if contexto.mejor_parcial is not None:
+            cls._registrar_parcial(tablero, pares_restantes, contexto)
+        if cls._ramificar(tablero, pares_restantes, contexto, profundidad):
+            return True
+        cls.deshacer_propagacion(tablero, pasos, estado)
+        cls._registrar_fallo(clave, contexto, intentos_inicio)
+        return False
+
+    @classmethod
+    def _debe_parar(cls, contexto, revisar_memoria=None):
+        """
+        Indica si se agotó un presupuesto (nodos de la ronda, nodos totales, tiempo o memoria,
+        esta última revisada cada INTERVALO_MEMORIA nodos, o cuando revisar_memoria lo pida)
+        o si otro proceso pidió detener la búsqueda, y deja el motivo en contexto.motivo.
+        """
+        if revisar_memoria is None:
+            revisar_memoria = contexto.intentos % cls.INTERVALO_MEMORIA == 0
+        if not contexto.agotado:
+            motivo = None
+            if contexto.max_intentos is not None and contexto.intentos >= contexto.max_intentos:
+                motivo = "reinicio"
+            elif contexto.max_nodos is not None and contexto.intentos >= contexto.max_nodos:
+                motivo = "nodos"
+            elif contexto.detener is not None and contexto.detener.is_set():
+                motivo = "detenido"
+            elif contexto.limite_tiempo is not None and time.perf_counter() >= contexto.limite_tiempo:
+                motivo = "tiempo"
+            elif contexto.max_memoria_mb is not None and revisar_memoria:
+                memoria = cls.memoria_mb()
+                if memoria is not None and memoria >= contexto.max_memoria_mb:
+                    motivo = "memoria"
+            if motivo is not None:
+                contexto.agotado = True
+                contexto.motivo = motivo
+        return contexto.agotado
+
+    @classmethod
+    def _parar_enumeracion(cls, contexto):
+        """
+        Callback parar de los generadores y contadores de rutas, que lo llaman cada
+        INTERVALO_PARADA pasos: mientras se enumera no se visitan nodos, así que la memoria se
+        revisa cada INTERVALO_MEMORIA llamadas en lugar de por número de nodo. Con telemetría
+        también cuenta los pasos y emite el progreso de la enumeración.
+        """
+        contexto.revisiones += 1
+        if contexto.telemetria is not None:
+            contexto.telemetria.enumeracion(cls.INTERVALO_PARADA)
+        return cls._debe_parar(contexto, contexto.revisiones % cls.INTERVALO_MEMORIA == 0)
+
+    @classmethod
+    def _es_viable_nodo(cls, tablero, pares_restantes, estado, telemetria=None):
+        """Aplica las podas con el motor configurado (lista, bits o incremental)."""
+        if telemetria is not None:
+            return cls._es_viable_medido(tablero, pares_restantes, estado, telemetria)
+        if estado is not None:
+            return estado.es_viable(pares_restantes, cls.MAX_CAMINOS_CHECK)
+        return cls.es_viable(tablero, pares_restantes)
+
+    @classmethod
+    def _es_viable_medido(cls, tablero, pares, estado, telemetria):
+        """
+        Igual que _es_viable_nodo, pero evalúa cada poda por separado para medir su tiempo y
+        contar cuál descartó el nodo ("cuellos", "componentes" o "conectividad").
+        """
+        if isinstance(estado, EstadoBusqueda):
+            if not pares:
+                return True
+            podas = (("cuellos", lambda: not estado.cuellos),
+                     ("componentes", lambda: not estado.malas and not estado.separados),
+                     ("conectividad", lambda: not estado.sin_camino))
+        elif isinstance(estado, TableroBits):
+            podas = (("cuellos", lambda: not estado.detectar_cuellos(pares)),
+                     ("componentes", lambda: estado.analizar_componentes(pares)),
+                     ("conectividad", lambda: estado.hay_camino_para_pares(pares, cls.MAX_CAMINOS_CHECK)))
+        else:
+            podas = (("cuellos", lambda: not cls.detectar_cuellos(tablero, pares)),
+                     ("componentes", lambda: cls.analizar_componentes(tablero, pares)),
+                     ("conectividad", lambda: cls.hay_camino_para_pares(tablero, pares)))
+        for nombre, poda in podas:
+            inicio = time.perf_counter()
+            viable = poda()
+            telemetria.medir(nombre, time.perf_counter() - inicio)
+            if not viable:
+                telemetria.poda(nombre)
+                return False
+        return True
+
+    @classmethod
+    def _propagar_medido(cls, tablero, pares, estado, pasos, telemetria):
+        """propagar_forzados con su tiempo y sus contradicciones registrados en la telemetría."""
+        if telemetria is None:
+            return cls.propagar_forzados(tablero, pares, estado, pasos)
+        inicio = time.perf_counter()
+        pares = cls.propagar_forzados(tablero, pares, estado, pasos)
+        telemetria.medir("propagacion", time.perf_counter() - inicio)
+        if pares is None:
+            telemetria.poda("propagacion")
+        return pares
 
-        candidatos = cls.obtener_candidatos_pares(tablero, pares_restantes, max_candidatos=cls.MAX_CANDIDATOS_PARES, max_caminos=limite) # aca se pone la funcion que se llama para el pseucodigo
+    @classmethod
+    def _ramificar(cls, tablero, pares_restantes, contexto, profundidad):
+        """Elige los pares más restringidos y prueba sus caminos candidatos."""
+        estado = contexto.estado
+
+        if not pares_restantes:
+            if contexto.regiones_pendientes:
+                return cls._continuar_regiones(tablero, contexto, profundidad)
+            return cls.es_solucion_valida(tablero)
+
+        if contexto.descomponer and len(pares_restantes) > 1:
+            regiones, bits = cls.regiones_independientes(tablero, pares_restantes, estado)
+            if len(regiones) > 1:
+                return cls._resolver_por_regiones(tablero, regiones, bits, contexto, profundidad)
+
+        telemetria = contexto.telemetria
+        aparcados = cls._pares_aparcados(contexto)
+        libres = estado.libres if estado is not None else cls.clave_compacta(tablero)
+        inicio = time.perf_counter() if telemetria is not None else 0.0
+        candidatos = cls.ordenar_candidatos_por_conteo(tablero, pares_restantes, max_candidatos=contexto.max_candidatos,
+                                                       max_caminos=contexto.limite, memo=contexto.memo, libres=libres,
+                                                       evitar_autocontacto=contexto.evitar_autocontacto,
+                                                       azar=contexto.azar, parar=contexto.parar) # aca se pone la funcion que se llama para el pseucodigo
+        if telemetria is not None:
+            telemetria.medir("conteo_caminos", time.perf_counter() - inicio)
         if not candidatos:
+            if telemetria is not None and not contexto.agotado:
+                telemetria.poda("sin_candidatos")
             return False
 
-        for idx_sel, caminos in candidatos:
-            if verbose and len(pares_restantes) == len(pares_ordenados):
-                print(f"Conectando '{pares_restantes[idx_sel][0]}': {len(caminos)} caminos candidatos")
+        hijos = 0
+        for idx_sel, conteo in candidatos:
+            if contexto.verbose and profundidad == 0:
+                print(f"Conectando '{pares_restantes[idx_sel][0]}': {conteo} caminos candidatos")
 
-            numero, _, _ = pares_restantes[idx_sel]
+            numero, p1, p2 = pares_restantes[idx_sel]
             restantes = pares_restantes[:idx_sel] + pares_restantes[idx_sel + 1:]
-
-            for camino in caminos[:limite]:
+            inicio = time.perf_counter() if telemetria is not None else 0.0
+            caminos = cls.caminos_del_par(tablero, p1, p2, contexto.limite, contexto.memo, libres,
+                                          contexto.evitar_autocontacto, contexto.parar)
+            if telemetria is not None:
+                telemetria.medir("generacion_caminos", time.perf_counter() - inicio)
+            if contexto.agotado:
+                break
+            if len(caminos) >= contexto.limite:
+                contexto.recortado = True
+            caminos = caminos[:contexto.limite]
+            inicio = time.perf_counter() if telemetria is not None else 0.0
+            viables = cls.filtrar_caminos(tablero, p1, p2, caminos, restantes + aparcados, contexto.memo, libres,
+                                          contexto.evitar_autocontacto)
+            if telemetria is not None:
+                telemetria.medir("filtro_lote", time.perf_counter() - inicio)
+                if len(viables) < len(caminos):
+                    telemetria.poda("cuellos", len(caminos) - len(viables))
+
+            for camino in viables:
                 cls.marcar_camino(tablero, camino, numero) # aca se pone la funcion que se llama para el pseucodigo
-                if (not cls.detectar_cuellos(tablero, restantes) and # aca se pone la funcion que se llama para el pseucodigo
-                        cls.analizar_componentes(tablero, restantes) and# aca se pone la funcion que se llama para el pseucodigo
-                        cls.hay_camino_para_pares(tablero, restantes)):# aca se pone la funcion que se llama para el pseucodigo
-                    if cls._backtrack(tablero, restantes, pares_ordenados, intentos, limite, verbose):# aca se pone la funcion que se llama para el pseucodigo
+                if estado is not None:
+                    estado.marcar_camino(camino, numero)
+                if cls._es_viable_nodo(tablero, restantes + aparcados, estado, telemetria):
+                    hijos += 1
+                    if cls._backtrack(tablero, restantes, contexto, profundidad + 1):# aca se pone la funcion que se llama para el pseucodigo
                         return True
                 cls.desmarcar_camino(tablero, camino, numero)# aca se pone la funcion que se llama para el pseucodigo
+                if estado is not None:
+                    estado.desmarcar_camino(camino, numero)
+                if contexto.corte is not None or contexto.agotado:
+                    break
+            else:
+                continue
+            break
+
+        if telemetria is not None:
+            telemetria.ramificacion(profundidad, hijos)
+        return False
+
+    @staticmethod
+    def _pares_aparcados(contexto):
+        """Pares de las regiones que esperan su turno; las podas los siguen teniendo en cuenta."""
+        return [par for pares, _, _ in contexto.regiones_pendientes for par in pares]
+
+    @classmethod
+    def regiones_independientes(cls, tablero, pares, estado=None):
+        """
+        Agrupa los pares pendientes según la componente de celdas transitables (libres más
+        extremos pendientes) que los contiene. Devuelve ([(mascara, pares)], bits) con las
+        regiones ordenadas de menor a mayor tamaño: dos regiones no comparten celdas ni pares,
+        así que se pueden resolver por separado.
+        """
+        if isinstance(estado, EstadoBusqueda):
+            bits = estado.bits
+        elif isinstance(estado, TableroBits):
+            bits = estado
+        else:
+            bits = TableroBits.desde_tablero(tablero)
+        extremos = bits.mascara_extremos(pares)
+        transitables = bits.libres | extremos
+        regiones = []
+        pendientes = extremos
+        while pendientes:
+            region = bits.inundar(pendientes & -pendientes, transitables)
+            pendientes &= ~region
+            regiones.append((region, [par for par in pares if region & bits.bit(par[1])]))
+        regiones.sort(key=lambda region: region[0].bit_count())
+        return regiones, bits
+
+    @staticmethod
+    def clave_region(tablero, bits, mascara, pares):
+        """
+        Hash compacto (16 bytes) de una región: sus celdas y su borde con el contenido de cada
+        una, los pares que contiene y, un anillo más afuera, qué celdas llevan sus símbolos
+        (lo único de fuera que influye en el grado de sus rutas).
+        """
+        simbolos = {numero.lower() for numero, _, _ in pares}
+        borde = bits.vecinos(mascara) & ~mascara
+        exterior = bits.vecinos(borde) & ~borde & ~mascara
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr((mascara, pares)).encode('utf-8'))
+        for i, j in bits.posiciones(mascara | borde):
+            h.update(tablero[i][j].encode('utf-8'))
+        for i, j in bits.posiciones(exterior):
+            h.update(b'+' if tablero[i][j].lower() in simbolos else b'.')
+        return h.digest()
+
+    @classmethod
+    def _resolver_por_regiones(cls, tablero, regiones, bits, contexto, profundidad):
+        """
+        Resuelve la primera región y deja las demás en contexto.regiones_pendientes; cada vez
+        que se completa una región se continúa con la siguiente (_continuar_regiones). Si una
+        región posterior falla se activa el corte y se deshace todo sin probar alternativas de
+        las regiones ya resueltas.
+        """
+        pendientes = [numero for _, pares in regiones for numero, _, _ in pares]
+        pendientes += [numero for numero, _, _ in cls._pares_aparcados(contexto)]
+        if not cls.es_solucion_valida(tablero, pendientes):
+            return False
+
+        contexto.despachos += 1
+        ident = contexto.despachos
+        entradas = []
+        for mascara, pares in regiones:
+            clave = None
+            if contexto.regiones_fallidas is not None:
+                clave = cls.clave_region(tablero, bits, mascara, pares)
+                if contexto.regiones_fallidas.obtener(clave) is not None:
+                    if contexto.telemetria is not None:
+                        contexto.telemetria.poda("region_fallida")
+                    return False
+            entradas.append((pares, ident, clave))
+
+        base = len(contexto.regiones_pendientes)
+        contexto.regiones_pendientes.extend(reversed(entradas[1:]))
+        pares, _, clave = entradas[0]
+        if cls._backtrack(tablero, pares, contexto, profundidad + 1):
+            return True
+        del contexto.regiones_pendientes[base:]
+        if contexto.corte is None:
+            cls._registrar_region_fallida(clave, contexto)
+        elif contexto.corte == ident:
+            contexto.corte = None
+        return False
+
+    @classmethod
+    def _continuar_regiones(cls, tablero, contexto, profundidad):
+        """Con la región actual completa y válida, pasa a la siguiente región pendiente."""
+        pendientes = [numero for numero, _, _ in cls._pares_aparcados(contexto)]
+        if not cls.es_solucion_valida(tablero, pendientes):
+            return False
+
+        entrada = contexto.regiones_pendientes.pop()
+        pares, ident, clave = entrada
+        if cls._backtrack(tablero, pares, contexto, profundidad + 1):
+            return True
+        contexto.regiones_pendientes.append(entrada)
+        if contexto.corte is None:
+            cls._registrar_region_fallida(clave, contexto)
+            contexto.corte = ident
+        return False
+
+    @staticmethod
+    def _registrar_region_fallida(clave, contexto):
+        if clave is not None and contexto.regiones_fallidas is not None and not contexto.agotado:
+            contexto.regiones_fallidas.guardar(clave, True)
+
+    @classmethod
+    def resolver_numberlink_paralelo(cls, tablero_original, verbose=True, max_caminos_por_par=None, motor="lista", procesos=None,
+                                     profundidad_division=None, propagar=None, evitar_autocontacto=None, descomponer=None,
+                                     tiempo_max=None, max_nodos=None, max_memoria_mb=None, estadisticas=None):
+        """
+        Versión paralela de resolver_numberlink_backtracking con el mismo retorno (tablero,
+        completa). Recorre los primeros profundidad_division niveles del árbol con la misma
+        selección de pares y caminos que la búsqueda serial y reparte cada subárbol resultante
+        a un ProcessPoolExecutor de procesos trabajadores (os.cpu_count() si no se indica). La
+        primera solución completa gana: se avisa a los demás trabajadores para que se detengan
+        y se cancelan los subárboles que aún no empezaron.
+
+        tiempo_max es un plazo común a la división y a todos los trabajadores; max_nodos acota
+        los nodos de la división y, con lo que quede, los de cada subárbol; max_memoria_mb se
+        revisa en cada proceso. Todos se revisan también mientras se enumeran rutas. En
+        estadisticas quedan los intentos sumados y el motivo de término como en la versión serial.
+        """
+        tablero = copy.deepcopy(tablero_original)
+        pares_ordenados = cls.ordenar_pares_por_heuristica(tablero_original)
+        limite = max_caminos_por_par if max_caminos_por_par is not None else cls.MAX_CAMINOS_PAR
+        propagar = propagar if propagar is not None else cls.PROPAGAR_FORZADOS
+        evitar_autocontacto = evitar_autocontacto if evitar_autocontacto is not None else cls.EVITAR_AUTOCONTACTO
+        descomponer = descomponer if descomponer is not None else cls.DESCOMPONER_REGIONES
+        niveles = profundidad_division if profundidad_division is not None else cls.PROFUNDIDAD_DIVISION
+        procesos = procesos or os.cpu_count() or 1
+        if motor not in cls.MOTORES:
+            raise ValueError(f"Motor desconocido: {motor}. Opciones: {', '.join(cls.MOTORES)}")
+
+        if verbose:
+            print("\n=== ESTRATEGIA: BACKTRACKING PARALELO CON HEURÍSTICA DE BORDES ===")
+            print(f"Total de pares a conectar: {len(pares_ordenados)}")
+
+        contexto = ContextoBusqueda(pares_ordenados, limite, verbose, None, CacheLRU(cls.MEMO_MAX_ENTRADAS, cls.MEMO_MAX_CELDAS),
+                                    propagar, evitar_autocontacto)
+        contexto.detener = cls._detener
+        plazo = None
+        if tiempo_max is not None:
+            contexto.limite_tiempo = time.perf_counter() + tiempo_max
+            plazo = time.time() + tiempo_max
+        contexto.max_nodos = max_nodos
+        contexto.max_memoria_mb = max_memoria_mb
+        if contexto.detener is not None or tiempo_max is not None or max_memoria_mb is not None:
+            contexto.parar = lambda: cls._parar_enumeracion(contexto)
+        tareas = []
+        if cls._dividir_subarboles(tablero, pares_ordenados, contexto, niveles, tareas):
+            if verbose:
+                print("\n✓ Solución encontrada al dividir el trabajo")
+            if estadisticas is not None:
+                estadisticas.update({"intentos": contexto.intentos, "motivo": "resuelto", "agotado": False})
+            return tablero, True
+        if contexto.agotado:
+            tareas = []
+        if verbose and tareas:
+            print(f"Subárboles a repartir: {len(tareas)} (profundidad {niveles}, {procesos} procesos)")
+
+        opciones = {"limite": limite, "motor": motor, "propagar": propagar,
+                    "evitar_autocontacto": evitar_autocontacto, "descomponer": descomponer, "plazo": plazo,
+                    "max_nodos": None if max_nodos is None else max(0, max_nodos - contexto.intentos),
+                    "max_memoria_mb": max_memoria_mb}
+        detener = multiprocessing.get_context().Event()
+        intentos = contexto.intentos
+        motivo = contexto.motivo
+        ganador = None
+        if tareas:
+            with ProcessPoolExecutor(max_workers=procesos, initializer=cls._iniciar_trabajador,
+                                     initargs=(detener,)) as ejecutor:
+                futuros = {ejecutor.submit(cls._resolver_subarbol, sub_tablero, pares, opciones, niveles): i
+                           for i, (sub_tablero, pares) in enumerate(tareas)}
+                for futuro in as_completed(futuros):
+                    if futuro.cancelled():
+                        continue
+                    sub_tablero, completa, sub_intentos, sub_motivo = futuro.result()
+                    intentos += sub_intentos
+                    if sub_motivo not in ("resuelto", "sin_solucion", "detenido") and motivo is None:
+                        motivo = sub_motivo
+                    if completa and ganador is None:
+                        ganador = futuros[futuro]
+                        tablero = sub_tablero
+                        detener.set()
+                        for otro in futuros:
+                            otro.cancel()
+        if ganador is not None:
+            motivo = "resuelto"
+        elif motivo is None:
+            motivo = "detenido" if contexto.detener is not None and contexto.detener.is_set() else "sin_solucion"
+
+        if verbose:
+            if ganador is not None:
+                print(f"\n✓ Solución encontrada en el subárbol {ganador + 1} de {len(tareas)} ({intentos} intentos)")
+            else:
+                print(f"\n✗ No se encontró solución después de {intentos} intentos")
+                if motivo != "sin_solucion":
+                    print(f"Búsqueda detenida por presupuesto ({motivo})")
+        if estadisticas is not None:
+            estadisticas.update({"intentos": intentos, "motivo": motivo, "agotado": motivo not in ("resuelto", "sin_solucion")})
+        return tablero, ganador is not None
+
+    @classmethod
+    def resolver_numberlink_portafolio(cls, tablero_original, verbose=True, configuraciones=None, procesos=None,
+                                       tiempo_max=None, estadisticas=None):
+        """
+        Ejecuta a la vez, en un ProcessPoolExecutor, varias configuraciones de búsqueda
+        (PORTAFOLIO si no se entregan otras) y devuelve (tablero, completa, nombre) con la
+        primera solución completa y el nombre de la configuración que la encontró (None si
+        ninguna lo logra). Cada configuración es un dict con "nombre", opcionalmente
+        "metodo": "frontera", y el resto de claves se pasan como argumentos al resolvedor
+        (orden, max_candidatos, max_caminos_por_par, semilla, reinicios, motor...). Al llegar la
+        primera solución, o cuando una configuración demuestra que no hay solución (terminó sin
+        solución y sin recortar rutas), se avisa a los demás procesos para que se detengan.
+
+        tiempo_max es un plazo común a todas las configuraciones (una configuración con su
+        propio tiempo_max usa el menor de los dos). En estadisticas quedan los intentos sumados,
+        la configuración que decidió el resultado y el motivo de término como en la versión
+        serial: "resuelto", "sin_solucion" o el presupuesto que se agotó.
+        """
+        configuraciones = configuraciones if configuraciones is not None else cls.PORTAFOLIO
+        procesos = min(procesos or os.cpu_count() or 1, len(configuraciones)) or 1
+        tablero = copy.deepcopy(tablero_original)
+        plazo = time.time() + tiempo_max if tiempo_max is not None else None
+
+        if verbose:
+            print("\n=== ESTRATEGIA: PORTAFOLIO DE CONFIGURACIONES ===")
+            print(f"Configuraciones: {len(configuraciones)} ({procesos} procesos)")
+
+        detener = multiprocessing.get_context().Event()
+        ganadora = None
+        decisiva = None
+        intentos = 0
+        motivo = None
+        with ProcessPoolExecutor(max_workers=procesos, initializer=cls._iniciar_trabajador,
+                                 initargs=(detener,)) as ejecutor:
+            futuros = {ejecutor.submit(cls._resolver_configuracion, tablero_original, configuracion, plazo): configuracion
+                       for configuracion in configuraciones}
+            for futuro in as_completed(futuros):
+                if futuro.cancelled():
+                    continue
+                sub_tablero, completa, sub_estadisticas = futuro.result()
+                nombre = futuros[futuro].get("nombre")
+                sub_motivo = sub_estadisticas["motivo"]
+                intentos += sub_estadisticas["intentos"]
+                if verbose and decisiva is None:
+                    print(f"  {nombre}: {sub_motivo}")
+                if decisiva is not None:
+                    continue
+                demostrada = sub_motivo == "sin_solucion" and not sub_estadisticas["caminos_recortados"]
+                if completa or demostrada:
+                    decisiva = nombre
+                    motivo = "resuelto" if completa else "sin_solucion"
+                    if completa:
+                        ganadora = nombre
+                        tablero = sub_tablero
+                    detener.set()
+                    for otro in futuros:
+                        otro.cancel()
+                elif sub_motivo not in ("sin_solucion", "detenido") and motivo is None:
+                    motivo = sub_motivo
+        if motivo is None:
+            motivo = "detenido" if cls._detener is not None and cls._detener.is_set() else "sin_solucion"
+
+        if verbose:
+            if ganadora is not None:
+                print(f"\n✓ Solución encontrada por la configuración '{ganadora}'")
+            elif decisiva is not None:
+                print(f"\n✗ La configuración '{decisiva}' demostró que no hay solución")
+            else:
+                print("\n✗ Ninguna configuración encontró solución")
+                if motivo != "sin_solucion":
+                    print(f"Búsqueda detenida por presupuesto ({motivo})")
+        if estadisticas is not None:
+            estadisticas.update({"intentos": intentos, "motivo": motivo, "configuracion": decisiva,
+                                 "agotado": motivo not in ("resuelto", "sin_solucion")})
+        return tablero, ganadora is not None, ganadora
+
+    @classmethod
+    def _resolver_configuracion(cls, tablero, configuracion, plazo=None):
+        """
+        Ejecuta una configuración del portafolio en un proceso trabajador (plazo es una hora
+        absoluta de time.time()); devuelve (tablero, completa, estadisticas).
+        """
+        opciones = {clave: valor for clave, valor in configuracion.items() if clave not in ("nombre", "metodo")}
+        if plazo is not None:
+            restante = max(0.0, plazo - time.time())
+            opciones["tiempo_max"] = min(restante, opciones.get("tiempo_max") or restante)
+        estadisticas = {}
+        resolver = cls.resolver_numberlink_frontera if configuracion.get("metodo") == "frontera" \
+            else cls.resolver_numberlink_backtracking
+        sub_tablero, completa = resolver(tablero, verbose=False, estadisticas=estadisticas, **opciones)
+        return sub_tablero, completa, estadisticas
+
+    @classmethod
+    def _iniciar_trabajador(cls, detener):
+        """Inicializador de cada proceso: guarda el aviso compartido de detención."""
+        cls._detener = detener
+
+    @classmethod
+    def _resolver_subarbol(cls, tablero, pares, opciones, profundidad):
+        """
+        Ejecuta _backtrack sobre un subárbol en un proceso trabajador, con el aviso compartido
+        de detención y los presupuestos de opciones (plazo es una hora absoluta de time.time());
+        devuelve (tablero, completa, intentos, motivo).
+        """
+        estado = cls._crear_estado(opciones["motor"], tablero, pares)
+        descomponer = opciones["descomponer"]
+        contexto = ContextoBusqueda(pares, opciones["limite"], False, estado,
+                                    CacheLRU(cls.MEMO_MAX_ENTRADAS, cls.MEMO_MAX_CELDAS), opciones["propagar"],
+                                    opciones["evitar_autocontacto"], CacheLRU(cls.MAX_FALLOS), descomponer,
+                                    CacheLRU(cls.MAX_REGIONES_FALLIDAS) if descomponer else None)
+        contexto.detener = cls._detener
+        if opciones.get("plazo") is not None:
+            contexto.limite_tiempo = time.perf_counter() + (opciones["plazo"] - time.time())
+        contexto.max_nodos = opciones.get("max_nodos")
+        contexto.max_memoria_mb = opciones.get("max_memoria_mb")
+        contexto.parar = lambda: cls._parar_enumeracion(contexto)
+        completa = cls._backtrack(tablero, pares, contexto, profundidad)
+        cls._cerrar_motivo(contexto, completa)
+        return tablero, completa, contexto.intentos, contexto.motivo
+
+    @classmethod
+    def _dividir_subarboles(cls, tablero, pares_restantes, contexto, niveles, tareas):
+        """
+        Recorre los primeros niveles del árbol igual que _backtrack/_ramificar (propagación,
+        orden de candidatos y podas) y agrega a tareas una copia (tablero, pares) de cada nodo
+        viable del último nivel. Devuelve True si por el camino encuentra la solución, que
+        queda escrita en tablero. Si se agota un presupuesto deja de agregar tareas.
+        """
+        if cls._debe_parar(contexto):
+            return False
+        contexto.intentos += 1
+        pasos = []
+        if contexto.propagar and pares_restantes:
+            pares_restantes = cls.propagar_forzados(tablero, pares_restantes, None, pasos)
+            if pares_restantes is None or (pasos and not cls.es_viable(tablero, pares_restantes)):
+                cls.deshacer_propagacion(tablero, pasos)
+                return False
+
+        if not pares_restantes:
+            if cls.es_solucion_valida(tablero):
+                return True
+        elif niveles <= 0:
+            tareas.append((copy.deepcopy(tablero), pares_restantes))
+        else:
+            libres = cls.clave_compacta(tablero)
+            candidatos = cls.ordenar_candidatos_por_conteo(tablero, pares_restantes, max_candidatos=contexto.max_candidatos,
+                                                           max_caminos=contexto.limite, memo=contexto.memo, libres=libres,
+                                                           evitar_autocontacto=contexto.evitar_autocontacto,
+                                                           parar=contexto.parar)
+            for idx_sel, _ in candidatos:
+                numero, p1, p2 = pares_restantes[idx_sel]
+                restantes = pares_restantes[:idx_sel] + pares_restantes[idx_sel + 1:]
+                caminos = cls.caminos_del_par(tablero, p1, p2, contexto.limite, contexto.memo, libres,
+                                              contexto.evitar_autocontacto, contexto.parar)[:contexto.limite]
+                if contexto.agotado:
+                    break
+                caminos = cls.filtrar_caminos(tablero, p1, p2, caminos, restantes, contexto.memo, libres,
+                                              contexto.evitar_autocontacto)
+                for camino in caminos:
+                    cls.marcar_camino(tablero, camino, numero)
+                    if cls.es_viable(tablero, restantes):
+                        if cls._dividir_subarboles(tablero, restantes, contexto, niveles - 1, tareas):
+                            return True
+                    cls.desmarcar_camino(tablero, camino, numero)
+                    if contexto.agotado:
+                        break
+
+        cls.deshacer_propagacion(tablero, pasos)
+        return False
+
+    @classmethod
+    def resolver_numberlink_frontera(cls, tablero_original, verbose=True, max_caminos_por_par=None, motor="incremental", memo=None,
+                                     propagar=None, evitar_autocontacto=None, fallos=None, tiempo_max=None,
+                                     estadisticas=None, telemetria=None):
+        """
+        Motor alternativo que crece las rutas celda a celda desde sus cabezas en lugar de elegir
+        rutas completas. En cada nodo propaga movimientos forzados, elige la cabeza con menos
+        movimientos legales y aplica las mismas podas (cuellos, componentes y conectividad).
+        Tiene la misma firma y el mismo retorno (tablero, completa) que
+        resolver_numberlink_backtracking; max_caminos_por_par, memo y evitar_autocontacto se
+        aceptan por compatibilidad pero no se usan (los movimientos nunca tocan su propia ruta).
+        La tabla de fallos también evita repetir estados alcanzados en distinto orden;
+        tiempo_max, estadisticas y telemetria funcionan igual que en el backtracking.
+        """
+        tablero = copy.deepcopy(tablero_original)
+        pares_ordenados = cls.ordenar_pares_por_heuristica(tablero_original)
+        estado = cls._crear_estado(motor, tablero, pares_ordenados)
+        propagar = propagar if propagar is not None else cls.PROPAGAR_FORZADOS
+
+        if verbose:
+            print("\n=== ESTRATEGIA: FRONTERA CELDA A CELDA ===")
+            print(f"Total de pares a conectar: {len(pares_ordenados)}\n")
+
+        if fallos is None:
+            fallos = CacheLRU(cls.MAX_FALLOS)
+        contexto = ContextoBusqueda(pares_ordenados, None, verbose, estado, None, propagar, True, fallos)
+        contexto.detener = cls._detener
+        if tiempo_max is not None:
+            contexto.limite_tiempo = time.perf_counter() + tiempo_max
+        cls._iniciar_telemetria(contexto, telemetria, tablero, "frontera")
+        completa = cls._frontera(tablero, pares_ordenados, contexto)
+
+        if verbose:
+            if completa:
+                print(f"\n✓ Solución encontrada en {contexto.intentos} intentos")
+            else:
+                print(f"\n✗ No se encontró solución después de {contexto.intentos} intentos")
+            cls._imprimir_tabla_fallos(contexto)
+        cls._cerrar_motivo(contexto, completa)
+        if estadisticas is not None:
+            cls._volcar_estadisticas(contexto, estadisticas)
+        if telemetria is not None:
+            telemetria.finalizar(contexto, completa)
+        return tablero, completa
+
+    @classmethod
+    def movimientos_cabeza(cls, tablero, numero, cabeza, otra):
+        """
+        Movimientos legales de una cabeza, ordenados por cercanía a la otra cabeza. Si ambas
+        cabezas son vecinas la única opción válida es conectarlas; si no, puede avanzar a una
+        celda libre que no toque otra celda de su propia ruta.
+        """
+        filas, cols = len(tablero), len(tablero[0])
+        vecinos = cls.obtener_vecinos(cabeza, filas, cols)
+        if otra in vecinos:
+            return [otra]
+
+        simbolo = numero.lower()
+        movimientos = []
+        for v in vecinos:
+            if tablero[v[0]][v[1]] != ' ':
+                continue
+            if any(w != cabeza and w != otra and tablero[w[0]][w[1]].lower() == simbolo
+                   for w in cls.obtener_vecinos(v, filas, cols)):
+                continue
+            movimientos.append(v)
+        movimientos.sort(key=lambda v: cls.calcular_distancia_manhattan(v, otra))
+        return movimientos
+
+    @classmethod
+    def _frontera(cls, tablero, pares_restantes, contexto, profundidad=0):
+        """Recursión del motor de frontera: propaga, elige la cabeza más restringida y ramifica."""
+        if cls._debe_parar(contexto):
+            return False
+        telemetria = contexto.telemetria
+        clave = cls._consultar_fallo(tablero, pares_restantes, contexto)
+        if clave is None:
+            if telemetria is not None:
+                telemetria.poda("tabla_fallos")
+            return False
+        intentos_inicio = contexto.intentos
+        contexto.intentos += 1
+        if telemetria is not None:
+            telemetria.nodo(profundidad, len(pares_restantes))
+        estado = contexto.estado
+        pasos = []
+
+        if contexto.propagar and pares_restantes:
+            pares_restantes = cls._propagar_medido(tablero, pares_restantes, estado, pasos, telemetria)
+            if pares_restantes is None or (pasos and not cls._es_viable_nodo(tablero, pares_restantes, estado,
+                                                                             telemetria)):
+                cls.deshacer_propagacion(tablero, pasos, estado)
+                cls._registrar_fallo(clave, contexto, intentos_inicio)
+                return False
+
+        if not pares_restantes:
+            if cls.es_solucion_valida(tablero):
+                return True
+            cls.deshacer_propagacion(tablero, pasos, estado)
+            cls._registrar_fallo(clave, contexto, intentos_inicio)
+            return False
+
+        mejor = None
+        for idx, (numero, p1, p2) in enumerate(pares_restantes):
+            for cabeza, otra in ((p1, p2), (p2, p1)):
+                movimientos = cls.movimientos_cabeza(tablero, numero, cabeza, otra)
+                if mejor is None or len(movimientos) < len(mejor[2]):
+                    mejor = (idx, cabeza, movimientos)
+            if not mejor[2]:
+                break
+
+        idx, cabeza, movimientos = mejor
+        if not movimientos and telemetria is not None:
+            telemetria.poda("sin_candidatos")
+        hijos = 0
+        for destino in movimientos:
+            paso = []
+            nuevos = cls.extender_cabeza(tablero, pares_restantes, idx, cabeza, destino, estado, paso)
+            if cls._es_viable_nodo(tablero, nuevos, estado, telemetria):
+                hijos += 1
+                if cls._frontera(tablero, nuevos, contexto, profundidad + 1):
+                    return True
+            cls.deshacer_propagacion(tablero, paso, estado)
+        if telemetria is not None:
+            telemetria.ramificacion(profundidad, hijos)
+
+        cls.deshacer_propagacion(tablero, pasos, estado)
+        cls._registrar_fallo(clave, contexto, intentos_inicio)
         return False
 
+    @classmethod
+    def contar_soluciones(cls, tablero_original, tope=2, testigos=2, verbose=True, max_caminos_por_par=None,
+                          motor="lista", propagar=None, evitar_autocontacto=None, tiempo_max=None, max_nodos=None):
+        """
+        Cuenta las soluciones del tablero hasta tope (por defecto 2, lo justo para decidir si
+        es única). Usa las mismas podas y la misma propagación que el backtracking, pero en
+        cada nodo ramifica sobre un solo par (el de menos rutas), de modo que cada solución
+        se cuenta exactamente una vez, y guarda en una CacheLRU (MAX_CONTEOS) el número de
+        soluciones de cada subestado ya explorado para no volver a recorrerlo.
+
+        Devuelve un dict con "resultado" ("unica", "multiple", "ninguna" o "indeterminado"
+        si el conteo no es exacto), "soluciones" (acotado por tope), "exacto" (False si se
+        agotó tiempo_max o max_nodos, o si alguna lista de rutas quedó recortada por
+        max_caminos_por_par), "testigos" (hasta testigos soluciones distintas), "intentos"
+        y "motivo" (el presupuesto agotado, o None).
+        """
+        tablero = copy.deepcopy(tablero_original)
+        pares = cls.ordenar_pares_por_heuristica(tablero_original)
+        estado = cls._crear_estado(motor, tablero, pares)
+        limite = max_caminos_por_par if max_caminos_por_par is not None else cls.MAX_CAMINOS_PAR
+        propagar = propagar if propagar is not None else cls.PROPAGAR_FORZADOS
+        evitar_autocontacto = evitar_autocontacto if evitar_autocontacto is not None else cls.EVITAR_AUTOCONTACTO
+        contexto = ContextoBusqueda(pares, limite, verbose, estado, CacheLRU(cls.MEMO_MAX_ENTRADAS, cls.MEMO_MAX_CELDAS),
+                                    propagar, evitar_autocontacto)
+        contexto.detener = cls._detener
+        contexto.max_nodos = max_nodos
+        if tiempo_max is not None:
+            contexto.limite_tiempo = time.perf_counter() + tiempo_max
+        if contexto.detener is not None or tiempo_max is not None:
+            contexto.parar = lambda: cls._parar_enumeracion(contexto)
+        conteos = CacheLRU(cls.MAX_CONTEOS)
+        soluciones = []
+
+        total = cls._contar(tablero, pares, contexto, tope, conteos, soluciones, testigos) if tope > 0 else 0
+        exacto = not contexto.agotado and not contexto.recortado
+        if total >= 2:
+            resultado = "multiple"
+        elif not exacto:
+            resultado = "indeterminado"
+        else:
+            resultado = "unica" if total == 1 else "ninguna"
+
+        if verbose:
+            stats = conteos.estadisticas()
+            print(f"Soluciones: {total}{'+' if total >= tope else ''} ({resultado}) en {contexto.intentos} intentos")
+            print(f"Memo de conteos: {stats['entradas']} subestados, {stats['aciertos']} aciertos")
+            if not exacto:
+                causa = "presupuesto agotado" if contexto.agotado else "rutas recortadas por max_caminos_por_par"
+                print(f"Conteo no exacto: {causa}")
+        return {"resultado": resultado, "soluciones": total, "exacto": exacto, "testigos": soluciones,
+                "intentos": contexto.intentos, "motivo": contexto.motivo}
+
+    @classmethod
+    def _contar(cls, tablero, pares_restantes, contexto, tope, conteos, soluciones, testigos):
+        """
+        Número de soluciones del subárbol, acotado por tope. Un conteo se guarda en la memo
+        solo si es exacto (no llegó al tope ni se agotó el presupuesto). Mientras falten
+        testigos, los subestados con soluciones se vuelven a recorrer para poder copiarlas.
+        """
+        if cls._debe_parar(contexto):
+            return 0
+        clave = cls.clave_nodo(tablero, sorted(pares_restantes))
+        guardado = conteos.obtener(clave)
+        if guardado is not None and (guardado == 0 or len(soluciones) >= testigos):
+            return min(guardado, tope)
+        contexto.intentos += 1
+        estado = contexto.estado
+        pasos = []
+
+        if contexto.propagar and pares_restantes:
+            pares_restantes = cls.propagar_forzados(tablero, pares_restantes, estado, pasos)
+            if pares_restantes is None or (pasos and not cls._es_viable_nodo(tablero, pares_restantes, estado)):
+                cls.deshacer_propagacion(tablero, pasos, estado)
+                if not contexto.agotado:
+                    conteos.guardar(clave, 0)
+                return 0
+
+        if not pares_restantes:
+            total = 1 if cls.es_solucion_valida(tablero) else 0
+            if total and len(soluciones) < testigos:
+                soluciones.append([fila[:] for fila in tablero])
+        else:
+            total = cls._contar_ramas(tablero, pares_restantes, contexto, tope, conteos, soluciones, testigos)
+
+        cls.deshacer_propagacion(tablero, pasos, estado)
+        if not contexto.agotado and total < tope:
+            conteos.guardar(clave, total)
+        return total
+
+    @classmethod
+    def _contar_ramas(cls, tablero, pares_restantes, contexto, tope, conteos, soluciones, testigos):
+        """
+        Suma los conteos de las rutas del par más restringido. Todo par debe conectarse en
+        cualquier solución, así que sus rutas parten el subárbol sin repetir soluciones; si
+        algún par no tiene rutas el nodo no tiene ninguna.
+        """
+        estado = contexto.estado
+        libres = estado.libres if estado is not None else cls.clave_compacta(tablero)
+        candidatos = cls.ordenar_candidatos_por_conteo(tablero, pares_restantes, max_candidatos=len(pares_restantes),
+                                                       max_caminos=contexto.limite, memo=contexto.memo, libres=libres,
+                                                       evitar_autocontacto=contexto.evitar_autocontacto,
+                                                       parar=contexto.parar)
+        if len(candidatos) < len(pares_restantes):
+            return 0
+
+        idx_sel = candidatos[0][0]
+        numero, p1, p2 = pares_restantes[idx_sel]
+        restantes = pares_restantes[:idx_sel] + pares_restantes[idx_sel + 1:]
+        caminos = cls.caminos_del_par(tablero, p1, p2, contexto.limite, contexto.memo, libres,
+                                      contexto.evitar_autocontacto, contexto.parar)
+        if len(caminos) >= contexto.limite:
+            contexto.recortado = True
+        caminos = cls.filtrar_caminos(tablero, p1, p2, caminos, restantes, contexto.memo, libres,
+                                      contexto.evitar_autocontacto)
+
+        total = 0
+        for camino in caminos:
+            if total >= tope or contexto.agotado:
+                break
+            cls.marcar_camino(tablero, camino, numero)
+            if estado is not None:
+                estado.marcar_camino(camino, numero)
+            if cls._es_viable_nodo(tablero, restantes, estado):
+                total += cls._contar(tablero, restantes, contexto, tope - total, conteos, soluciones, testigos)
+            cls.desmarcar_camino(tablero, camino, numero)
+            if estado is not None:
+                estado.desmarcar_camino(camino, numero)
+        return total
+
     @staticmethod
     def imprimir_tablero(tablero):
         """Imprime el tablero en formato legible."""
@@ -401,14 +1971,20 @@ class NumberLinkHeuristicSolver:
 
 
 if __name__ == "__main__":
+    from cache_soluciones import CacheSoluciones
     from leer_tablero import NumberLinkBoardIO
-    import sys
     
-    if len(sys.argv) < 2:
-        print("Uso: python solucionador_backtracking.py <ruta_del_archivo>")
+    argumentos = sys.argv[1:]
+    ruta_cache = None
+    if "--cache" in argumentos:
+        posicion = argumentos.index("--cache")
+        ruta_cache = argumentos[posicion + 1] if posicion + 1 < len(argumentos) else None
+        del argumentos[posicion:posicion + 2]
+    if not argumentos or ("--cache" in sys.argv and ruta_cache is None):
+        print("Uso: python solucionador_backtracking.py <ruta_del_archivo> [--cache soluciones.sqlite]")
         sys.exit(1)
     
-    ruta = sys.argv[1]
+    ruta = argumentos[0]
     
     try:
         tablero = NumberLinkBoardIO.leer_tablero(ruta)
@@ -425,8 +2001,18 @@ if __name__ == "__main__":
         cols = len(tablero[0]) if filas else 0
         ruta_salida = os.path.join("tablerosSalida", f"salida{filas}x{cols}.txt")
 
+        cache = CacheSoluciones.abrir(ruta_cache) if ruta_cache is not None else None
         inicio = time.perf_counter()
-        solucion, completa = NumberLinkHeuristicSolver.resolver_numberlink_backtracking(tablero, verbose=True)
+        encontrado = cache.buscar(tablero) if cache is not None else None
+        if encontrado is not None:
+            solucion, completa = encontrado
+            print(f"\nResultado recuperado de la caché {cache.ruta}")
+        else:
+            estadisticas = {}
+            solucion, completa = NumberLinkHeuristicSolver.resolver_numberlink_backtracking(tablero, verbose=True,
+                                                                                            estadisticas=estadisticas)
+            if cache is not None:
+                cache.registrar(tablero, solucion, completa, estadisticas)
         duracion = time.perf_counter() - inicio
         
         if completa:
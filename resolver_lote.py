@@ -0,0 +1,292 @@
+# resolver_lote.py
+# Descripción: Resuelve en lote los tableros de un directorio o de un manifiesto con un pool de procesos
+
+import argparse
+import contextlib
+import math
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cache_soluciones import CacheSoluciones
+from coleccion_tableros import ColeccionTableros
+from leer_tablero import NumberLinkBoardIO
+from numberlink_heuristica import NumberLinkHeuristicSolver
+from resultados_binarios import EscritorResultados
+from verificar_tablero import NumberLinkVerifier
+
+
+class TiempoAgotado(Exception):
+    """Se lanza desde la alarma del proceso trabajador cuando un tablero excede su tiempo."""
+
+
+class NumberLinkBatchSolver:
+    """
+    Resuelve muchos tableros en una sola invocación: los reparte entre procesos trabajadores
+    (sin pagar el arranque del intérprete por tablero), acota cada resolución con un tiempo
+    máximo, guarda cada resultado con un nombre único derivado del archivo de entrada y
+    resume throughput, tableros resueltos y percentiles de latencia.
+    """
+
+    METODOS = {
+        "backtracking": ("resolver_numberlink_backtracking", "Backtracking Heurístico"),
+        "frontera": ("resolver_numberlink_frontera", "Frontera Celda a Celda"),
+    }
+    PERCENTILES = (50, 90, 99)
+    TIEMPO_MAX = 60.0
+    MARGEN_ALARMA = 1.0
+
+    @staticmethod
+    def listar_tableros(origen):
+        """
+        Tableros a resolver. Si origen es un directorio se toman sus archivos .txt en orden
+        alfabético. Si es una colección (ver ColeccionTableros) se devuelve un par (ruta, n)
+        por cada tablero, que los trabajadores leen con el índice de la colección; si es otro
+        archivo se lee como manifiesto, con una ruta por línea (relativa al manifiesto) e
+        ignorando líneas vacías y comentarios con '#'.
+        """
+        if os.path.isdir(origen):
+            return [os.path.join(origen, nombre) for nombre in sorted(os.listdir(origen))
+                    if nombre.endswith('.txt')]
+        if not os.path.exists(origen):
+            raise FileNotFoundError(f"No se encontró el directorio o manifiesto: {origen}")
+        if ColeccionTableros.es_coleccion(origen):
+            with ColeccionTableros(origen) as coleccion:
+                return [(origen, n) for n in range(len(coleccion))]
+
+        base = os.path.dirname(origen)
+        rutas = []
+        with open(origen, 'r', encoding='utf-8') as manifiesto:
+            for linea in manifiesto:
+                linea = linea.strip()
+                if not linea or linea.startswith('#'):
+                    continue
+                rutas.append(linea if os.path.isabs(linea) else os.path.join(base, linea))
+        return rutas
+
+    @staticmethod
+    def nombre_entrada(entrada):
+        """Nombre para mostrar de una entrada: la ruta, o ruta#n para el tablero n de una colección."""
+        if isinstance(entrada, tuple):
+            return f"{entrada[0]}#{entrada[1]}"
+        return entrada
+
+    @staticmethod
+    def leer_entrada(entrada):
+        """Lee el tablero de una ruta o de un par (colección, n)."""
+        if isinstance(entrada, tuple):
+            return ColeccionTableros.abrir(entrada[0])[entrada[1]]
+        return NumberLinkBoardIO.leer_tablero(entrada)
+
+    @staticmethod
+    def nombres_salida(rutas, directorio_salida):
+        """
+        Un archivo de salida por tablero, salida_<nombre de la entrada>.txt (con _<n> para el
+        tablero n de una colección), con un sufijo numérico cuando dos entradas de distintas
+        carpetas comparten nombre.
+        """
+        usados = {}
+        salidas = []
+        for ruta in rutas:
+            if isinstance(ruta, tuple):
+                base = f"{os.path.splitext(os.path.basename(ruta[0]))[0]}_{ruta[1]}"
+            else:
+                base = os.path.splitext(os.path.basename(ruta))[0]
+            usados[base] = usados.get(base, 0) + 1
+            sufijo = f"_{usados[base]}" if usados[base] > 1 else ""
+            salidas.append(os.path.join(directorio_salida, f"salida_{base}{sufijo}.txt"))
+        return salidas
+
+    @staticmethod
+    def _interrumpir(signum, frame):
+        raise TiempoAgotado()
+
+    @classmethod
+    def _resolver_archivo(cls, ruta, metodo, tiempo_max, opciones, cache=None):
+        """
+        Lee, resuelve y verifica un tablero dentro de un proceso trabajador. Con cache (ruta
+        de una CacheSoluciones) primero se busca ahí el tablero, y los resultados nuevos que
+        sirvan se guardan al terminar. El solucionador revisa tiempo_max entre nodos; como respaldo, donde existe SIGALRM una alarma
+        interrumpe la resolución MARGEN_ALARMA segundos después (por ejemplo, en medio de una
+        enumeración de rutas larga) y el tablero se informa sin resolver.
+        """
+        inicio = time.perf_counter()
+        tablero = None
+        nombre = cls.nombre_entrada(ruta)
+        alarma = tiempo_max is not None and hasattr(signal, "SIGALRM")
+        if alarma:
+            anterior = signal.signal(signal.SIGALRM, cls._interrumpir)
+            signal.setitimer(signal.ITIMER_REAL, tiempo_max + cls.MARGEN_ALARMA)
+        try:
+            tablero = cls.leer_entrada(ruta)
+            soluciones = CacheSoluciones.abrir(cache) if cache else None
+            encontrado = soluciones.buscar(tablero) if soluciones is not None else None
+            estadisticas = {}
+            if encontrado is not None:
+                solucion, completa = encontrado
+                estadisticas["motivo"] = "resuelto" if completa else "sin_solucion"
+            else:
+                resolver = getattr(NumberLinkHeuristicSolver, cls.METODOS[metodo][0])
+                solucion, completa = resolver(tablero, verbose=False, tiempo_max=tiempo_max,
+                                              estadisticas=estadisticas, **opciones)
+            segundos = time.perf_counter() - inicio
+            verificada = False
+            if completa:
+                verificada = NumberLinkVerifier.diagnosticar(solucion)["valido"]
+            if soluciones is not None and encontrado is None and (verificada or not completa):
+                soluciones.registrar(tablero, solucion, completa, estadisticas)
+            if completa:
+                estado = "resuelto"
+            elif estadisticas.get("motivo") == "tiempo":
+                estado = "tiempo agotado"
+            else:
+                estado = "sin solución"
+            return {"ruta": nombre, "filas": len(tablero), "cols": len(tablero[0]) if tablero else 0,
+                    "estado": estado, "completa": completa, "verificada": verificada,
+                    "segundos": segundos, "intentos": estadisticas.get("intentos"), "tablero": solucion,
+                    "cache": encontrado is not None}
+        except TiempoAgotado:
+            return {"ruta": nombre, "filas": len(tablero) if tablero else 0, "cols": len(tablero[0]) if tablero else 0,
+                    "estado": "tiempo agotado", "completa": False, "verificada": False,
+                    "segundos": time.perf_counter() - inicio, "tablero": tablero}
+        except Exception as e:
+            return {"ruta": nombre, "estado": "error", "error": str(e), "completa": False,
+                    "verificada": False, "segundos": time.perf_counter() - inicio, "tablero": None}
+        finally:
+            if alarma:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, anterior)
+
+    @classmethod
+    def resolver_lote(cls, rutas, directorio_salida="tablerosSalida", procesos=None, tiempo_max=None,
+                      metodo="backtracking", opciones=None, verbose=True, cache=None, binario=None):
+        """
+        Resuelve las rutas en un ProcessPoolExecutor y guarda cada resultado en cuanto llega:
+        como archivo de texto en directorio_salida o, con binario, agregado a ese único
+        archivo de ResultadosBinarios (con "salida" igual a binario#n). Con cache (ruta de un archivo de CacheSoluciones) los tableros ya conocidos, o
+        equivalentes por simetría o renombre de símbolos, se responden sin resolverlos.
+        Devuelve (resultados, resumen): los resultados en el orden de las rutas (con la ruta
+        de salida en "salida") y el resumen calculado por resumir.
+        """
+        if metodo not in cls.METODOS:
+            raise ValueError(f"Método desconocido: {metodo}. Opciones: {', '.join(cls.METODOS)}")
+        tiempo_max = tiempo_max if tiempo_max is not None else cls.TIEMPO_MAX
+        opciones = opciones or {}
+        salidas = cls.nombres_salida(rutas, directorio_salida)
+        resultados = [None] * len(rutas)
+
+        inicio = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=procesos or os.cpu_count() or 1) as ejecutor, \
+                (EscritorResultados(binario) if binario else contextlib.nullcontext()) as escritor:
+            futuros = {ejecutor.submit(cls._resolver_archivo, ruta, metodo, tiempo_max, opciones, cache): i
+                       for i, ruta in enumerate(rutas)}
+            for futuro in as_completed(futuros):
+                i = futuros[futuro]
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    resultado = {"ruta": cls.nombre_entrada(rutas[i]), "estado": "error", "error": str(e),
+                                 "completa": False, "verificada": False, "segundos": 0.0, "tablero": None}
+                resultado["salida"] = None
+                if resultado["tablero"] is not None and escritor is not None:
+                    n = escritor.agregar(resultado["tablero"], resultado["ruta"], cls.METODOS[metodo][1],
+                                         resultado["estado"], resultado["segundos"], resultado.get("intentos"))
+                    resultado["salida"] = f"{binario}#{n}"
+                elif resultado["tablero"] is not None:
+                    resultado["salida"] = salidas[i]
+                    NumberLinkBoardIO.guardar_resultado(resultado["tablero"], salidas[i], cls.METODOS[metodo][1],
+                                                        resultado["segundos"], resultado["completa"])
+                resultados[i] = resultado
+                if verbose:
+                    detalle = f" ({resultado['error']})" if resultado["estado"] == "error" else ""
+                    print(f"[{sum(r is not None for r in resultados)}/{len(rutas)}] {resultado['ruta']}: "
+                          f"{resultado['estado']}{detalle} en {resultado['segundos']:.3f} s", flush=True)
+        duracion = time.perf_counter() - inicio
+
+        resumen = cls.resumir(resultados, duracion)
+        if verbose:
+            cls.imprimir_resumen(resultados, resumen)
+        return resultados, resumen
+
+    @staticmethod
+    def percentil(valores, p):
+        """Percentil p (0-100) por rango más cercano; 0.0 si no hay valores."""
+        if not valores:
+            return 0.0
+        ordenados = sorted(valores)
+        rango = max(1, math.ceil(p / 100 * len(ordenados)))
+        return ordenados[rango - 1]
+
+    @classmethod
+    def resumir(cls, resultados, duracion):
+        """Conteos por estado, throughput (tableros/s) y percentiles de latencia por tablero."""
+        latencias = [r["segundos"] for r in resultados]
+        resumen = {
+            "tableros": len(resultados),
+            "resueltos": sum(1 for r in resultados if r["estado"] == "resuelto"),
+            "sin_solucion": sum(1 for r in resultados if r["estado"] == "sin solución"),
+            "tiempo_agotado": sum(1 for r in resultados if r["estado"] == "tiempo agotado"),
+            "errores": sum(1 for r in resultados if r["estado"] == "error"),
+            "no_verificados": sum(1 for r in resultados if r["completa"] and not r["verificada"]),
+            "desde_cache": sum(1 for r in resultados if r.get("cache")),
+            "segundos": duracion,
+            "throughput": len(resultados) / duracion if duracion > 0 else 0.0,
+            "latencia_max": max(latencias) if latencias else 0.0,
+        }
+        for p in cls.PERCENTILES:
+            resumen[f"p{p}"] = cls.percentil(latencias, p)
+        return resumen
+
+    @classmethod
+    def imprimir_resumen(cls, resultados, resumen):
+        """Imprime una tabla por tablero y el resumen del lote."""
+        ancho = max([len(os.path.basename(r["ruta"])) for r in resultados] + [7])
+        print(f"\n{'Tablero':<{ancho}}  {'Tamaño':>7}  {'Estado':<15}  {'Verif.':<6}  {'Tiempo (s)':>10}")
+        for r in resultados:
+            tamano = f"{r['filas']}x{r['cols']}" if "filas" in r else "-"
+            verificada = "sí" if r["verificada"] else ("no" if r["completa"] else "-")
+            print(f"{os.path.basename(r['ruta']):<{ancho}}  {tamano:>7}  {r['estado']:<15}  {verificada:<6}  "
+                  f"{r['segundos']:>10.3f}")
+
+        print(f"\nTableros: {resumen['tableros']}  resueltos: {resumen['resueltos']}  "
+              f"sin solución: {resumen['sin_solucion']}  tiempo agotado: {resumen['tiempo_agotado']}  "
+              f"errores: {resumen['errores']}")
+        if resumen["desde_cache"]:
+            print(f"Respondidos desde la caché de soluciones: {resumen['desde_cache']}")
+        if resumen["no_verificados"]:
+            print(f"Soluciones rechazadas por el verificador: {resumen['no_verificados']}")
+        percentiles = "  ".join(f"p{p}: {resumen[f'p{p}']:.3f} s" for p in cls.PERCENTILES)
+        print(f"Tiempo total: {resumen['segundos']:.3f} s  throughput: {resumen['throughput']:.2f} tableros/s")
+        print(f"Latencia por tablero  {percentiles}  máx: {resumen['latencia_max']:.3f} s")
+
+
+# --- Ejecución principal ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resuelve en lote tableros NumberLink.")
+    parser.add_argument("origen", help="directorio con tableros .txt, colección de tableros o manifiesto con una ruta por línea")
+    parser.add_argument("--salida", default="tablerosSalida", help="directorio de resultados (por defecto tablerosSalida)")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos trabajadores (por defecto uno por núcleo)")
+    parser.add_argument("--tiempo", type=float, default=NumberLinkBatchSolver.TIEMPO_MAX,
+                        help="tiempo máximo por tablero en segundos")
+    parser.add_argument("--metodo", choices=sorted(NumberLinkBatchSolver.METODOS), default="backtracking")
+    parser.add_argument("--motor", choices=NumberLinkHeuristicSolver.MOTORES, default=None)
+    parser.add_argument("--cache", default=None, help="archivo SQLite de soluciones conocidas (se crea si no existe)")
+    parser.add_argument("--binario", default=None,
+                        help="agrega los resultados a este archivo binario (resultados_binarios.py) en lugar de --salida")
+    args = parser.parse_args()
+
+    try:
+        rutas = NumberLinkBatchSolver.listar_tableros(args.origen)
+    except Exception as e:
+        print(f"Error al listar los tableros: {e}")
+        sys.exit(1)
+    if not rutas:
+        print(f"No hay tableros en: {args.origen}")
+        sys.exit(1)
+
+    opciones = {"motor": args.motor} if args.motor else {}
+    _, resumen = NumberLinkBatchSolver.resolver_lote(rutas, args.salida, args.procesos, args.tiempo, args.metodo, opciones,
+                                                       cache=args.cache, binario=args.binario)
+    sys.exit(0 if resumen["errores"] == 0 else 1)
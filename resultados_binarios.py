@@ -0,0 +1,202 @@
+# resultados_binarios.py
+# Descripción: Formato binario compacto para muchos resultados en un archivo, con escritura en bloque e índice
+
+import argparse
+import os
+import struct
+import sys
+
+from coleccion_tableros import ColeccionTableros
+from leer_tablero import NumberLinkBoardIO
+
+
+class ResultadosBinarios(ColeccionTableros):
+    """
+    Archivo de resultados: la firma MAGIA seguida de registros, uno por tablero resuelto.
+    Cada registro empieza con CABECERA_REGISTRO (largo total, filas, columnas, estado, bits
+    por celda, segundos, nodos y largos de los textos), sigue con el nombre de la entrada, el
+    nombre del solver y la tabla de símbolos en UTF-8, y termina con la grilla empaquetada:
+    cada celda es el índice de su símbolo en la tabla, con 4, 8 o 16 bits por celda.
+
+    Se lee igual que una colección: recorriéndolo con mmap o, con el índice <ruta>.idx de
+    posiciones de los registros, accediendo directo al resultado n. Cada resultado es un
+    dict con nombre, solver, estado, completa, segundos, intentos y tablero.
+    """
+
+    MAGIA = b"NLRES1\0\0"
+    MAGIA_INDICE = b"NLRIX1\0\0"
+    CABECERA_REGISTRO = struct.Struct("<IHHBBdqHBH")
+    ESTADOS = ("resuelto", "sin solución", "tiempo agotado", "error", "cancelado", "rechazado")
+    _abiertas = {}
+
+    def __init__(self, ruta, usar_indice=True):
+        super().__init__(ruta, usar_indice)
+        if self._mapa is not None and self._mapa[:len(self.MAGIA)] != self.MAGIA:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es un archivo de resultados binarios.")
+
+    @staticmethod
+    def _digitos(bits, cantidad):
+        """Carácter que representa cada índice de la tabla de símbolos dentro de la grilla."""
+        if bits == 4:
+            return "0123456789abcdef"[:cantidad]
+        return ''.join(map(chr, range(cantidad)))
+
+    @classmethod
+    def codificar(cls, tablero, nombre="", solver="", estado="resuelto", segundos=0.0, intentos=None):
+        """
+        Bytes del registro de un resultado. La grilla usa 4 bits por celda (dos celdas por
+        byte, la primera en la mitad alta) si la tabla tiene hasta 16 símbolos, 8 si tiene
+        hasta 256 y 16 en otro caso.
+        """
+        filas = len(tablero)
+        cols = len(tablero[0]) if filas else 0
+        texto = ''.join(''.join(fila) for fila in tablero)
+        simbolos = ' ' + ''.join(sorted(set(texto) - {' '}))
+        bits = 4 if len(simbolos) <= 16 else 8 if len(simbolos) <= 256 else 16
+        celdas = texto.translate(dict(zip(map(ord, simbolos), cls._digitos(bits, len(simbolos)))))
+        if bits == 4:
+            grilla = bytes.fromhex(celdas + '0' * (len(celdas) % 2))
+        else:
+            grilla = celdas.encode('latin-1' if bits == 8 else 'utf-16-le')
+        nombre = nombre.encode('utf-8')
+        solver = solver.encode('utf-8')
+        tabla = simbolos.encode('utf-8')
+        largo = cls.CABECERA_REGISTRO.size + len(nombre) + len(solver) + len(tabla) + len(grilla)
+        cabecera = cls.CABECERA_REGISTRO.pack(largo, filas, cols, cls.ESTADOS.index(estado), bits, segundos,
+                                              -1 if intentos is None else intentos, len(nombre), len(solver), len(tabla))
+        return cabecera + nombre + solver + tabla + grilla
+
+    @classmethod
+    def decodificar(cls, datos, posicion=0):
+        """(resultado, posición del siguiente registro) para el registro que empieza en posicion."""
+        (largo, filas, cols, estado, bits, segundos, intentos,
+         largo_nombre, largo_solver, largo_tabla) = cls.CABECERA_REGISTRO.unpack_from(datos, posicion)
+        inicio = posicion + cls.CABECERA_REGISTRO.size
+        nombre = bytes(datos[inicio:inicio + largo_nombre]).decode('utf-8')
+        inicio += largo_nombre
+        solver = bytes(datos[inicio:inicio + largo_solver]).decode('utf-8')
+        inicio += largo_solver
+        simbolos = bytes(datos[inicio:inicio + largo_tabla]).decode('utf-8')
+        inicio += largo_tabla
+        grilla = bytes(datos[inicio:posicion + largo])
+        if bits == 4:
+            celdas = grilla.hex()[:filas * cols]
+        else:
+            celdas = grilla.decode('latin-1' if bits == 8 else 'utf-16-le')
+        celdas = celdas.translate(dict(zip(map(ord, cls._digitos(bits, len(simbolos))), simbolos)))
+        tablero = [list(celdas[i * cols:(i + 1) * cols]) for i in range(filas)]
+        resultado = {"nombre": nombre, "solver": solver, "estado": cls.ESTADOS[estado],
+                     "completa": cls.ESTADOS[estado] == "resuelto", "segundos": segundos,
+                     "intentos": None if intentos < 0 else intentos, "tablero": tablero}
+        return resultado, posicion + largo
+
+    def _leer_en(self, posicion):
+        posicion = max(posicion, len(self.MAGIA))
+        if self._mapa is None or posicion >= len(self._mapa):
+            return None, posicion
+        return self.decodificar(self._mapa, posicion)
+
+    def construir_indice(self):
+        """Posiciones de los registros, saltando de uno al siguiente por su largo sin decodificarlos."""
+        posiciones = []
+        if self._mapa is None:
+            return posiciones
+        posicion = len(self.MAGIA)
+        while posicion < len(self._mapa):
+            posiciones.append(posicion)
+            posicion += struct.unpack_from("<I", self._mapa, posicion)[0]
+        return posiciones
+
+    def texto(self, n):
+        """El resultado n con el formato de texto de NumberLinkBoardIO.guardar_resultado."""
+        resultado = self[n]
+        return NumberLinkBoardIO.texto_resultado(resultado["tablero"], resultado["solver"], resultado["segundos"],
+                                                 resultado["completa"])
+
+    def exportar(self, directorio):
+        """
+        Escribe cada resultado como archivo de texto en directorio, con los nombres que les
+        daría resolver_lote (salida_<entrada>.txt). Devuelve las rutas escritas.
+        """
+        from resolver_lote import NumberLinkBatchSolver
+
+        resultados = list(self)
+        entradas = []
+        for resultado in resultados:
+            ruta, _, n = resultado["nombre"].rpartition('#')
+            entradas.append((ruta, int(n)) if ruta and n.isdigit() else resultado["nombre"])
+        salidas = NumberLinkBatchSolver.nombres_salida(entradas, directorio)
+        for resultado, salida in zip(resultados, salidas):
+            NumberLinkBoardIO.guardar_resultado(resultado["tablero"], salida, resultado["solver"],
+                                                resultado["segundos"], resultado["completa"])
+        return salidas
+
+
+class EscritorResultados:
+    """
+    Agrega resultados al final de un archivo de ResultadosBinarios a través de un buffer
+    grande, de modo que miles de resultados cuestan unas pocas escrituras. Al cerrar
+    actualiza el índice <ruta>.idx con las posiciones previas y las nuevas.
+    """
+
+    TAMANO_BUFFER = 1 << 20
+
+    def __init__(self, ruta, indice=True):
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self.ruta = ruta
+        self.indice = indice
+        self.posiciones = []
+        if os.path.exists(ruta) and os.path.getsize(ruta) > 0:
+            if indice:
+                with ResultadosBinarios(ruta) as existentes:
+                    self.posiciones = list(existentes.indice())
+            self.archivo = open(ruta, 'ab', buffering=self.TAMANO_BUFFER)
+        else:
+            self.archivo = open(ruta, 'wb', buffering=self.TAMANO_BUFFER)
+            self.archivo.write(ResultadosBinarios.MAGIA)
+
+    def agregar(self, tablero, nombre="", solver="", estado="resuelto", segundos=0.0, intentos=None):
+        """Agrega un resultado y devuelve su número dentro del archivo."""
+        self.posiciones.append(self.archivo.tell())
+        self.archivo.write(ResultadosBinarios.codificar(tablero, nombre, solver, estado, segundos, intentos))
+        return len(self.posiciones) - 1
+
+    def cerrar(self):
+        if self.archivo.closed:
+            return
+        self.archivo.close()
+        if self.indice:
+            with ResultadosBinarios(self.ruta, usar_indice=False) as resultados:
+                resultados.guardar_indice(self.posiciones)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+# --- Ejecución principal ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archivos binarios de resultados NumberLink.")
+    ordenes = parser.add_subparsers(dest="orden", required=True)
+    mostrar = ordenes.add_parser("mostrar", help="imprime el resultado n con el formato de texto")
+    mostrar.add_argument("archivo")
+    mostrar.add_argument("n", type=int)
+    exportar = ordenes.add_parser("exportar", help="convierte todos los resultados a archivos de texto")
+    exportar.add_argument("archivo")
+    exportar.add_argument("directorio")
+    args = parser.parse_args()
+
+    try:
+        with ResultadosBinarios(args.archivo) as resultados:
+            if args.orden == "mostrar":
+                print(resultados.texto(args.n))
+            else:
+                print(f"{len(resultados.exportar(args.directorio))} resultados escritos en {args.directorio}")
+    except (OSError, ValueError, IndexError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
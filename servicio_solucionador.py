@@ -0,0 +1,389 @@
+# servicio_solucionador.py
+# Descripción: Servicio local de larga duración que resuelve tableros NumberLink pedidos en JSON por línea
+
+import argparse
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from cache_soluciones import CacheSoluciones
+from numberlink_heuristica import NumberLinkHeuristicSolver
+from resolver_lote import NumberLinkBatchSolver
+from verificar_tablero import NumberLinkVerifier
+
+
+class AvisoRanura:
+    """Aviso de detención de una ranura de ejecución: imita Event.is_set() sobre un arreglo compartido."""
+
+    def __init__(self, banderas, ranura):
+        self.banderas = banderas
+        self.ranura = ranura
+
+    def is_set(self):
+        return bool(self.banderas[self.ranura])
+
+
+class NumberLinkService:
+    """
+    Mantiene procesos trabajadores ya iniciados y atiende solicitudes JSON de una línea por
+    entrada/salida estándar, por TCP en localhost o por un socket Unix. Las respuestas se
+    escriben en cuanto terminan (no necesariamente en orden) y llevan el id de la solicitud.
+
+    Solicitudes (op por defecto "resolver"):
+      {"id": 1, "tablero": ["1  2", ...]} o {"id": 1, "ruta": "tablero.txt"}, con "tiempo"
+        (plazo en segundos desde la llegada, contando la espera en cola), "metodo" y
+        "opciones" (argumentos del solucionador, por ejemplo {"motor": "bits"}).
+      {"op": "cancelar", "id": 1}: quita la solicitud de la cola o detiene su resolución.
+      {"op": "metricas"}: profundidad de la cola, solicitudes en curso, conteos por estado y
+        percentiles de espera y de latencia total.
+
+    A lo sumo max_concurrentes solicitudes (sin superar procesos) se resuelven a la vez, una
+    por ranura; el resto espera en cola, y con max_cola solicitudes esperando las nuevas se
+    rechazan. Cada ranura tiene su propio proceso trabajador y una bandera compartida que el
+    solucionador revisa entre nodos y mientras enumera rutas como su aviso de detención, así
+    que cancelar o vencer el plazo normalmente no exige matar al proceso. Si aun así no
+    termina MARGEN_PLAZO segundos después del plazo y otros tantos después del aviso, su
+    proceso se termina y la ranura arranca uno nuevo, de modo que un tablero difícil no
+    bloquea al servicio.
+    """
+
+    MAX_COLA = 1000
+    TIEMPO_MAX = 60.0
+    MARGEN_PLAZO = 1.0
+    MAX_LATENCIAS = 10000
+    _banderas = None
+
+    def __init__(self, procesos=None, max_concurrentes=None, max_cola=None, tiempo_max=None,
+                 metodo="backtracking", opciones=None, cache=None):
+        if metodo not in NumberLinkBatchSolver.METODOS:
+            raise ValueError(f"Método desconocido: {metodo}. Opciones: {', '.join(NumberLinkBatchSolver.METODOS)}")
+        self.procesos = procesos or os.cpu_count() or 1
+        self.max_concurrentes = min(max_concurrentes or self.procesos, self.procesos)
+        self.max_cola = max_cola if max_cola is not None else self.MAX_COLA
+        self.tiempo_max = tiempo_max if tiempo_max is not None else self.TIEMPO_MAX
+        self.metodo = metodo
+        self.opciones = opciones or {}
+        self.cache = cache
+        self.ejecutores = []
+        self.pids = []
+        self.reciclados = 0
+        self.anonimas = 0
+        self.banderas = None
+        self.ranuras_libres = None
+        self.cupos = None
+        self.solicitudes = {}
+        self.en_cola = 0
+        self.en_curso = 0
+        self.por_estado = {}
+        self.esperas = deque(maxlen=self.MAX_LATENCIAS)
+        self.latencias = deque(maxlen=self.MAX_LATENCIAS)
+        self.inicio = time.perf_counter()
+
+    @classmethod
+    def _iniciar_trabajador(cls, banderas):
+        """Inicializador de cada proceso: guarda las banderas de detención de las ranuras."""
+        cls._banderas = banderas
+
+    @staticmethod
+    def _precalentar():
+        return os.getpid()
+
+    @classmethod
+    def _resolver_en_trabajador(cls, tablero, metodo, tiempo_max, opciones, ranura, cache):
+        """Resuelve y verifica un tablero en un proceso trabajador, atento a la bandera de su ranura."""
+        NumberLinkHeuristicSolver._detener = AvisoRanura(cls._banderas, ranura)
+        inicio = time.perf_counter()
+        soluciones = CacheSoluciones.abrir(cache) if cache else None
+        encontrado = soluciones.buscar(tablero) if soluciones is not None else None
+        estadisticas = {}
+        if encontrado is not None:
+            solucion, completa = encontrado
+        else:
+            resolver = getattr(NumberLinkHeuristicSolver, NumberLinkBatchSolver.METODOS[metodo][0])
+            solucion, completa = resolver(tablero, verbose=False, tiempo_max=tiempo_max, estadisticas=estadisticas,
+                                          **opciones)
+        verificada = completa and NumberLinkVerifier.diagnosticar(solucion)["valido"]
+        if soluciones is not None and encontrado is None and (verificada or not completa):
+            soluciones.registrar(tablero, solucion, completa, estadisticas)
+        motivo = "resuelto" if completa else estadisticas.get("motivo", "sin_solucion")
+        return {"motivo": motivo, "completa": completa, "verificada": verificada, "cache": encontrado is not None,
+                "segundos": time.perf_counter() - inicio, "intentos": estadisticas.get("intentos"),
+                "tablero": [''.join(fila) for fila in solucion]}
+
+    async def iniciar(self):
+        """Arranca el proceso de cada ranura antes de aceptar solicitudes."""
+        self.banderas = multiprocessing.get_context().Array('b', self.max_concurrentes, lock=False)
+        self.ranuras_libres = list(range(self.max_concurrentes))
+        self.cupos = asyncio.Semaphore(self.max_concurrentes)
+        self.ejecutores = [None] * self.max_concurrentes
+        self.pids = [None] * self.max_concurrentes
+        await asyncio.gather(*(self._arrancar_ranura(ranura) for ranura in range(self.max_concurrentes)))
+
+    async def _arrancar_ranura(self, ranura):
+        """Crea el proceso trabajador de una ranura, espera a que esté listo y guarda su pid."""
+        self.ejecutores[ranura] = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context(),
+                                                      initializer=self._iniciar_trabajador, initargs=(self.banderas,))
+        self.pids[ranura] = await asyncio.get_running_loop().run_in_executor(self.ejecutores[ranura], self._precalentar)
+
+    async def _reciclar_ranura(self, ranura):
+        """Termina el proceso de una ranura que no responde (o que murió) y arranca uno nuevo."""
+        try:
+            os.kill(self.pids[ranura], signal.SIGTERM)
+        except (OSError, TypeError):
+            pass
+        self.ejecutores[ranura].shutdown(wait=False, cancel_futures=True)
+        self.reciclados += 1
+        await self._arrancar_ranura(ranura)
+
+    async def cerrar(self):
+        """Espera las solicitudes pendientes y cierra los procesos."""
+        pendientes = [tarea for tarea, _ in self.solicitudes.values()]
+        if pendientes:
+            await asyncio.gather(*pendientes, return_exceptions=True)
+        for ejecutor in self.ejecutores:
+            if ejecutor is not None:
+                ejecutor.shutdown()
+        self.ejecutores = []
+
+    def metricas(self):
+        """Profundidad de cola, solicitudes en curso, conteos por estado y percentiles de espera y latencia."""
+        datos = {"en_cola": self.en_cola, "en_curso": self.en_curso, "max_concurrentes": self.max_concurrentes,
+                 "procesos": self.procesos, "reciclados": self.reciclados, "atendidas": sum(self.por_estado.values()),
+                 "por_estado": dict(self.por_estado), "activo_segundos": round(time.perf_counter() - self.inicio, 3)}
+        for nombre, valores in (("espera", self.esperas), ("latencia", self.latencias)):
+            datos[nombre] = {f"p{p}": round(NumberLinkBatchSolver.percentil(valores, p), 6)
+                             for p in NumberLinkBatchSolver.PERCENTILES}
+            datos[nombre]["max"] = round(max(valores), 6) if valores else 0.0
+        return datos
+
+    async def atender(self, solicitud, responder):
+        """Despacha una solicitud ya decodificada; responder es una corrutina que recibe el dict de respuesta."""
+        op = solicitud.get("op", "resolver")
+        if op == "metricas":
+            await responder({"id": solicitud.get("id"), "op": "metricas", "metricas": self.metricas()})
+        elif op == "cancelar":
+            await responder({"id": solicitud.get("id"), "op": "cancelar", "cancelada": self.cancelar(solicitud.get("id"))})
+        elif op == "resolver":
+            ident = solicitud.get("id")
+            if ident is None:
+                # Sin id no se puede cancelar ni confundir con otra: se lleva con una clave propia.
+                self.anonimas += 1
+                clave = ("sin id", self.anonimas)
+            else:
+                clave = ident
+            if clave in self.solicitudes:
+                await responder({"id": ident, "estado": "error", "error": "ya hay una solicitud en curso con ese id"})
+            elif self.en_cola >= self.max_cola:
+                await self._terminar(ident, {"estado": "rechazado", "error": "cola llena"}, responder, time.perf_counter())
+            else:
+                llegada = time.perf_counter()
+                tarea = asyncio.create_task(self._resolver(solicitud, clave, responder, llegada))
+                tarea.add_done_callback(functools.partial(self._al_cancelar, clave, responder, llegada))
+                self.solicitudes[clave] = (tarea, None)
+        else:
+            await responder({"id": solicitud.get("id"), "estado": "error", "error": f"operación desconocida: {op}"})
+
+    def cancelar(self, ident):
+        """Cancela una solicitud en cola o detiene la que se está resolviendo; False si no existe."""
+        if ident is None or ident not in self.solicitudes:
+            return False
+        tarea, ranura = self.solicitudes[ident]
+        if ranura is None:
+            tarea.cancel()
+        else:
+            self.banderas[ranura] = 1
+        return True
+
+    def _al_cancelar(self, clave, responder, llegada, tarea):
+        """Responde "cancelado" por una solicitud cancelada mientras esperaba (incluso antes de empezar)."""
+        if tarea.cancelled():
+            self.solicitudes.pop(clave, None)
+            ident = None if isinstance(clave, tuple) else clave
+            asyncio.ensure_future(self._terminar(ident, {"estado": "cancelado"}, responder, llegada))
+
+    async def _terminar(self, ident, respuesta, responder, llegada):
+        latencia = time.perf_counter() - llegada
+        self.latencias.append(latencia)
+        self.por_estado[respuesta["estado"]] = self.por_estado.get(respuesta["estado"], 0) + 1
+        respuesta = {"id": ident, **respuesta, "total": round(latencia, 6)}
+        await responder(respuesta)
+
+    async def _resolver(self, solicitud, clave, responder, llegada):
+        """Espera una ranura libre, resuelve en su proceso respetando el plazo y responde."""
+        ident = solicitud.get("id")
+        try:
+            tiempo = solicitud.get("tiempo", self.tiempo_max)
+            if isinstance(tiempo, bool) or not isinstance(tiempo, (int, float)) or not tiempo > 0:
+                raise ValueError(f"tiempo debe ser un número de segundos mayor que cero: {tiempo!r}")
+            plazo = llegada + tiempo
+            metodo = solicitud.get("metodo", self.metodo)
+            if metodo not in NumberLinkBatchSolver.METODOS:
+                raise ValueError(f"método desconocido: {metodo}")
+            if "tablero" in solicitud:
+                tablero = [list(fila) for fila in solicitud["tablero"]]
+            else:
+                tablero = NumberLinkBatchSolver.leer_entrada(solicitud["ruta"])
+            opciones = {**self.opciones, **solicitud.get("opciones", {})}
+        except Exception as e:
+            self.solicitudes.pop(clave, None)
+            await self._terminar(ident, {"estado": "error", "error": str(e)}, responder, llegada)
+            return
+
+        self.en_cola += 1
+        try:
+            await self.cupos.acquire()
+        finally:
+            self.en_cola -= 1
+        espera = time.perf_counter() - llegada
+        self.esperas.append(espera)
+
+        ranura = self.ranuras_libres.pop()
+        self.banderas[ranura] = 0
+        self.solicitudes[clave] = (self.solicitudes[clave][0], ranura)
+        self.en_curso += 1
+        try:
+            restante = plazo - time.perf_counter()
+            if restante <= 0:
+                respuesta = {"estado": "tiempo agotado", "completa": False}
+            else:
+                futuro = asyncio.get_running_loop().run_in_executor(
+                    self.ejecutores[ranura], self._resolver_en_trabajador, tablero, metodo, restante, opciones, ranura,
+                    self.cache)
+                try:
+                    resultado = await asyncio.wait_for(asyncio.shield(futuro), restante + self.MARGEN_PLAZO)
+                    respuesta = self._respuesta(resultado)
+                except asyncio.TimeoutError:
+                    # El solucionador no alcanzó a revisar su plazo: se le avisa y se responde ya.
+                    self.banderas[ranura] = 1
+                    await self._terminar(ident, {"estado": "tiempo agotado", "completa": False,
+                                                 "espera": round(espera, 6)}, responder, llegada)
+                    responder = None
+                    try:
+                        await asyncio.wait_for(asyncio.shield(futuro), self.MARGEN_PLAZO)
+                    except asyncio.TimeoutError:
+                        # Tampoco atendió el aviso: se termina su proceso para liberar la ranura.
+                        await self._reciclar_ranura(ranura)
+                        await asyncio.gather(futuro, return_exceptions=True)
+        except BrokenProcessPool as e:
+            await self._reciclar_ranura(ranura)
+            respuesta = {"estado": "error", "error": f"el proceso trabajador terminó inesperadamente: {e}"}
+        except Exception as e:
+            respuesta = {"estado": "error", "error": str(e)}
+        finally:
+            self.en_curso -= 1
+            self.ranuras_libres.append(ranura)
+            self.cupos.release()
+            self.solicitudes.pop(clave, None)
+        if responder is not None:
+            respuesta["espera"] = round(espera, 6)
+            await self._terminar(ident, respuesta, responder, llegada)
+
+    @staticmethod
+    def _respuesta(resultado):
+        """Respuesta de una resolución terminada, con los mismos estados que resolver_lote."""
+        motivo = resultado["motivo"]
+        if resultado["completa"]:
+            estado = "resuelto"
+        elif motivo == "detenido":
+            estado = "cancelado"
+        elif motivo == "tiempo":
+            estado = "tiempo agotado"
+        else:
+            estado = "sin solución"
+        return {"estado": estado, "completa": resultado["completa"], "verificada": resultado["verificada"],
+                "cache": resultado["cache"], "segundos": round(resultado["segundos"], 6),
+                "intentos": resultado["intentos"], "tablero": resultado["tablero"]}
+
+    async def _atender_linea(self, linea, responder):
+        linea = linea.strip()
+        if not linea:
+            return
+        try:
+            solicitud = json.loads(linea)
+            if not isinstance(solicitud, dict):
+                raise ValueError("se esperaba un objeto JSON")
+        except ValueError as e:
+            await responder({"id": None, "estado": "error", "error": f"solicitud inválida: {e}"})
+            return
+        await self.atender(solicitud, responder)
+
+    async def servir_stdio(self):
+        """Lee solicitudes de la entrada estándar hasta EOF y escribe las respuestas en la salida estándar."""
+        async def responder(respuesta):
+            sys.stdout.write(json.dumps(respuesta, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+
+        loop = asyncio.get_running_loop()
+        while True:
+            linea = await loop.run_in_executor(None, sys.stdin.readline)
+            if not linea:
+                break
+            await self._atender_linea(linea, responder)
+        await self.cerrar()
+
+    async def _conexion(self, lector, escritor):
+        async def responder(respuesta):
+            if not escritor.is_closing():
+                escritor.write((json.dumps(respuesta, ensure_ascii=False) + "\n").encode('utf-8'))
+                await escritor.drain()
+
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                await self._atender_linea(linea.decode('utf-8'), responder)
+        except ConnectionError:
+            pass
+
+    async def servir_socket(self, puerto=None, ruta_socket=None):
+        """Atiende conexiones por TCP en 127.0.0.1:puerto o por el socket Unix ruta_socket, hasta ser interrumpido."""
+        if ruta_socket is not None:
+            servidor = await asyncio.start_unix_server(self._conexion, path=ruta_socket)
+        else:
+            servidor = await asyncio.start_server(self._conexion, host="127.0.0.1", port=puerto)
+        direccion = ruta_socket or "127.0.0.1:{}".format(servidor.sockets[0].getsockname()[1])
+        print(f"Servicio NumberLink escuchando en {direccion} con {self.procesos} procesos", file=sys.stderr, flush=True)
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            await self.cerrar()
+
+    async def ejecutar(self, puerto=None, ruta_socket=None):
+        await self.iniciar()
+        if puerto is None and ruta_socket is None:
+            await self.servir_stdio()
+        else:
+            await self.servir_socket(puerto, ruta_socket)
+
+
+# --- Ejecución principal ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio local que resuelve tableros NumberLink (JSON por línea).")
+    parser.add_argument("--puerto", type=int, default=None, help="escucha por TCP en 127.0.0.1 (por defecto, stdin/stdout)")
+    parser.add_argument("--socket", default=None, help="escucha en un socket Unix en esta ruta")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos trabajadores (por defecto uno por núcleo)")
+    parser.add_argument("--concurrentes", type=int, default=None,
+                        help="resoluciones simultáneas (por defecto y como máximo --procesos)")
+    parser.add_argument("--max-cola", type=int, default=NumberLinkService.MAX_COLA, help="solicitudes en espera antes de rechazar")
+    parser.add_argument("--tiempo", type=float, default=NumberLinkService.TIEMPO_MAX, help="plazo por defecto en segundos")
+    parser.add_argument("--metodo", choices=sorted(NumberLinkBatchSolver.METODOS), default="backtracking")
+    parser.add_argument("--motor", choices=NumberLinkHeuristicSolver.MOTORES, default=None)
+    parser.add_argument("--cache", default=None, help="archivo SQLite de soluciones conocidas")
+    args = parser.parse_args()
+
+    servicio = NumberLinkService(args.procesos, args.concurrentes, args.max_cola, args.tiempo, args.metodo,
+                                 {"motor": args.motor} if args.motor else {}, args.cache)
+    try:
+        asyncio.run(servicio.ejecutar(args.puerto, args.socket))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,204 @@
+# tablero_bits.py
+# Descripción: Representación de tableros NumberLink con máscaras de bits (bitboards)
+
+class TableroBits:
+    """
+    Motor de tablero alternativo basado en enteros usados como máscaras de bits.
+    La celda (fila, col) corresponde al bit fila * cols + col. Se guardan como máscaras
+    las celdas libres, las celdas fijas de cada símbolo (extremos originales), las celdas
+    pintadas por cada par y el conjunto de extremos. Marcar caminos, contar vecinos libres
+    e inundar componentes se reducen a desplazamientos y operaciones AND/OR sobre enteros.
+    """
+
+    def __init__(self, filas, cols):
+        self.filas = filas
+        self.cols = cols
+        self.todo = (1 << (filas * cols)) - 1
+        col_izq = 0
+        for fila in range(filas):
+            col_izq |= 1 << (fila * cols)
+        col_der = col_izq << (cols - 1) if cols > 0 else 0
+        self.sin_col_izq = self.todo & ~col_izq
+        self.sin_col_der = self.todo & ~col_der
+        self.libres = 0
+        self.extremos = 0
+        self.fijos = {}
+        self.pintados = {}
+
+    @classmethod
+    def desde_tablero(cls, tablero):
+        """Construye el bitboard a partir de una lista de listas de caracteres."""
+        filas = len(tablero)
+        cols = len(tablero[0]) if filas > 0 else 0
+        bits = cls(filas, cols)
+        for i in range(filas):
+            for j in range(cols):
+                celda = tablero[i][j]
+                b = 1 << (i * cols + j)
+                if celda == ' ':
+                    bits.libres |= b
+                else:
+                    bits.fijos[celda] = bits.fijos.get(celda, 0) | b
+                    bits.extremos |= b
+        return bits
+
+    def copiar(self):
+        """Devuelve una copia independiente del bitboard."""
+        otro = TableroBits.__new__(TableroBits)
+        otro.__dict__.update(self.__dict__)
+        otro.fijos = dict(self.fijos)
+        otro.pintados = dict(self.pintados)
+        return otro
+
+    def a_tablero(self):
+        """Reconstruye la lista de listas de caracteres equivalente."""
+        tablero = [[' '] * self.cols for _ in range(self.filas)]
+        for simbolo, mascara in self.fijos.items():
+            for i, j in self.posiciones(mascara):
+                tablero[i][j] = simbolo
+        for numero, mascara in self.pintados.items():
+            for i, j in self.posiciones(mascara):
+                tablero[i][j] = numero.lower()
+        return tablero
+
+    def indice(self, pos):
+        """Índice de bit de una posición (fila, col)."""
+        return pos[0] * self.cols + pos[1]
+
+    def bit(self, pos):
+        """Máscara con un único bit encendido en la posición dada."""
+        return 1 << (pos[0] * self.cols + pos[1])
+
+    def posiciones(self, mascara):
+        """Itera las posiciones (fila, col) de los bits encendidos, de menor a mayor índice."""
+        while mascara:
+            b = mascara & -mascara
+            yield divmod(b.bit_length() - 1, self.cols)
+            mascara ^= b
+
+    def mascara_camino(self, camino):
+        """Máscara de las celdas interiores de un camino de índices de celda (sin sus extremos)."""
+        mascara = 0
+        for indice in camino[1:-1]:
+            mascara |= 1 << indice
+        return mascara
+
+    def mascara_extremos(self, pares):
+        """Máscara con los extremos de una lista de pares (numero, p1, p2)."""
+        mascara = 0
+        for _, p1, p2 in pares:
+            mascara |= self.bit(p1) | self.bit(p2)
+        return mascara
+
+    def color(self, numero):
+        """Todas las celdas que ocupa un símbolo: extremos fijos más celdas pintadas."""
+        return self.fijos.get(numero, 0) | self.pintados.get(numero, 0)
+
+    def vecinos(self, mascara):
+        """Máscara con los vecinos ortogonales de todas las celdas de la máscara."""
+        return (((mascara << 1) & self.sin_col_izq) |
+                ((mascara >> 1) & self.sin_col_der) |
+                ((mascara << self.cols) & self.todo) |
+                (mascara >> self.cols))
+
+    def al_menos_dos_vecinos(self, transitables):
+        """Celdas con dos o más vecinos dentro de la máscara de transitables."""
+        arriba = (transitables << self.cols) & self.todo
+        abajo = transitables >> self.cols
+        izquierda = (transitables << 1) & self.sin_col_izq
+        derecha = (transitables >> 1) & self.sin_col_der
+        return ((arriba | abajo) & (izquierda | derecha)) | (arriba & abajo) | (izquierda & derecha)
+
+    def inundar(self, semilla, permitidas):
+        """Expande la semilla dentro de las celdas permitidas hasta cerrar la componente."""
+        region = semilla
+        while True:
+            nueva = region | (self.vecinos(region) & permitidas)
+            if nueva == region:
+                return region
+            region = nueva
+
+    def pintar(self, mascara, numero):
+        """Asigna celdas libres a un símbolo."""
+        self.libres &= ~mascara
+        self.pintados[numero] = self.pintados.get(numero, 0) | mascara
+
+    def borrar(self, mascara, numero):
+        """Devuelve a libres celdas pintadas de un símbolo."""
+        self.libres |= mascara
+        self.pintados[numero] = self.pintados.get(numero, 0) & ~mascara
+
+    def marcar_camino(self, camino, numero):
+        """Pinta el camino salvo en los extremos y lo retira de las celdas libres."""
+        mascara = self.mascara_camino(camino)
+        self.pintar(mascara, numero)
+        return mascara
+
+    def desmarcar_camino(self, camino, numero):
+        """Borra un camino previamente pintado y devuelve sus celdas a libres."""
+        mascara = self.mascara_camino(camino)
+        self.borrar(mascara, numero)
+        return mascara
+
+    def extender_par(self, numero, pintadas, par_nuevo=None):
+        """Pinta las celdas de una extensión forzada; los extremos viajan en la lista de pares."""
+        self.pintar(pintadas, numero)
+
+    def retraer_par(self, numero, pintadas):
+        """Revierte una extensión hecha con extender_par."""
+        self.borrar(pintadas, numero)
+
+    def detectar_cuellos(self, pares_restantes):
+        """Detecta celdas libres de grado 0/1 (no extremos) que anulan la solución."""
+        if not pares_restantes:
+            return False
+        transitables = self.libres | self.mascara_extremos(pares_restantes)
+        return bool(self.libres & ~self.al_menos_dos_vecinos(transitables))
+
+    def analizar_componentes(self, pares_restantes):
+        """Valida componentes: paridad de extremos y conectividad de cada par."""
+        if not pares_restantes:
+            return True
+
+        extremos = self.mascara_extremos(pares_restantes)
+        transitables = self.libres | extremos
+        pendientes = transitables
+
+        while pendientes:
+            componente = self.inundar(pendientes & -pendientes, transitables)
+            pendientes &= ~componente
+            extremos_comp = (componente & extremos).bit_count()
+            if extremos_comp == 0 and componente & self.libres:
+                return False
+            if extremos_comp % 2 == 1:
+                return False
+            for _, p1, p2 in pares_restantes:
+                if bool(componente & self.bit(p1)) != bool(componente & self.bit(p2)):
+                    return False
+
+        return True
+
+    def existe_camino_basico(self, inicio, fin):
+        """Comprueba conectividad simple entre dos extremos inundando por celdas libres."""
+        objetivo = self.bit(fin)
+        permitidas = self.libres | objetivo
+        region = self.bit(inicio)
+        while not region & objetivo:
+            nueva = region | (self.vecinos(region) & permitidas)
+            if nueva == region:
+                return False
+            region = nueva
+        return True
+
+    def hay_camino_para_pares(self, pares, limite=None):
+        """Valida que cada par pendiente conserve al menos un camino alcanzable."""
+        for _, pos1, pos2 in pares[:limite]:
+            if not self.existe_camino_basico(pos1, pos2):
+                return False
+        return True
+
+    def es_viable(self, pares_restantes, limite=None):
+        """Aplica las tres podas (cuellos, componentes y conectividad) sobre el bitboard."""
+        return (not self.detectar_cuellos(pares_restantes) and
+                self.analizar_componentes(pares_restantes) and
+                self.hay_camino_para_pares(pares_restantes, limite))
@@ -0,0 +1,123 @@
+# telemetria.py
+# Descripción: Instrumentación opcional de la búsqueda (contadores, tiempos por poda y eventos de progreso JSON-lines)
+
+import json
+import time
+
+
+class Telemetria:
+    """
+    Recolecta, mientras dura una resolución, nodos por profundidad, podas por motivo, tiempo
+    acumulado y número de llamadas de cada etapa (conteo y generación de rutas, propagación y
+    cada poda) e hijos explorados por nodo para calcular el factor de ramificación.
+
+    Se activa pasando una instancia a los resolvedores (telemetria=...); sin ella la búsqueda
+    no hace ningún trabajo extra. Si se entrega un flujo (por ejemplo sys.stderr o un archivo
+    abierto) se escribe un evento JSON por línea: "inicio", "progreso" cada intervalo segundos
+    (revisado cada cada_nodos nodos y, mientras se enumeran rutas, en cada revisión de los
+    generadores, con enumerando=True) y "fin" con el resumen.
+    """
+
+    def __init__(self, flujo=None, intervalo=1.0, cada_nodos=64):
+        self.flujo = flujo
+        self.intervalo = intervalo
+        self.cada_nodos = cada_nodos
+        self.inicio = time.perf_counter()
+        self.ultimo_evento = self.inicio
+        self.nodos = 0
+        self.pasos_enumeracion = 0
+        self.profundidad_max = 0
+        self.nodos_por_profundidad = {}
+        self.hijos_por_profundidad = {}
+        self.ramificados_por_profundidad = {}
+        self.podas = {}
+        self.tiempos = {}
+        self.llamadas = {}
+        self.resultado = None
+
+    def nodo(self, profundidad, pares_restantes):
+        """Registra la visita a un nodo y emite un evento de progreso si corresponde."""
+        self.nodos += 1
+        self.nodos_por_profundidad[profundidad] = self.nodos_por_profundidad.get(profundidad, 0) + 1
+        if profundidad > self.profundidad_max:
+            self.profundidad_max = profundidad
+        if self.flujo is not None and self.nodos % self.cada_nodos == 0:
+            ahora = time.perf_counter()
+            if ahora - self.ultimo_evento >= self.intervalo:
+                self.ultimo_evento = ahora
+                self.emitir("progreso", nodos=self.nodos,
+                            nodos_por_segundo=round(self.nodos / (ahora - self.inicio), 1),
+                            profundidad=profundidad, profundidad_max=self.profundidad_max,
+                            pares_restantes=pares_restantes, podas=dict(self.podas))
+
+    def enumeracion(self, pasos):
+        """
+        Registra pasos de los generadores de rutas (llamado desde su revisión periódica) y
+        emite un evento de progreso si corresponde, para que una enumeración larga entre dos
+        nodos también se vea en el flujo.
+        """
+        self.pasos_enumeracion += pasos
+        if self.flujo is None:
+            return
+        ahora = time.perf_counter()
+        if ahora - self.ultimo_evento >= self.intervalo:
+            self.ultimo_evento = ahora
+            self.emitir("progreso", nodos=self.nodos,
+                        nodos_por_segundo=round(self.nodos / (ahora - self.inicio), 1),
+                        profundidad_max=self.profundidad_max, podas=dict(self.podas),
+                        enumerando=True, pasos_enumeracion=self.pasos_enumeracion)
+
+    def poda(self, motivo, cantidad=1):
+        """Cuenta nodos o ramas descartadas por el motivo dado (una, o cantidad de una vez)."""
+        self.podas[motivo] = self.podas.get(motivo, 0) + cantidad
+
+    def medir(self, etapa, segundos):
+        """Acumula el tiempo de una llamada a una etapa de la búsqueda."""
+        self.tiempos[etapa] = self.tiempos.get(etapa, 0.0) + segundos
+        self.llamadas[etapa] = self.llamadas.get(etapa, 0) + 1
+
+    def ramificacion(self, profundidad, hijos):
+        """Registra cuántos hijos viables se exploraron desde un nodo que ramificó."""
+        self.hijos_por_profundidad[profundidad] = self.hijos_por_profundidad.get(profundidad, 0) + hijos
+        self.ramificados_por_profundidad[profundidad] = self.ramificados_por_profundidad.get(profundidad, 0) + 1
+
+    def emitir(self, evento, **datos):
+        """Escribe un evento como una línea JSON en el flujo (si hay uno)."""
+        if self.flujo is None:
+            return
+        registro = {"evento": evento, "t": round(time.perf_counter() - self.inicio, 3)}
+        registro.update(datos)
+        self.flujo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        self.flujo.flush()
+
+    def resumen(self, contexto=None):
+        """Dict con todos los contadores; con el contexto agrega las tasas de acierto de las cachés."""
+        hijos = sum(self.hijos_por_profundidad.values())
+        ramificados = sum(self.ramificados_por_profundidad.values())
+        datos = {
+            "nodos": self.nodos,
+            "pasos_enumeracion": self.pasos_enumeracion,
+            "segundos": round(time.perf_counter() - self.inicio, 6),
+            "profundidad_max": self.profundidad_max,
+            "nodos_por_profundidad": {str(p): n for p, n in sorted(self.nodos_por_profundidad.items())},
+            "podas": dict(self.podas),
+            "tiempos": {etapa: round(segundos, 6) for etapa, segundos in self.tiempos.items()},
+            "llamadas": dict(self.llamadas),
+            "ramificacion_media": hijos / ramificados if ramificados else 0.0,
+            "ramificacion_por_profundidad": {
+                str(p): self.hijos_por_profundidad.get(p, 0) / n
+                for p, n in sorted(self.ramificados_por_profundidad.items())
+            },
+        }
+        if contexto is not None:
+            for nombre in ("memo", "fallos", "regiones_fallidas"):
+                cache = getattr(contexto, nombre, None)
+                if cache is not None:
+                    datos[f"cache_{nombre}"] = cache.estadisticas()
+        return datos
+
+    def finalizar(self, contexto, completa):
+        """Cierra la medición: guarda el resumen en resultado y emite el evento "fin"."""
+        self.resultado = self.resumen(contexto)
+        self.emitir("fin", completa=completa, **self.resultado)
+        return self.resultado
@@ -1,12 +1,28 @@
 from collections import deque
+import os
 import sys
 from leer_tablero import NumberLinkBoardIO
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class NumberLinkVerifier:
     """Valida la estructura y conectividad de rutas en un tablero NumberLink."""
 
     DIRECCIONES = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    MENSAJES = {
+        "celdas": "Ruta '{simbolo}' no tiene suficientes celdas.",
+        "extremos": "Ruta '{simbolo}' tiene {extremos} extremos. Debe tener 2.",
+        "interseccion": "Ruta '{simbolo}' tiene intersecciones (grado > 2).",
+        "interrumpida": "La ruta '{simbolo}' está interrumpida o no forma un camino continuo.",
+        None: "El tablero es válido.",
+    }
+    # Orden de las comprobaciones por símbolo; la primera que falla es la que se informa.
+    MOTIVOS = ("celdas", "extremos", "interseccion", "interrumpida")
+    MIN_LOTE_VECTORIAL = 8
 
     @staticmethod
     def obtener_rutas(tablero):
@@ -54,45 +70,194 @@ class NumberLinkVerifier:
         return len(visitado) == len(posiciones)
 
     @classmethod
-    def verificar_tablero(cls, tablero):
-        """Valida grados, extremos y continuidad de cada ruta en el tablero."""
+    def informe(cls, motivo=None, simbolo=None, extremos=None):
+        """
+        Resultado estructurado de una verificación: valido, motivo (None o uno de MOTIVOS),
+        simbolo de la primera ruta que falla, extremos (solo para "extremos") y el mensaje
+        que imprime verificar_tablero.
+        """
+        return {"valido": motivo is None, "motivo": motivo, "simbolo": simbolo, "extremos": extremos,
+                "mensaje": cls.MENSAJES[motivo].format(simbolo=simbolo, extremos=extremos)}
+
+    @classmethod
+    def diagnosticar(cls, tablero):
+        """Valida grados, extremos y continuidad de cada ruta y devuelve el informe, sin imprimir."""
         rutas = cls.obtener_rutas(tablero)
 
         for simbolo, posiciones in rutas.items():
             if len(posiciones) < 2:
-                print(f"Ruta '{simbolo}' no tiene suficientes celdas.")
-                return False
+                return cls.informe("celdas", simbolo)
 
             grados = [cls.grado(tablero, i, j) for (i, j) in posiciones]
             extremos = sum(1 for g in grados if g == 1)
 
             if extremos != 2:
-                print(f"Ruta '{simbolo}' tiene {extremos} extremos. Debe tener 2.")
-                return False
+                return cls.informe("extremos", simbolo, extremos)
 
             if any(g > 2 for g in grados):
-                print(f"Ruta '{simbolo}' tiene intersecciones (grado > 2).")
-                return False
+                return cls.informe("interseccion", simbolo)
 
             if not cls.ruta_conectada(tablero, simbolo, posiciones):
-                print(f"La ruta '{simbolo}' está interrumpida o no forma un camino continuo.")
-                return False
+                return cls.informe("interrumpida", simbolo)
+
+        return cls.informe()
 
-        print("El tablero es válido.")
-        return True
+    @classmethod
+    def verificar_tablero(cls, tablero):
+        """Valida grados, extremos y continuidad de cada ruta en el tablero."""
+        resultado = cls.diagnosticar(tablero)
+        print(resultado["mensaje"])
+        return resultado["valido"]
+
+    @classmethod
+    def verificar_lote(cls, tableros):
+        """
+        Informes (los de diagnosticar, en el mismo orden) de muchos tableros a la vez. Con
+        NumPy los tableros de igual tamaño se verifican juntos con operaciones sobre arreglos;
+        sin NumPy, o con menos de MIN_LOTE_VECTORIAL tableros de un tamaño, uno por uno.
+        """
+        tableros = list(tableros)
+        informes = [None] * len(tableros)
+        grupos = {}
+        for k, tablero in enumerate(tableros):
+            filas = len(tablero)
+            cols = len(tablero[0]) if filas else 0
+            if np is None or filas * cols == 0 or any(len(fila) != cols for fila in tablero):
+                informes[k] = cls.diagnosticar(tablero)
+            else:
+                grupos.setdefault((filas, cols), []).append(k)
+
+        for (filas, cols), indices in grupos.items():
+            if len(indices) < cls.MIN_LOTE_VECTORIAL:
+                for k in indices:
+                    informes[k] = cls.diagnosticar(tableros[k])
+                continue
+            for k, resultado in zip(indices, cls._verificar_grupo([tableros[k] for k in indices], filas, cols)):
+                informes[k] = resultado
+        return informes
+
+    @classmethod
+    def _verificar_grupo(cls, tableros, filas, cols):
+        """
+        Verifica tableros de filas x cols con NumPy. Cada par (tablero, símbolo) recibe un
+        identificador; los grados salen de comparar el arreglo de identificadores con sus
+        corrimientos y la continuidad de recorrer a la vez, paso a paso, todas las rutas.
+        """
+        lote = len(tableros)
+        texto = ''.join(''.join(fila) for tablero in tableros for fila in tablero)
+        codigos = np.frombuffer(texto.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+        tablero_de = np.repeat(np.arange(lote, dtype=np.int64), filas * cols)
+        ocupada = (codigos != ord(' ')) & (codigos != ord('.'))
+        posiciones = np.flatnonzero(ocupada)
+
+        claves = (tablero_de[posiciones] << 32) | codigos[posiciones]
+        unicos, primera, inversa = np.unique(claves, return_index=True, return_inverse=True)
+        simbolos = len(unicos)
+        ids = np.full(codigos.shape, -1, dtype=np.int64)
+        ids[posiciones] = inversa.reshape(-1)
+        ids = ids.reshape(lote, filas, cols)
+
+        # Grado: vecinos con el mismo identificador (las celdas vacías tienen -1 y no cuentan).
+        grado = np.zeros(ids.shape, dtype=np.int64)
+        verticales = (ids[:, 1:, :] == ids[:, :-1, :]) & (ids[:, 1:, :] >= 0)
+        horizontales = (ids[:, :, 1:] == ids[:, :, :-1]) & (ids[:, :, 1:] >= 0)
+        grado[:, 1:, :] += verticales
+        grado[:, :-1, :] += verticales
+        grado[:, :, 1:] += horizontales
+        grado[:, :, :-1] += horizontales
+
+        ids_ocupadas = ids.reshape(-1)[posiciones]
+        grados_ocupadas = grado.reshape(-1)[posiciones]
+        celdas = np.bincount(ids_ocupadas, minlength=simbolos)
+        extremos = np.bincount(ids_ocupadas, weights=grados_ocupadas == 1, minlength=simbolos).astype(np.int64)
+        cruces = np.bincount(ids_ocupadas, weights=grados_ocupadas > 2, minlength=simbolos)
+
+        # motivo guarda 1 + la posición en MOTIVOS de la primera comprobación que falla (0 si ninguna).
+        motivo = np.zeros(simbolos, dtype=np.int64)
+        motivo[cruces > 0] = 3
+        motivo[extremos != 2] = 2
+        motivo[celdas < 2] = 1
+
+        # Las rutas que pasan lo anterior son un camino (dos extremos, grados <= 2) más, tal
+        # vez, ciclos o celdas sueltas. Se recorren todas a la vez desde uno de sus extremos y
+        # la ruta es continua si el recorrido cubre todas sus celdas.
+        lugar = np.full(codigos.size, -1, dtype=np.int64)
+        lugar[posiciones] = np.arange(posiciones.size)
+        lugar = lugar.reshape(ids.shape)
+        vecinos = np.full((posiciones.size, 4), -1, dtype=np.int64)
+        for direccion, (mascara, desde, hacia) in enumerate((
+                (verticales, lugar[:, 1:, :], lugar[:, :-1, :]), (horizontales, lugar[:, :, 1:], lugar[:, :, :-1]))):
+            desde, hacia = desde[mascara], hacia[mascara]
+            vecinos[desde, 2 * direccion] = hacia
+            vecinos[hacia, 2 * direccion + 1] = desde
+        inicio = np.full(simbolos, -1, dtype=np.int64)
+        puntas = np.flatnonzero(grados_ocupadas == 1)
+        inicio[ids_ocupadas[puntas]] = puntas
+
+        pendientes = np.flatnonzero(motivo == 0)
+        actual = inicio[pendientes]
+        anterior = np.full(pendientes.size, -1, dtype=np.int64)
+        recorridas = np.ones(simbolos, dtype=np.int64)
+        while pendientes.size:
+            opciones = vecinos[actual]
+            validas = (opciones >= 0) & (opciones != anterior[:, None])
+            siguen = validas.any(axis=1)
+            siguiente = opciones[np.arange(actual.size), validas.argmax(axis=1)]
+            pendientes, anterior, actual = pendientes[siguen], actual[siguen], siguiente[siguen]
+            recorridas[pendientes] += 1
+        motivo[(motivo == 0) & (recorridas != celdas)] = 4
+
+        # Por tablero, la primera ruta que falla en orden de aparición (como obtener_rutas).
+        aparicion = posiciones[primera]
+        fallan = np.flatnonzero(motivo > 0)
+        primera_falla = np.full(lote, codigos.size, dtype=np.int64)
+        np.minimum.at(primera_falla, unicos[fallan] >> 32, aparicion[fallan])
+        simbolo_en = {int(p): int(u) for p, u in zip(aparicion[fallan], fallan)}
+
+        informes = []
+        for k in range(lote):
+            if primera_falla[k] == codigos.size:
+                informes.append(cls.informe())
+                continue
+            u = simbolo_en[int(primera_falla[k])]
+            nombre = cls.MOTIVOS[motivo[u] - 1]
+            informes.append(cls.informe(nombre, chr(int(unicos[u] & 0xFFFFFFFF)),
+                                        int(extremos[u]) if nombre == "extremos" else None))
+        return informes
 
 
 if __name__ == "__main__":
+    from coleccion_tableros import ColeccionTableros
+
     if len(sys.argv) < 2:
-        print("Uso: python verificar_tablero.py <ruta_del_archivo>")
+        print("Uso: python verificar_tablero.py <ruta_del_archivo> [<ruta> ...]")
         sys.exit(1)
 
-    ruta = sys.argv[1]
+    rutas = sys.argv[1:]
 
     try:
-        tablero = NumberLinkBoardIO.leer_tablero(ruta)
-        print(f"Tablero leído correctamente desde: {ruta}\n")
-        NumberLinkBoardIO.imprimir_tablero(tablero)
-        NumberLinkVerifier.verificar_tablero(tablero)
+        unico = len(rutas) == 1 and not os.path.isdir(rutas[0])
+        if unico and ColeccionTableros.es_coleccion(rutas[0]):
+            with ColeccionTableros(rutas[0], usar_indice=False) as coleccion:
+                unico = len(coleccion) <= 1
+        if unico:
+            ruta = rutas[0]
+            tablero = NumberLinkBoardIO.leer_tablero(ruta)
+            print(f"Tablero leído correctamente desde: {ruta}\n")
+            NumberLinkBoardIO.imprimir_tablero(tablero)
+            NumberLinkVerifier.verificar_tablero(tablero)
+        else:
+            # Varios archivos o colecciones: una línea por tablero y un resumen.
+            nombres, tableros = [], []
+            for ruta in ColeccionTableros.rutas_de_entradas(rutas):
+                for n, tablero in enumerate(ColeccionTableros.leer_tableros(ruta)):
+                    nombres.append(f"{ruta}#{n}")
+                    tableros.append(tablero)
+            informes = NumberLinkVerifier.verificar_lote(tableros)
+            for nombre, informe in zip(nombres, informes):
+                print(f"{nombre}: {informe['mensaje']}")
+            validos = sum(1 for informe in informes if informe["valido"])
+            print(f"\nTableros: {len(informes)}  válidos: {validos}  inválidos: {len(informes) - validos}")
+            sys.exit(0 if validos == len(informes) else 1)
     except Exception as e:
         print(f"Error al leer el archivo: {e}")